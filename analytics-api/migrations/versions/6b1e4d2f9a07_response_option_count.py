@@ -0,0 +1,47 @@
+"""Add pre-aggregated response option counts.
+
+Revision ID: 6b1e4d2f9a07
+Revises: 812b1f67015a
+Create Date: 2026-10-18 10:02:31.482113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6b1e4d2f9a07'
+down_revision = '812b1f67015a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('response_option_count',
+    sa.Column('created_date', sa.DateTime(), nullable=True),
+    sa.Column('updated_date', sa.DateTime(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('runcycle_id', sa.Integer(), nullable=True),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('survey_id', sa.Integer(), nullable=False),
+    sa.Column('request_key', sa.Text(), nullable=False),
+    sa.Column('value', sa.Text(), nullable=True),
+    sa.Column('response_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['survey_id'], ['survey.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_response_option_count_survey_id'), 'response_option_count', ['survey_id'], unique=False)
+    # backfill from the responses already loaded
+    op.execute("""
+        INSERT INTO response_option_count
+            (survey_id, request_key, value, response_count, is_active, created_date)
+        SELECT survey_id, request_key, value, count(request_key), true, now()
+        FROM response_type_option
+        WHERE is_active = true
+        GROUP BY survey_id, request_key, value
+    """)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_response_option_count_survey_id'), table_name='response_option_count')
+    op.drop_table('response_option_count')
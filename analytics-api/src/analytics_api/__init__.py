@@ -12,6 +12,8 @@ from flask_cors import CORS
 from analytics_api.auth import jwt
 from analytics_api.config import get_named_config
 from analytics_api.models import db, ma, migrate
+from analytics_api.utils import sql_metrics
+from analytics_api.utils.response_cache import cache
 
 
 hsts = secure.StrictTransportSecurity().include_subdomains().preload().max_age(31536000)
@@ -55,6 +57,12 @@ def create_app(run_mode=os.getenv('FLASK_ENV', 'development')):
     # Marshmallow initialize
     ma.init_app(app)
 
+    # Response cache initialize
+    cache.init_app(app)
+
+    # Count the SQL statements of every request
+    sql_metrics.init_app(app)
+
     @app.before_request
     def set_origin():
         g.origin_url = request.environ.get('HTTP_ORIGIN', 'localhost')
@@ -62,7 +70,11 @@ def create_app(run_mode=os.getenv('FLASK_ENV', 'development')):
     @app.after_request
     def set_secure_headers(response):
         """Set CORS headers for security."""
+        # keep the caching policy of endpoints that opt in to HTTP caching
+        cache_control = response.headers.get('Cache-Control')
         secure_headers.framework.flask(response)
+        if cache_control:
+            response.headers['Cache-Control'] = cache_control
         response.headers.add('Cross-Origin-Resource-Policy', '*')
         response.headers['Cross-Origin-Opener-Policy'] = '*'
         response.headers['Cross-Origin-Embedder-Policy'] = 'unsafe-none'
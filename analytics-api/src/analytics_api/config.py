@@ -160,6 +160,23 @@ class Config():  # pylint: disable=too-few-public-methods
     # CORS settings
     CORS_ORIGINS = os.getenv('CORS_ORIGINS', '').split(',')
 
+    # Response cache for the dashboard endpoints (Flask-Caching). Use RedisCache to
+    # share it between workers. Entries are keyed on the last successful ETL run cycle.
+    CACHE_TYPE = os.getenv('CACHE_TYPE', 'SimpleCache')
+    CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL')
+    CACHE_KEY_PREFIX = os.getenv('CACHE_KEY_PREFIX', 'analytics:')
+    CACHE_DEFAULT_TIMEOUT = int(os.getenv('CACHE_DEFAULT_TIMEOUT', '86400'))
+    # Seconds the last ETL run cycle id is cached for. This bounds how long a completed
+    # run takes to show up, and is the max-age clients may reuse responses for.
+    ETL_RUN_CYCLE_CACHE_TIMEOUT = int(os.getenv('ETL_RUN_CYCLE_CACHE_TIMEOUT', '60'))
+
+    # A request issuing the same SQL statement this many times, e.g. once for every row of
+    # a list (an N+1 query), is logged and counted in the ops metrics. Set to 0 to disable.
+    SQL_REPEATED_STATEMENT_THRESHOLD = int(os.getenv('SQL_REPEATED_STATEMENT_THRESHOLD', '10'))
+
+    # Bearer token the metrics scraper sends to read the ops metrics. Unset, the metrics are not served.
+    OPS_TOKEN = os.getenv('OPS_TOKEN')
+
 
 class DevConfig(Config):  # pylint: disable=too-few-public-methods
     """Dev Config."""
@@ -178,6 +195,11 @@ class TestConfig(Config):  # pylint: disable=too-few-public-methods
     # unhandled exception occurs
     USE_DEBUG = False
 
+    OPS_TOKEN = 'test-ops-token'
+
+    # Don't serve cached responses across tests
+    CACHE_TYPE = 'NullCache'
+
     # Override the DB config to use the test database, if one is configured
     DB_CONFIG = {
         'USER': os.getenv('DATABASE_TEST_USERNAME', Config.DB.get('USER')),
@@ -24,3 +24,4 @@ from .user_response_detail import UserResponseDetail
 from .etlruncycle import EtlRunCycle
 from .request_type_option import RequestTypeOption
 from .response_type_option import ResponseTypeOption
+from .response_option_count import ResponseOptionCount
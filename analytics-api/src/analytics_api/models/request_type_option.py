@@ -6,7 +6,7 @@ from sqlalchemy import and_, func, or_
 from sqlalchemy.sql.expression import true
 from analytics_api.models.available_response_option import AvailableResponseOption as AvailableResponseOptionModel
 from analytics_api.models.survey import Survey as SurveyModel
-from analytics_api.models.response_type_option import ResponseTypeOption as ResponseTypeOptionModel
+from analytics_api.models.response_option_count import ResponseOptionCount as ResponseOptionCountModel
 from .base_model import BaseModel
 from .db import db
 from .request_mixin import RequestMixin
@@ -57,13 +57,11 @@ class RequestTypeOption(BaseModel, RequestMixin):  # pylint: disable=too-few-pub
                               .filter(and_(AvailableResponseOptionModel.survey_id.in_(
                                   analytics_survey_id), AvailableResponseOptionModel.is_active == true()))
                               .subquery())
-        # Get all the survey responses with the counts for each response specific to a survey id which
-        # are in active status.
-        survey_response = (db.session.query(ResponseTypeOptionModel.request_key, ResponseTypeOptionModel.value,
-                                            func.count(ResponseTypeOptionModel.request_key).label('response'))
-                           .filter(and_(ResponseTypeOptionModel.survey_id.in_(analytics_survey_id),
-                                        ResponseTypeOptionModel.is_active == true()))
-                           .group_by(ResponseTypeOptionModel.request_key, ResponseTypeOptionModel.value)
+        # Get the response counts for each response specific to a survey id. These are pre-aggregated by
+        # the ETL, so this reads one row per question and selected value instead of every response.
+        survey_response = (db.session.query(ResponseOptionCountModel.request_key, ResponseOptionCountModel.value,
+                                            ResponseOptionCountModel.response_count.label('response'))
+                           .filter(ResponseOptionCountModel.survey_id.in_(analytics_survey_id))
                            .subquery())
 
         survey_response_exists = db.session.query(survey_response.c.request_key).first()
@@ -0,0 +1,89 @@
+"""response_option_count model class.
+
+Manages the pre-aggregated response counts for option type questions on a survey
+"""
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import ForeignKey, func, insert, literal, select
+from sqlalchemy.sql.expression import true
+
+from .base_model import BaseModel
+from .db import db
+from .response_type_option import ResponseTypeOption
+
+
+# (survey id, request key, value)
+ResponseOptionKey = Tuple[int, str, Optional[str]]
+
+
+class ResponseOptionCount(BaseModel):  # pylint: disable=too-few-public-methods
+    """Definition of the Response Option Count entity.
+
+    Holds one row per (survey, question, selected value) with the number of active
+    responses, so survey results can be read without scanning response_type_option.
+    The ETL keeps it up to date as submissions and surveys are loaded.
+    """
+
+    __tablename__ = 'response_option_count'
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    survey_id = db.Column(db.Integer, ForeignKey('survey.id', ondelete='CASCADE'), nullable=False, index=True)
+    request_key = db.Column(db.Text(), nullable=False)
+    value = db.Column(db.Text())
+    response_count = db.Column(db.Integer, nullable=False, default=0)
+
+    @classmethod
+    def increment(cls, counts: Dict[ResponseOptionKey, int], runcycle_id=None, session=None):
+        """Add the counts of newly loaded responses to the aggregate."""
+        session = session or db.session
+        for (survey_id, request_key, value), count in counts.items():
+            updated = session.query(cls).filter(
+                cls.survey_id == survey_id,
+                cls.request_key == request_key,
+                cls.value.is_not_distinct_from(value),
+            ).update({
+                cls.response_count: cls.response_count + count,
+                cls.runcycle_id: runcycle_id,
+            }, synchronize_session=False)
+            if not updated:
+                session.add(cls(survey_id=survey_id, request_key=request_key, value=value,
+                                response_count=count, is_active=True, runcycle_id=runcycle_id))
+        session.commit()
+
+    @classmethod
+    def add_runcycle_responses(cls, runcycle_id, session=None):
+        """Add the active responses loaded by an ETL run cycle to the aggregate."""
+        session = session or db.session
+        counts = session.query(
+            ResponseTypeOption.survey_id, ResponseTypeOption.request_key, ResponseTypeOption.value,
+            func.count(ResponseTypeOption.request_key),
+        ).filter(
+            ResponseTypeOption.runcycle_id == runcycle_id,
+            ResponseTypeOption.is_active == true(),
+        ).group_by(ResponseTypeOption.survey_id, ResponseTypeOption.request_key, ResponseTypeOption.value)
+        cls.increment({(survey_id, request_key, value): count for survey_id, request_key, value, count in counts},
+                      runcycle_id, session)
+
+    @classmethod
+    def refresh(cls, survey_ids: Iterable[int], runcycle_id=None, session=None):
+        """Rebuild the aggregate for the surveys from their active responses."""
+        session = session or db.session
+        survey_ids = list(survey_ids)
+        session.query(cls).filter(cls.survey_id.in_(survey_ids)).delete(synchronize_session=False)
+        counts = select(
+            ResponseTypeOption.survey_id,
+            ResponseTypeOption.request_key,
+            ResponseTypeOption.value,
+            func.count(ResponseTypeOption.request_key),
+            literal(True),
+            literal(runcycle_id, db.Integer),
+            func.now(),
+        ).where(
+            ResponseTypeOption.survey_id.in_(survey_ids),
+            ResponseTypeOption.is_active == true(),
+        ).group_by(ResponseTypeOption.survey_id, ResponseTypeOption.request_key, ResponseTypeOption.value)
+        session.execute(insert(cls).from_select(
+            [cls.survey_id, cls.request_key, cls.value, cls.response_count, cls.is_active, cls.runcycle_id,
+             cls.created_date],
+            counts))
+        session.commit()
@@ -28,6 +28,7 @@ from .aggregator import API as AGGREGATOR_API
 from .engagement import API as ENGAGEMENT_API
 from .survey_result import API as SURVEY_RESULT_API
 from .user_response_detail import API as USER_RESPONSE_API
+from .ops import API as OPS_API
 __all__ = ('API_BLUEPRINT',)
 
 URL_PREFIX = '/api/'
@@ -46,3 +47,4 @@ API.add_namespace(AGGREGATOR_API)
 API.add_namespace(ENGAGEMENT_API)
 API.add_namespace(SURVEY_RESULT_API)
 API.add_namespace(USER_RESPONSE_API)
+API.add_namespace(OPS_API, path='/ops')
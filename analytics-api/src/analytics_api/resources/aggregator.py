@@ -21,6 +21,7 @@ from flask_restx import Namespace, Resource
 
 from analytics_api.auth import auth
 from analytics_api.services.aggregator_service import AggregatorService
+from analytics_api.utils.response_cache import cached_response
 from analytics_api.utils.util import allowedorigins, cors_preflight
 
 
@@ -37,6 +38,7 @@ class Aggregator(Resource):
     @staticmethod
     @cross_origin(origins=allowedorigins())
     @auth.optional
+    @cached_response
     def get():
         """Fetch count of records for engagement matching the provided id."""
         try:
@@ -0,0 +1,53 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Endpoints exposing operational information about the service."""
+import hmac
+from functools import wraps
+from http import HTTPStatus
+
+from flask import Response, abort, current_app, request
+from flask_restx import Namespace, Resource
+
+from analytics_api.utils.sql_metrics import metrics
+from analytics_api.utils.util import cors_preflight
+
+
+API = Namespace('ops', description='Operational endpoints')
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def require_ops_token(func):
+    """Only serve requests carrying the ops token as their bearer token, e.g. from the metrics scraper."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        token = current_app.config.get('OPS_TOKEN')
+        authorization = request.headers.get('Authorization', '')
+        if not token or not hmac.compare_digest(authorization.encode(), f'Bearer {token}'.encode()):
+            abort(HTTPStatus.UNAUTHORIZED)
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+@cors_preflight('GET, OPTIONS')
+@API.route('/metrics')
+class Metrics(Resource):
+    """Resource for returning the metrics of this server process."""
+
+    @staticmethod
+    @require_ops_token
+    def get():
+        """Return the SQL statements issued per endpoint, in the Prometheus text format."""
+        return Response(metrics.render('dep_analytics_api'), status=HTTPStatus.OK, content_type=PROMETHEUS_CONTENT_TYPE)
@@ -22,6 +22,7 @@ from flask_restx import Namespace, Resource
 from analytics_api.auth import jwt as _jwt
 from analytics_api.utils.roles import Role
 from analytics_api.services.survey_result import SurveyResultService
+from analytics_api.utils.response_cache import cached_response
 from analytics_api.utils.util import allowedorigins, cors_preflight
 
 
@@ -61,6 +62,7 @@ class SurveyResultExternal(Resource):
 
     @staticmethod
     @cross_origin(origins=allowedorigins())
+    @cached_response
     def get(engagement_id):
         """Fetch survey result for a single engagement id."""
         try:
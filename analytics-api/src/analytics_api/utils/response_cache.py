@@ -0,0 +1,90 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Response caching for the dashboard endpoints.
+
+Analytics data only changes when an ETL run cycle completes, so responses are
+keyed on the request and the id of the last successful run cycle. Each response
+carries an ETag derived from that key, which lets clients revalidate with a
+conditional GET that is answered with 304 before the database is touched.
+"""
+import hashlib
+from functools import wraps
+from http import HTTPStatus
+
+from flask import current_app, make_response, request
+from flask_caching import Cache
+from sqlalchemy import func
+
+from analytics_api.models.db import db
+from analytics_api.models.etlruncycle import EtlRunCycle as EtlRunCycleModel
+from analytics_api.utils.roles import Role
+from analytics_api.utils.token_info import TokenInfo
+
+
+# lower case name as used by convention for module level singletons
+cache = Cache()  # pylint: disable=invalid-name
+
+RUN_CYCLE_CACHE_KEY = 'etl_run_cycle_id'
+
+
+def get_last_run_cycle_id() -> int:
+    """Return the id of the last successful ETL run cycle, cached for a short time."""
+    run_cycle_id = cache.get(RUN_CYCLE_CACHE_KEY)
+    if run_cycle_id is None:
+        run_cycle_id = db.session.query(func.coalesce(func.max(EtlRunCycleModel.id), 0)) \
+            .filter(EtlRunCycleModel.success.is_(True)) \
+            .scalar()
+        cache.set(RUN_CYCLE_CACHE_KEY, run_cycle_id, timeout=current_app.config['ETL_RUN_CYCLE_CACHE_TIMEOUT'])
+    return run_cycle_id
+
+
+def _cache_key() -> str:
+    # unpublished engagements are only visible to dashboard users, so their responses are kept apart
+    scope = 'dashboard' if Role.ACCESS_DASHBOARD.value in TokenInfo.get_user_roles() else 'public'
+    args = '&'.join(f'{key}={value}' for key, value in sorted(request.args.items(multi=True)))
+    return f'{request.path}?{args}:{scope}:{get_last_run_cycle_id()}'
+
+
+def cached_response(f):
+    """Cache the response of a GET endpoint until the next ETL run cycle completes.
+
+    Must be applied after authentication, since the caller's roles are part of the key.
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        key = _cache_key()
+        etag = hashlib.sha1(key.encode()).hexdigest()
+        cache_control = 'private' if request.headers.get('Authorization') else 'public'
+        headers = {
+            'Cache-Control': f'{cache_control}, max-age={current_app.config["ETL_RUN_CYCLE_CACHE_TIMEOUT"]}',
+            'Vary': 'Authorization',
+        }
+
+        if etag in request.if_none_match:
+            response = make_response('', HTTPStatus.NOT_MODIFIED)
+        elif (cached := cache.get(key)) is not None:
+            body, mimetype = cached
+            response = current_app.response_class(body, status=HTTPStatus.OK, mimetype=mimetype)
+        else:
+            response = make_response(f(*args, **kwargs))
+            if response.status_code != HTTPStatus.OK:
+                return response
+            cache.set(key, (response.get_data(), response.mimetype))
+
+        response.set_etag(etag)
+        response.headers.update(headers)
+        return response
+
+    return decorated
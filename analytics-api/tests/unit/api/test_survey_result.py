@@ -93,3 +93,27 @@ def test_get_survey_result_public(client, session):  # pylint:disable=unused-arg
         rv = client.get(f'/api/surveyresult/{engagement.source_engagement_id}/public',
                         content_type=ContentType.JSON.value)
     assert rv.status_code == HTTPStatus.INTERNAL_SERVER_ERROR
+
+
+def test_get_survey_result_public_conditional_get(client, session):  # pylint:disable=unused-argument
+    """Assert that survey results carry an ETag and a matching conditional GET is answered with 304."""
+    engagement = factory_engagement_model()
+    survey = factory_survey_model(engagement)
+    available_response_option = factory_available_response_option_model(survey)
+    factory_request_type_option_model(survey, available_response_option.request_key,
+                                      TestRequestTypeOptionInfo.request_type_option2)
+    factory_response_type_option_model(survey, available_response_option.request_key,
+                                       available_response_option.value)
+
+    rv = client.get(f'/api/surveyresult/{engagement.source_engagement_id}/public',
+                    content_type=ContentType.JSON.value)
+    assert rv.status_code == HTTPStatus.OK
+    assert rv.headers['ETag']
+    assert rv.headers['Cache-Control'].startswith('public, max-age=')
+
+    with patch.object(SurveyResultService, 'get_survey_result') as mock_get_survey_result:
+        rv = client.get(f'/api/surveyresult/{engagement.source_engagement_id}/public',
+                        headers={'If-None-Match': rv.headers['ETag']},
+                        content_type=ContentType.JSON.value)
+        mock_get_survey_result.assert_not_called()
+    assert rv.status_code == HTTPStatus.NOT_MODIFIED
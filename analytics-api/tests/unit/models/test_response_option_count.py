@@ -0,0 +1,53 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the Response Option Count model.
+
+Test suite to ensure that the pre-aggregated survey results are maintained as expected.
+"""
+from analytics_api.models.request_type_option import RequestTypeOption as RequestTypeOptionModel
+from analytics_api.models.response_option_count import ResponseOptionCount as ResponseOptionCountModel
+from analytics_api.models.response_type_option import ResponseTypeOption as ResponseTypeOptionModel
+from tests.utilities.factory_scenarios import TestRequestTypeOptionInfo
+from tests.utilities.factory_utils import (
+    factory_available_response_option_model, factory_engagement_model, factory_request_type_option_model,
+    factory_response_type_option_model, factory_survey_model)
+
+
+def test_response_option_count_increment(session):
+    """Assert that responses loaded by a run cycle are added to the aggregate and read by survey results."""
+    eng = factory_engagement_model()
+    survey = factory_survey_model(eng)
+    available_response_option = factory_available_response_option_model(survey)
+    factory_request_type_option_model(survey, available_response_option.request_key,
+                                      TestRequestTypeOptionInfo.request_type_option3)
+    factory_response_type_option_model(survey, available_response_option.request_key,
+                                       available_response_option.value)
+
+    for _ in range(2):
+        session.add(ResponseTypeOptionModel(survey_id=survey.id, request_key=available_response_option.request_key,
+                                            value=available_response_option.value, is_active=True,
+                                            runcycle_id=99))
+    session.commit()
+    ResponseOptionCountModel.add_runcycle_responses(99)
+
+    counts = ResponseOptionCountModel.query.filter_by(survey_id=survey.id).all()
+    assert len(counts) == 1
+    assert counts[0].response_count == 3
+
+    survey_result = RequestTypeOptionModel.get_survey_result(eng.source_engagement_id, True)
+    assert survey_result[0].result == [{'value': available_response_option.value, 'count': 3}]
+
+    # a refresh rebuilds the same counts from the responses
+    ResponseOptionCountModel.refresh([survey.id])
+    assert ResponseOptionCountModel.query.filter_by(survey_id=survey.id).one().response_count == 3
@@ -0,0 +1,56 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests to assure the SQL instrumentation.
+
+Test-Suite to ensure that the SQL statements of blocks and requests are counted, and repeated statements detected.
+"""
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy import text
+
+from analytics_api.models import db
+from tests.utilities.query_assertions import assert_max_queries
+
+
+def test_queries_counted_and_repeats_detected(session):  # pylint:disable=unused-argument
+    """Assert that the statements of a block are counted, and that statements repeated are reported."""
+    with assert_max_queries(4) as stats:
+        for value in range(3):
+            db.session.execute(text('SELECT :value'), {'value': value})
+        db.session.execute(text('SELECT 1'))
+
+    assert stats.statements['SELECT %(value)s'] == 3
+    assert stats.repeated_statements(3) == [('SELECT %(value)s', 3)]
+    assert stats.repeated_statements(4) == []
+
+    with pytest.raises(AssertionError):
+        with assert_max_queries(1):
+            db.session.execute(text('SELECT 1'))
+            db.session.execute(text('SELECT 2'))
+
+
+def test_metrics_per_endpoint(client, session):  # pylint:disable=unused-argument
+    """Assert that the requests of each endpoint show up in the metrics, for the holder of the ops token."""
+    assert client.get('/api/ops/metrics').status_code == HTTPStatus.UNAUTHORIZED
+    assert client.get('/api/ops/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == \
+        HTTPStatus.UNAUTHORIZED
+    response = client.get('/api/ops/metrics', headers={'Authorization': 'Bearer test-ops-token'})
+
+    assert response.status_code == HTTPStatus.OK
+
+    assert response.content_type.startswith('text/plain')
+    metrics = response.get_data(as_text=True)
+    assert 'dep_analytics_api_requests_total{method="GET",endpoint="/api/ops/metrics"}' in metrics
@@ -23,6 +23,7 @@ from analytics_api.models.available_response_option import AvailableResponseOpti
 from analytics_api.models.email_verification import EmailVerification as EmailVerificationModel
 from analytics_api.models.engagement import Engagement as EngagementModel
 from analytics_api.models.request_type_option import RequestTypeOption as RequestTypeOptionModel
+from analytics_api.models.response_option_count import ResponseOptionCount as ResponseOptionCountModel
 from analytics_api.models.response_type_option import ResponseTypeOption as ResponseTypeOptionModel
 from analytics_api.models.survey import Survey as SurveyModel
 from analytics_api.models.user_details import UserDetails as UserDetailsModel
@@ -133,6 +134,8 @@ def factory_response_type_option_model(survey, request_key, value,
     )
     db.session.add(response_type_option)
     db.session.commit()
+    # keep the pre-aggregated counts in step, as the ETL does
+    ResponseOptionCountModel.refresh([survey.id])
     return response_type_option
 
 
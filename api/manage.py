@@ -1,11 +1,30 @@
+import os
+
+import click
 from flask_migrate import Migrate
 
 from api import create_app, db
+from api.utils.import_profile import profile_startup
 
 app = create_app()
 # app.config.from_object(os.environ['APP_SETTINGS'])
 
 migrate = Migrate(app, db)
 
+
+@app.cli.command('profile-imports')
+@click.option('--limit', default=20, help='How many of the slowest imports to report.')
+def profile_imports(limit):
+    """Report the time and memory taken to import and create the application."""
+    profile = profile_startup(os.getenv('FLASK_ENV', 'development'))
+    click.echo(f'Application created in {profile.seconds:.2f}s, '
+               f'peak resident memory {profile.max_rss_mb:.0f} MB, {len(profile.modules)} modules imported.')
+    click.echo(f'{"cumulative ms":>14} {"self ms":>8}  module')
+    for timing in profile.slowest_imports(limit):
+        click.echo(f'{timing.cumulative_us / 1000:>14.1f} {timing.self_us / 1000:>8.1f}  {timing.module}')
+    if deferred := profile.deferred_modules_imported():
+        click.echo(f'Imported at startup but meant to be imported on first use: {", ".join(deferred)}')
+
+
 if __name__ == '__main__':
     app.run()
@@ -0,0 +1,38 @@
+"""Add retry and lease tracking to the email queue.
+
+Revision ID: 40a505382987
+Revises: 59138db76b10
+Create Date: 2026-10-18 09:12:44.180215
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '40a505382987'
+down_revision = '59138db76b10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE notificationstatus ADD VALUE IF NOT EXISTS 'FAILED'")
+    op.add_column('email_queue', sa.Column('attempts', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('email_queue', sa.Column('last_error', sa.Text(), nullable=True))
+    op.add_column('email_queue', sa.Column('next_retry_at', sa.DateTime(), nullable=True))
+    op.add_column('email_queue', sa.Column('locked_at', sa.DateTime(), nullable=True))
+    op.add_column('email_queue', sa.Column('locked_by', sa.String(length=100), nullable=True))
+    op.create_index('ix_email_queue_pending', 'email_queue', ['notification_status', 'next_retry_at'])
+
+
+def downgrade():
+    op.drop_index('ix_email_queue_pending', table_name='email_queue')
+    op.drop_column('email_queue', 'locked_by')
+    op.drop_column('email_queue', 'locked_at')
+    op.drop_column('email_queue', 'next_retry_at')
+    op.drop_column('email_queue', 'last_error')
+    op.drop_column('email_queue', 'attempts')
+    # Postgres cannot drop a value from an enum type; move failed rows back to pending instead
+    op.execute("UPDATE email_queue SET notification_status = NULL WHERE notification_status = 'FAILED'")
@@ -0,0 +1,37 @@
+"""Add indexes supporting keyset pagination of the engagement, survey and comment listings.
+
+Revision ID: 7c2e91d4b6a3
+Revises: 40a505382987
+Create Date: 2026-10-18 11:05:27.518304
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '7c2e91d4b6a3'
+down_revision = '40a505382987'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_engagement_tenant_name_id', 'engagement', ['tenant_id', 'name', 'id']),
+    ('ix_engagement_tenant_created_date_id', 'engagement', ['tenant_id', 'created_date', 'id']),
+    ('ix_engagement_tenant_published_date_id', 'engagement', ['tenant_id', 'published_date', 'id']),
+    ('ix_survey_tenant_name_id', 'survey', ['tenant_id', 'name', 'id']),
+    ('ix_survey_tenant_created_date_id', 'survey', ['tenant_id', 'created_date', 'id']),
+    ('ix_submission_survey_id_id', 'submission', ['survey_id', 'id']),
+    ('ix_submission_survey_created_date_id', 'submission', ['survey_id', 'created_date', 'id']),
+    ('ix_submission_survey_review_date_id', 'submission', ['survey_id', 'review_date', 'id']),
+    ('ix_comment_survey_id_id', 'comment', ['survey_id', 'id']),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
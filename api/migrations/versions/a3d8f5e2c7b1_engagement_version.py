@@ -0,0 +1,24 @@
+"""Add the version of the public content of an engagement.
+
+Revision ID: a3d8f5e2c7b1
+Revises: e6f3a9c1d27b
+Create Date: 2026-10-18 16:02:44.571093
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3d8f5e2c7b1'
+down_revision = 'e6f3a9c1d27b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('engagement', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    op.drop_column('engagement', 'version')
@@ -0,0 +1,36 @@
+"""Add full-text and trigram search indexes for comments and reviewers.
+
+Revision ID: b81f3a6c2d94
+Revises: 7c2e91d4b6a3
+Create Date: 2026-10-18 12:21:40.903716
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'b81f3a6c2d94'
+down_revision = '7c2e91d4b6a3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.add_column('comment', sa.Column(
+        'search_vector', postgresql.TSVECTOR(),
+        sa.Computed("to_tsvector('english', text)", persisted=True), nullable=True))
+    op.create_index('ix_comment_search_vector', 'comment', ['search_vector'], postgresql_using='gin')
+    op.create_index('ix_comment_text_trgm', 'comment', ['text'], postgresql_using='gin',
+                    postgresql_ops={'text': 'gin_trgm_ops'})
+    op.create_index('ix_submission_reviewed_by_trgm', 'submission', ['reviewed_by'], postgresql_using='gin',
+                    postgresql_ops={'reviewed_by': 'gin_trgm_ops'})
+
+
+def downgrade():
+    op.drop_index('ix_submission_reviewed_by_trgm', table_name='submission')
+    op.drop_index('ix_comment_text_trgm', table_name='comment')
+    op.drop_index('ix_comment_search_vector', table_name='comment')
+    op.drop_column('comment', 'search_vector')
@@ -0,0 +1,27 @@
+"""Track the submissions whose rejected comments have been redacted.
+
+Revision ID: c5e1b7a94f30
+Revises: a3d8f5e2c7b1
+Create Date: 2026-10-18 17:36:12.904417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5e1b7a94f30'
+down_revision = 'a3d8f5e2c7b1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('submission', sa.Column('redacted_date', sa.DateTime(), nullable=True))
+    op.create_index('ix_submission_unredacted_engagement_id', 'submission', ['engagement_id'], unique=False,
+                    postgresql_where=sa.text('redacted_date IS NULL'))
+
+
+def downgrade():
+    op.drop_index('ix_submission_unredacted_engagement_id', table_name='submission')
+    op.drop_column('submission', 'redacted_date')
@@ -0,0 +1,43 @@
+"""Store engagement slugs case-folded and index slug and engagement name lookups.
+
+Revision ID: d4a7c0e95b12
+Revises: b81f3a6c2d94
+Create Date: 2026-10-18 13:02:16.447091
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4a7c0e95b12'
+down_revision = 'b81f3a6c2d94'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # slugs that only differed by case would collide once case-folded; keep the oldest and suffix the others
+    op.execute("""
+        UPDATE engagement_slug
+        SET slug = lower(slug) || '-' || id
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (PARTITION BY lower(slug) ORDER BY id) AS duplicate
+                FROM engagement_slug
+            ) slugs
+            WHERE duplicate > 1
+        )
+    """)
+    op.execute('UPDATE engagement_slug SET slug = lower(slug) WHERE slug <> lower(slug)')
+    # the unique constraint on slug already provides an index for exact matches
+    op.drop_index('idx_slug', table_name='engagement_slug')
+    op.create_index('ix_engagement_slug_slug_pattern', 'engagement_slug', ['slug'],
+                    postgresql_ops={'slug': 'varchar_pattern_ops'})
+    op.create_index('ix_engagement_name_trgm', 'engagement', ['name'], postgresql_using='gin',
+                    postgresql_ops={'name': 'gin_trgm_ops'})
+
+
+def downgrade():
+    op.drop_index('ix_engagement_name_trgm', table_name='engagement')
+    op.drop_index('ix_engagement_slug_slug_pattern', table_name='engagement_slug')
+    op.create_index('idx_slug', 'engagement_slug', ['slug'])
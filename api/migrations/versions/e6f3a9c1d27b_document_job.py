@@ -0,0 +1,52 @@
+"""Add the document job queue for documents generated outside of the request.
+
+Revision ID: e6f3a9c1d27b
+Revises: d4a7c0e95b12
+Create Date: 2026-10-18 14:21:05.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e6f3a9c1d27b'
+down_revision = 'd4a7c0e95b12'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'document_job',
+        sa.Column('created_date', sa.DateTime(), nullable=False),
+        sa.Column('updated_date', sa.DateTime(), nullable=True),
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('document_type_id', sa.Integer(), nullable=False),
+        sa.Column('survey_id', sa.Integer(), nullable=False),
+        sa.Column('cache_key', sa.String(length=64), nullable=False),
+        sa.Column('status', sa.Enum('PENDING', 'PROCESSING', 'COMPLETED', 'FAILED', name='documentjobstatus'),
+                  nullable=False),
+        sa.Column('artifact_key', sa.String(length=255), nullable=True),
+        sa.Column('file_name', sa.String(length=255), nullable=True),
+        sa.Column('content_type', sa.String(length=255), nullable=True),
+        sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('locked_at', sa.DateTime(), nullable=True),
+        sa.Column('locked_by', sa.String(length=100), nullable=True),
+        sa.Column('completed_date', sa.DateTime(), nullable=True),
+        sa.Column('created_by', sa.String(length=50), nullable=True),
+        sa.Column('updated_by', sa.String(length=50), nullable=True),
+        sa.ForeignKeyConstraint(['document_type_id'], ['generated_document_type.id'], ),
+        sa.ForeignKeyConstraint(['survey_id'], ['survey.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_document_job_cache_key_status', 'document_job', ['cache_key', 'status'])
+    op.create_index('ix_document_job_status_id', 'document_job', ['status', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_document_job_status_id', table_name='document_job')
+    op.drop_index('ix_document_job_cache_key_status', table_name='document_job')
+    op.drop_table('document_job')
+    sa.Enum(name='documentjobstatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,26 @@
+"""Store the geojson of map widgets simplified to lower levels of detail.
+
+Revision ID: e9b4c2d7a6f1
+Revises: c5e1b7a94f30
+Create Date: 2026-10-18 18:02:41.517329
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e9b4c2d7a6f1'
+down_revision = 'c5e1b7a94f30'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('widget_map', sa.Column('geojson_medium', sa.Text(), nullable=True))
+    op.add_column('widget_map', sa.Column('geojson_low', sa.Text(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('widget_map', 'geojson_low')
+    op.drop_column('widget_map', 'geojson_medium')
@@ -0,0 +1,24 @@
+"""Delay the retries of failed document jobs.
+
+Revision ID: f2c8d4a1b6e3
+Revises: e9b4c2d7a6f1
+Create Date: 2026-10-18 20:14:37.602918
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2c8d4a1b6e3'
+down_revision = 'e9b4c2d7a6f1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('document_job', sa.Column('next_retry_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('document_job', 'next_retry_at')
@@ -15,9 +15,9 @@ from api.auth import jwt
 from api.config import get_named_config
 from api.models import db, ma, migrate
 from api.models.tenant import Tenant as TenantModel
-from api.services.staff_user_service import StaffUserService
-from api.services.user_group_membership_service import UserGroupMembershipService
-from api.utils import constants
+from api.services.principal_service import PrincipalService
+from api.services.tenant_service import TenantService, tenant_cache
+from api.utils import constants, sql_metrics
 from api.utils.cache import cache
 from api.utils.roles import Role
 from api.utils.logging_masker import setup_logging_masking
@@ -116,6 +116,9 @@ def create_app(run_mode=os.getenv('FLASK_ENV', 'development')):
     # Marshmallow initialize
     ma.init_app(app)
 
+    # Count the SQL statements of every request
+    sql_metrics.init_app(app)
+
     @app.before_request
     def set_origin():
         g.origin_url = request.environ.get('HTTP_ORIGIN', 'localhost')
@@ -135,16 +138,19 @@ def create_app(run_mode=os.getenv('FLASK_ENV', 'development')):
                 del g.tenant_name
             return
         key = tenant_short_name.upper()
-        tenant = cache.get(f'tenant_{key}')
-        cache_miss = not tenant
-        if cache_miss:
-            tenant: TenantModel = TenantModel.find_by_short_name(tenant_short_name)
-            if not tenant:
+        tenant = tenant_cache.get(key)
+        if not tenant:
+            tenant_model: TenantModel = TenantModel.find_by_short_name(tenant_short_name)
+            if not tenant_model:
                 return
-            key = tenant.short_name.upper()
-            cache.set(f'tenant_{key}', tenant)
-        g.tenant_id = tenant.id
-        g.tenant_name = key
+            tenant = TenantService.cache_tenant(tenant_model)
+        g.tenant_id = tenant['id']
+        g.tenant_name = tenant['short_name']
+
+    @app.teardown_request
+    def clear_principal(_exception=None):
+        """Forget the resolved principal; each request resolves its own."""
+        g.pop('principal', None)
 
     @app.after_request
     def set_secure_headers(response):
@@ -160,13 +166,16 @@ def create_app(run_mode=os.getenv('FLASK_ENV', 'development')):
 
 
 def build_cache(app):
-    """Build cache."""
+    """Build cache.
+
+    The shared tier outlives any single worker, so tenants are only loaded when
+    no other worker has warmed the cache yet.
+    """
     cache.init_app(app)
     with app.app_context():
-        cache.clear()
         try:
-            from api.services.tenant_service import TenantService  # pylint: disable=import-outside-toplevel
-            TenantService.build_all_tenant_cache()
+            if not tenant_cache.get(TenantService.CACHE_WARM_KEY):
+                TenantService.build_all_tenant_cache()
         except Exception as e:  # NOQA # pylint:disable=broad-except
             current_app.logger.error('Error on caching ')
             current_app.logger.error(e)
@@ -179,7 +188,7 @@ def setup_jwt_manager(app_context, jwt_manager):
         """
         Get user roles based on token info.
 
-        Uses UserGroupMembershipService to retrieve user roles within a tenant.
+        Uses PrincipalService to retrieve user roles within a tenant.
         """
         role_access_path = app_context.config['JWT_CONFIG']['ROLE_CLAIM']
         roles_from_token = []
@@ -200,20 +209,16 @@ def setup_jwt_manager(app_context, jwt_manager):
 
         # Any roles from keycloak that should be available in the API.
         # For now, we only want to know if a user is a super admin;
-        # everything else is handled in-app by the UserGroupMembershipService...
+        # everything else is handled in-app by the PrincipalService...
         keycloak_forwarded_roles = [Role.SUPER_ADMIN.value]
         # ... so any extraneous roles are discarded
         user_roles = list(set(roles_from_token).intersection(keycloak_forwarded_roles))
 
-        # Retrieve user by external ID from token info
-        user = StaffUserService.get_user_by_external_id(token_info['sub'])
-
-        # Retrieve user roles within a tenant using UserGroupMembershipService
-        additional_user_roles, _ = UserGroupMembershipService.get_user_roles_within_tenant(
-            token_info['sub'], g.tenant_id)
-        if user and additional_user_roles:
+        # Resolve the staff user and their tenant roles once per request
+        principal = PrincipalService.get_principal(token_info['sub'])
+        if principal.is_staff_user and principal.roles:
             # Add additional user roles to user_roles list
-            user_roles.extend(additional_user_roles)
+            user_roles.extend(principal.roles)
         else:
             app_context.logger.warning('Unable to find an active user within the tenant.')
         if not user_roles:
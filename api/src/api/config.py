@@ -128,10 +128,23 @@ class Config:  # pylint: disable=too-few-public-methods
     # should be set to a fixed value in production to avoid invalidating sessions.
     SECRET_KEY = os.getenv('SECRET_KEY', os.urandom(24))
 
-    # A temporary writable location to unzip shapefile uploads.
-    # This folder will be REMOVED after every shapefile conversion.
+    # A temporary writable location to unzip shapefile uploads. Every conversion
+    # unzips into its own directory under it, which is removed after the conversion.
     SHAPEFILE_UPLOAD_FOLDER = os.getenv('SHAPEFILE_UPLOAD_FOLDER', '/tmp/uploads')
 
+    # Shapefiles are converted in processes of their own, at most WORKERS at a time, within the limits below.
+    # The geojson is also stored simplified to a medium and a low level of detail,
+    # with the given tolerances in degrees, which map widgets download by default.
+    SHAPEFILE_CONFIG = {
+        'WORKERS': int(os.getenv('SHAPEFILE_WORKERS', '2')),
+        'TIMEOUT': int(os.getenv('SHAPEFILE_TIMEOUT', '60')),
+        'MAX_UNCOMPRESSED_SIZE': int(os.getenv('SHAPEFILE_MAX_UNCOMPRESSED_SIZE', str(100 * 1024 * 1024))),
+        'MAX_MEMBERS': int(os.getenv('SHAPEFILE_MAX_MEMBERS', '20')),
+        'MAX_FEATURES': int(os.getenv('SHAPEFILE_MAX_FEATURES', '20000')),
+        'MEDIUM_TOLERANCE': float(os.getenv('SHAPEFILE_MEDIUM_TOLERANCE', '0.0001')),
+        'LOW_TOLERANCE': float(os.getenv('SHAPEFILE_LOW_TOLERANCE', '0.001')),
+    }
+
     # The maximum number of characters allowed in a slug.
     SLUG_MAX_CHARACTERS = int(os.getenv('SLUG_MAX_CHARACTERS', '100'))
 
@@ -212,6 +225,37 @@ class Config:  # pylint: disable=too-few-public-methods
         'ROLE_CLAIM': os.getenv('JWT_OIDC_ROLE_CLAIM', 'client_roles'),
     }
 
+    # How long (in seconds) a resolved user principal (staff user, tenant roles and
+    # engagement memberships) is shared between requests. Set to 0 to disable.
+    PRINCIPAL_CACHE_TIMEOUT = int(os.getenv('PRINCIPAL_CACHE_TIMEOUT', '60'))
+
+    # How long (in seconds) the total of a cursor paginated listing is reused for
+    # its following pages. Set to 0 to count on every page.
+    PAGINATION_COUNT_CACHE_TIMEOUT = int(os.getenv('PAGINATION_COUNT_CACHE_TIMEOUT', '60'))
+
+    # How long (in seconds) the engagement a slug resolves to is cached. Slugs are
+    # only changed through EngagementSlugService, which drops stale entries.
+    ENGAGEMENT_SLUG_CACHE_TIMEOUT = int(os.getenv('ENGAGEMENT_SLUG_CACHE_TIMEOUT', '300'))
+
+    # How long (in seconds) a template known to be cached by CDOGS is trusted to still be
+    # there before it is checked again. Set to 0 to check before every document.
+    CDOGS_TEMPLATE_CACHE_TIMEOUT = int(os.getenv('CDOGS_TEMPLATE_CACHE_TIMEOUT', '3600'))
+
+    # How long (in seconds) the assembled public view of an engagement is cached. Views are
+    # keyed on the version of the engagement, which every edit bumps, so this only bounds memory.
+    ENGAGEMENT_VIEW_CACHE_TIMEOUT = int(os.getenv('ENGAGEMENT_VIEW_CACHE_TIMEOUT', '300'))
+
+    # How long (in seconds) the published and closed engagements read by anonymous users
+    # are cached. Entries are keyed on the version of the engagement. Set to 0 to disable.
+    PUBLIC_ENGAGEMENT_CACHE_TIMEOUT = int(os.getenv('PUBLIC_ENGAGEMENT_CACHE_TIMEOUT', '300'))
+
+    # A request issuing the same SQL statement this many times, e.g. once for every row of
+    # a list (an N+1 query), is logged and counted in the ops metrics. Set to 0 to disable.
+    SQL_REPEATED_STATEMENT_THRESHOLD = int(os.getenv('SQL_REPEATED_STATEMENT_THRESHOLD', '10'))
+
+    # Bearer token the metrics scraper sends to read the ops metrics. Unset, the metrics are not served.
+    OPS_TOKEN = os.getenv('OPS_TOKEN')
+
     # PostgreSQL configuration
     DB_CONFIG = DB = {
         'USER': os.getenv('DATABASE_USERNAME', ''),
@@ -221,6 +265,19 @@ class Config:  # pylint: disable=too-few-public-methods
         'PORT': os.getenv('DATABASE_PORT', '5432'),
     }
 
+    # Cache configuration. TYPE is a Flask-Caching backend for the shared tier:
+    # 'SimpleCache' (per-process), 'RedisCache' (shared across workers and pods)
+    # or 'api.utils.cache.FakeRedisCache' (in-memory Redis stand-in for tests).
+    # Entries are also held in a small in-process LRU for LOCAL_TTL seconds.
+    CACHE_CONFIG = {
+        'TYPE': os.getenv('CACHE_TYPE', 'SimpleCache'),
+        'REDIS_URL': os.getenv('CACHE_REDIS_URL'),
+        'KEY_PREFIX': os.getenv('CACHE_KEY_PREFIX', 'dep:'),
+        'DEFAULT_TIMEOUT': int(os.getenv('CACHE_DEFAULT_TIMEOUT', '300')),
+        'LOCAL_MAX_SIZE': int(os.getenv('CACHE_LOCAL_MAX_SIZE', '1024')),
+        'LOCAL_TTL': int(os.getenv('CACHE_LOCAL_TTL', '30')),
+    }
+
     # Configuration for AWS S3, used for file storage
     S3_CONFIG = S3 = {
         'BUCKET': os.getenv('S3_BUCKET'),
@@ -229,6 +286,10 @@ class Config:  # pylint: disable=too-few-public-methods
         'HOST': os.getenv('S3_HOST'),
         'REGION': os.getenv('S3_REGION'),
         'SERVICE': os.getenv('S3_SERVICE'),
+        # seconds for which presigned upload and download URLs are valid
+        'PRESIGNED_URL_EXPIRY': int(os.getenv('S3_PRESIGNED_URL_EXPIRY', '900')),
+        # seconds to wait for object storage to accept a connection or send data
+        'TIMEOUT': int(os.getenv('S3_TIMEOUT', '60')),
     }
 
     # The following are the paths used in the email templates. They do not
@@ -261,6 +322,17 @@ class Config:  # pylint: disable=too-few-public-methods
 
     # The API endpoint used to send emails to participants.
     NOTIFICATIONS_EMAIL_ENDPOINT = os.getenv('NOTIFICATIONS_EMAIL_ENDPOINT')
+    # The API endpoint used to send many emails in one request.
+    NOTIFICATIONS_EMAIL_BATCH_ENDPOINT = os.getenv('NOTIFICATIONS_EMAIL_BATCH_ENDPOINT') or (
+        f'{NOTIFICATIONS_EMAIL_ENDPOINT}/batch' if NOTIFICATIONS_EMAIL_ENDPOINT else None)
+    # Tuning for notification.send_email_batch: emails posted per request to the batch
+    # endpoint, concurrent requests, retries per recipient and the initial retry backoff.
+    EMAIL_BATCH_CONFIG = {
+        'BATCH_SIZE': int(os.getenv('EMAIL_BATCH_SIZE', '50')),
+        'MAX_WORKERS': int(os.getenv('EMAIL_BATCH_MAX_WORKERS', '8')),
+        'MAX_RETRIES': int(os.getenv('EMAIL_BATCH_MAX_RETRIES', '3')),
+        'BACKOFF_SECONDS': float(os.getenv('EMAIL_BATCH_BACKOFF_SECONDS', '1')),
+    }
     # The secret key used for encryption when sending emails to participants.
     EMAIL_SECRET_KEY = os.getenv('EMAIL_SECRET_KEY', os.urandom(24))
     # Templates for sending users various notifications by email.
@@ -366,6 +438,8 @@ class TestConfig(TestKeyConfig, Config):  # pylint: disable=too-few-public-metho
     # unhandled exception occurs
     USE_DEBUG = False
 
+    OPS_TOKEN = 'test-ops-token'
+
     # JWT OIDC Settings for the test environment
     JWT_OIDC_TEST_MODE = True  # enables the test mode for flask_jwt_oidc
     JWT_OIDC_TEST_AUDIENCE = os.getenv('JWT_OIDC_TEST_AUDIENCE')
@@ -383,6 +457,14 @@ class TestConfig(TestKeyConfig, Config):  # pylint: disable=too-few-public-metho
     }
     IS_SINGLE_TENANT_ENVIRONMENT = False
 
+    # Tests reuse the same user ids with different roles; always resolve principals fresh
+    PRINCIPAL_CACHE_TIMEOUT = 0
+    PAGINATION_COUNT_CACHE_TIMEOUT = 0
+    ENGAGEMENT_SLUG_CACHE_TIMEOUT = 0
+    CDOGS_TEMPLATE_CACHE_TIMEOUT = 0
+    ENGAGEMENT_VIEW_CACHE_TIMEOUT = 0
+    PUBLIC_ENGAGEMENT_CACHE_TIMEOUT = 0
+
 
 class DockerConfig(Config):  # pylint: disable=too-few-public-methods
     """Configuration for deployment using Docker."""
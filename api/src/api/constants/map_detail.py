@@ -0,0 +1,23 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Constants of the levels of detail of map geometries."""
+from enum import Enum
+
+
+class MapDetail(Enum):
+    """Enum of the levels of detail the geojson of a map is stored at."""
+
+    FULL = 'full'
+    MEDIUM = 'medium'
+    LOW = 'low'
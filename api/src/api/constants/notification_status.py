@@ -20,3 +20,4 @@ class NotificationStatus(IntEnum):
 
     PROCESSING = 1
     SENT = 2
+    FAILED = 3
@@ -72,3 +72,5 @@ from .user_group import UserGroup
 from .user_role import UserRole
 from .group_role_mapping import GroupRoleMapping
 from .user_group_membership import UserGroupMembership
+from .document_job import DocumentJob
+from .engagement_version import touch_engagements
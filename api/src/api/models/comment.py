@@ -3,30 +3,41 @@
 Manages the comment
 """
 from __future__ import annotations
-from datetime import datetime
-from operator import or_
+import html
+from datetime import date, datetime
 
-from sqlalchemy import and_, asc, desc
+from sqlalchemy import Computed, Index, Text, and_, asc, cast, desc, func, literal, or_, select
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.sql import text
 from sqlalchemy.sql.expression import true
 from sqlalchemy.sql.schema import ForeignKey
-from sqlalchemy.ext.hybrid import hybrid_property
 
 from api.constants.comment_status import Status as CommentStatus
 from api.constants.engagement_status import Status as EngagementStatus
+from api.constants.user import SYSTEM_USER
 from api.models.pagination_options import PaginationOptions
 from api.models.engagement import Engagement
 from api.models.report_setting import ReportSetting
 from api.models.submission import Submission
 from api.models.survey import Survey
 from api.schemas.comment import CommentSchema
-from api.schemas.submission import SubmissionSchema
+from api.utils.keyset_pagination import paginate_by_cursor
 
 from .base_model import BaseModel
 from .comment_status import CommentStatus as CommentStatusModel
 from .db import db
 
 
+# text search configuration used to index and query comment text
+SEARCH_CONFIG = 'english'
+# control characters that delimit the search words in headlines until the text is escaped
+_HEADLINE_START, _HEADLINE_STOP = '\x02', '\x03'
+# marks report settings that have not been attached to a comment
+_NOT_LOADED = object()
+
+
 class Comment(BaseModel):
     """Definition of the Comment entity."""
 
@@ -38,21 +49,83 @@ class Comment(BaseModel):
     participant_id = db.Column(db.Integer, ForeignKey('participant.id', ondelete='SET NULL'), nullable=True)
     submission_id = db.Column(db.Integer, ForeignKey('submission.id', ondelete='SET NULL'), nullable=True)
     component_id = db.Column(db.String(10))
+    # maintained by the database; deferred so it is not loaded with the comment
+    search_vector = deferred(db.Column(TSVECTOR, Computed(f"to_tsvector('{SEARCH_CONFIG}', text)", persisted=True)))
+
+    __table_args__ = (
+        # support keyset pagination of the published comments of a survey
+        Index('ix_comment_survey_id_id', 'survey_id', 'id'),
+        # support full-text and substring search of comment text
+        Index('ix_comment_search_vector', 'search_vector', postgresql_using='gin'),
+        Index('ix_comment_text_trgm', 'text', postgresql_using='gin', postgresql_ops={'text': 'gin_trgm_ops'}),
+    )
+
+    @classmethod
+    def search_filter(cls, search_text):
+        """Return the criterion matching comments containing the search words or the search text."""
+        return or_(
+            cls.search_vector.op('@@')(func.websearch_to_tsquery(SEARCH_CONFIG, search_text)),
+            cls.text.ilike('%' + search_text + '%'))
+
+    @classmethod
+    def search_rank(cls, search_text):
+        """Return the relevance of a comment to the search text."""
+        return func.ts_rank_cd(cls.search_vector, func.websearch_to_tsquery(SEARCH_CONFIG, search_text))
+
+    @classmethod
+    def search_headline(cls, search_text):
+        """Return a snippet of the comment text with the search words delimited."""
+        return func.ts_headline(
+            SEARCH_CONFIG, cls.text, func.websearch_to_tsquery(SEARCH_CONFIG, search_text),
+            f'StartSel={_HEADLINE_START}, StopSel={_HEADLINE_STOP}, MaxFragments=2, MaxWords=30, MinWords=10')
 
-    @hybrid_property
+    @staticmethod
+    def _with_headlines(rows):
+        """Return the comments of (comment, headline, ...) rows, each with an HTML headline marking the search words."""
+        comments = []
+        for comment, headline, *_ in rows:
+            comment.headline = html.escape(headline or '') \
+                .replace(_HEADLINE_START, '<mark>').replace(_HEADLINE_STOP, '</mark>')
+            comments.append(comment)
+        return comments
+
+    # display flag of the comment's question, once attached by load_for_dump
+    _display_setting = _NOT_LOADED
+
+    @property
     def is_displayed(self):
-        """Get report settings."""
-        return self._display()
+        """Return whether the comment's question is displayed on the report, or None if it has no report setting."""
+        if self._display_setting is _NOT_LOADED:
+            self._display_setting = ReportSetting.get_display_by_question([self.survey_id]) \
+                .get((self.survey_id, self.component_id))
+        return self._display_setting
 
-    def _display(self):
-        """Return report settings for single/multi line comment type questions."""
-        report_setting = db.session.query(ReportSetting).filter(
-            ReportSetting.question_key == self.component_id,
-            ReportSetting.survey_id == self.survey_id).one_or_none()
-        if report_setting:
-            return f'{report_setting.display}'
+    @classmethod
+    def load_for_dump(cls, comments, display=True, submissions=True, surveys=True):
+        """Load what serializing the comments needs in one query each, rather than one query per comment.
+
+        Report setting display flags, submissions and surveys are attached to the comments.
+        """
+        if display:
+            display_by_question = ReportSetting.get_display_by_question({comment.survey_id for comment in comments})
+            for comment in comments:
+                comment._display_setting = display_by_question.get(  # pylint: disable=protected-access
+                    (comment.survey_id, comment.component_id))
+        if submissions:
+            cls._attach(comments, 'submission', Submission, 'submission_id')
+        if surveys:
+            cls._attach(comments, 'survey', Survey, 'survey_id')
 
-        return None
+    @staticmethod
+    def _attach(comments, relationship, model, foreign_key):
+        """Load the related rows of the comments in one query and set them as the relationship's value."""
+        comments = [comment for comment in comments if relationship not in comment.__dict__]
+        ids = {getattr(comment, foreign_key) for comment in comments} - {None}
+        if not ids:
+            return
+        related = {row.id: row for row in db.session.query(model).filter(model.id.in_(list(ids)))}
+        for comment in comments:
+            set_committed_value(comment, relationship, related.get(getattr(comment, foreign_key)))
 
     @classmethod
     def get_by_submission(cls, submission_id):
@@ -72,7 +145,7 @@ class Comment(BaseModel):
             .filter(and_(Comment.survey_id == survey_id, ReportSetting.display == true()))
 
         if search_text:
-            query = query.filter(Comment.text.ilike('%' + search_text + '%'))
+            query = query.filter(Comment.search_filter(search_text))
 
         sort = asc(text(pagination_options.sort_key)) if pagination_options.sort_order == 'asc'\
             else desc(text(pagination_options.sort_key))
@@ -110,18 +183,41 @@ class Comment(BaseModel):
             query = query.filter(Engagement.status_id != EngagementStatus.Unpublished.value)
 
         if search_text:
-            query = query.filter(Comment.text.ilike('%' + search_text + '%'))
+            query = query.filter(Comment.search_filter(search_text))
 
-        query = query.order_by(Comment.id.asc())
+        if pagination_options and pagination_options.use_cursor:
+            return cls._paginate_accepted_comments_by_cursor(query, pagination_options, search_text)
+
+        if search_text:
+            # list the best matches first, each with a highlighted snippet
+            query = query.add_columns(Comment.search_headline(search_text))\
+                .order_by(Comment.search_rank(search_text).desc(), Comment.id.asc())
+        else:
+            query = query.order_by(Comment.id.asc())
 
         no_pagination_options = not pagination_options or not pagination_options.page or not pagination_options.size
         if no_pagination_options:
             items = query.all()
-            return items, len(items)
+            total = len(items)
+        else:
+            page = query.paginate(page=pagination_options.page, per_page=pagination_options.size)
+            items, total = page.items, page.total
 
-        page = query.paginate(page=pagination_options.page, per_page=pagination_options.size)
+        return (Comment._with_headlines(items) if search_text else items), total
 
-        return page.items, page.total
+    @classmethod
+    def _paginate_accepted_comments_by_cursor(cls, query, pagination_options: PaginationOptions, search_text):
+        """Return a page of the comments by keyset, the best matches first by default when searching."""
+        sort_columns = {'id': Comment.id}
+        if search_text:
+            search_rank = sort_columns['search_rank'] = Comment.search_rank(search_text).label('search_rank')
+            query = query.add_columns(Comment.search_headline(search_text), search_rank)
+        if not pagination_options.sort_key:
+            pagination_options.sort_key, pagination_options.sort_order = \
+                ('search_rank', 'desc') if search_text else ('id', 'asc')
+
+        items, total = paginate_by_cursor(query, pagination_options, sort_columns, Comment.id)
+        return (Comment._with_headlines(items) if search_text else items), total
 
     @classmethod
     def get_by_survey_id_paginated(
@@ -139,11 +235,17 @@ class Comment(BaseModel):
 
         if search_text:
             # Remove all non-digit characters from search text
-            query = query.filter(Submission.comments.any(Comment.text.ilike('%' + search_text + '%')))
+            query = query.filter(Submission.comments.any(Comment.search_filter(search_text)))
 
         if advanced_search_filters:
             query = cls._filter_by_advanced_filters(query, advanced_search_filters)
 
+        if pagination_options.use_cursor:
+            columns = {'id': Submission.id, 'created_date': Submission.created_date,
+                       'review_date': Submission.review_date}
+            return paginate_by_cursor(query, pagination_options, {
+                **columns, **{f'submission.{key}': column for key, column in columns.items()}}, Submission.id)
+
         sort = asc(text(pagination_options.sort_key)) if pagination_options.sort_order == 'asc'\
             else desc(text(pagination_options.sort_key))
 
@@ -222,22 +324,25 @@ class Comment(BaseModel):
         return query.first()
 
     @classmethod
-    def get_comments_by_survey_id(cls, survey_id):
-        """Get comments for staff."""
+    def stream_comments_by_survey_id(cls, survey_id, batch_size=1000):
+        """Stream the comments of the submissions exported for staff, with their submission, ordered by submission."""
         null_value = None
-        query = db.session.query(Submission)\
+        return db.session.query(
+            Submission.id.label('submission_id'), Submission.created_date, Submission.comment_status_id,
+            Submission.review_date, Submission.reviewed_by, Submission.has_personal_info,
+            Submission.has_profanity, Submission.has_threat, Submission.rejected_reason_other,
+            Comment.component_id, Comment.text)\
             .join(Comment, Submission.id == Comment.submission_id)\
             .filter(and_(Submission.survey_id == survey_id,
-                         or_(Submission.reviewed_by != 'System', Submission.reviewed_by == null_value)))
-
-        query = query.order_by(Submission.id.asc())
-        items = query.all()
-        return SubmissionSchema(many=True, exclude=['submission_json']).dump(items)
+                         or_(Submission.reviewed_by != 'System', Submission.reviewed_by == null_value)))\
+            .order_by(Submission.id.asc(), Comment.id.asc())\
+            .execution_options(stream_results=True)\
+            .yield_per(batch_size)
 
     @classmethod
-    def get_public_viewable_comments_by_survey_id(cls, survey_id):
-        """Get comments that are viewable on the public report."""
-        query = db.session.query(Comment)\
+    def _public_viewable_comments_query(cls, survey_id, *entities):
+        return db.session.query(*entities)\
+            .select_from(Comment)\
             .join(Submission, Submission.id == Comment.submission_id)\
             .join(CommentStatusModel, Submission.comment_status_id == CommentStatusModel.id)\
             .join(Survey, Survey.id == Submission.survey_id)\
@@ -250,6 +355,95 @@ class Comment(BaseModel):
                     ReportSetting.display == true(),
                     Submission.reviewed_by != 'System'
                 ))
+
+    @classmethod
+    def get_public_viewable_comments_by_survey_id(cls, survey_id):
+        """Get comments that are viewable on the public report."""
+        query = cls._public_viewable_comments_query(survey_id, Comment)
         query = query.order_by(Comment.text.asc())
         items = query.all()
         return CommentSchema(many=True, only=['submission_id', 'label', 'text']).dump(items)
+
+    @classmethod
+    def get_export_watermark(cls, survey_id) -> tuple:
+        """Return values that change whenever the comments of the survey, their review or the survey do."""
+        def last_change(model, *criteria):
+            return db.session.query(func.max(func.coalesce(model.updated_date, model.created_date)))\
+                .filter(*criteria).scalar_subquery()
+
+        def count(column, *criteria):
+            return db.session.query(func.count(column)).filter(*criteria).scalar_subquery()
+
+        return tuple(db.session.query(
+            last_change(Survey, Survey.id == survey_id),
+            last_change(Submission, Submission.survey_id == survey_id),
+            count(Submission.id, Submission.survey_id == survey_id),
+            last_change(Comment, Comment.survey_id == survey_id),
+            count(Comment.id, Comment.survey_id == survey_id),
+            last_change(ReportSetting, ReportSetting.survey_id == survey_id),
+        ).one())
+
+    @classmethod
+    def get_public_viewable_first_texts(cls, survey_id):
+        """Return (component id, first comment text) of the publicly viewable comments, per question."""
+        return cls._public_viewable_comments_query(survey_id, Comment.component_id, func.min(Comment.text))\
+            .group_by(Comment.component_id)\
+            .all()
+
+    @classmethod
+    def stream_public_viewable_comments(cls, survey_id, component_ids, batch_size=1000):
+        """Stream (submission id, text) of the publicly viewable comments on the questions, ordered by text."""
+        return cls._public_viewable_comments_query(survey_id, Comment.submission_id, Comment.text)\
+            .filter(Comment.component_id.in_(component_ids))\
+            .order_by(Comment.text.asc())\
+            .execution_options(stream_results=True)\
+            .yield_per(batch_size)
+
+    @classmethod
+    def find_submission_ids_to_redact(cls, closed_on_or_before: date, after_id: int, limit: int) -> list[int]:
+        """Return the ids of rejected submissions still to be redacted, of engagements closed by the date."""
+        rows = db.session.query(Submission.id)\
+            .join(Engagement, Engagement.id == Submission.engagement_id)\
+            .filter(and_(
+                Engagement.end_date <= closed_on_or_before,
+                Engagement.status_id == EngagementStatus.Closed.value,
+                Submission.comment_status_id == CommentStatus.Rejected.value,
+                Submission.has_threat.is_(False),
+                Submission.redacted_date.is_(None),
+                Submission.id > after_id))\
+            .order_by(Submission.id)\
+            .limit(limit)\
+            .all()
+        return [row.id for row in rows]
+
+    @classmethod
+    def redact_submissions(cls, submission_ids: list[int], redaction_text: str) -> int:
+        """Redact the comments of the submissions, and the answers they came from, returning the comments redacted.
+
+        The submissions are marked redacted; the caller commits.
+        """
+        now = datetime.utcnow()
+        comment_count = db.session.query(Comment)\
+            .filter(Comment.submission_id.in_(submission_ids))\
+            .update({Comment.text: redaction_text, Comment.updated_by: SYSTEM_USER, Comment.updated_date: now},
+                    synchronize_session=False)
+
+        # the answers to redact are those keyed by the component ids of the comments of each submission,
+        # e.g. {'simpletextarea': '[Comment Redacted]', 'simpletextfield': '[Comment Redacted]'}
+        redacted_answers = select(
+            func.jsonb_object_agg(Comment.component_id, func.to_jsonb(cast(literal(redaction_text), Text))))\
+            .where(and_(Comment.submission_id == Submission.id,
+                        Submission.submission_json.has_key(Comment.component_id)))\
+            .correlate(Submission)\
+            .scalar_subquery()
+        db.session.query(Submission)\
+            .filter(Submission.id.in_(submission_ids))\
+            .update({
+                # submissions without such answers are concatenated with an empty object, left unchanged
+                Submission.submission_json: Submission.submission_json.op('||')(
+                    func.coalesce(redacted_answers, func.jsonb_build_object())),
+                Submission.redacted_date: now,
+                Submission.updated_by: SYSTEM_USER,
+                Submission.updated_date: now,
+            }, synchronize_session=False)
+        return comment_count
@@ -0,0 +1,109 @@
+"""Document job model class.
+
+Manages the queue of documents generated outside of the request that asked for them
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import Index, and_, func, or_
+
+from api.constants.document_job_status import DocumentJobStatus
+
+from .base_model import BaseModel
+from .db import db
+
+
+class DocumentJob(BaseModel):  # pylint: disable=too-few-public-methods
+    """Definition of the document job entity."""
+
+    __tablename__ = 'document_job'
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    document_type_id = db.Column(db.Integer, db.ForeignKey('generated_document_type.id'), nullable=False)
+    survey_id = db.Column(db.Integer, db.ForeignKey('survey.id', ondelete='CASCADE'), nullable=False)
+    # sha256 of the document type, survey, template digest and data watermark the document was requested for
+    cache_key = db.Column(db.String(64), nullable=False)
+    status = db.Column(db.Enum(DocumentJobStatus), nullable=False, default=DocumentJobStatus.PENDING)
+    # object storage key, file name and content type of the generated document
+    artifact_key = db.Column(db.String(255), nullable=True)
+    file_name = db.Column(db.String(255), nullable=True)
+    content_type = db.Column(db.String(255), nullable=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    last_error = db.Column(db.Text, nullable=True)
+    next_retry_at = db.Column(db.DateTime, nullable=True)  # not claimed again before this time
+    locked_at = db.Column(db.DateTime, nullable=True)  # start of the lease held by the processing worker
+    locked_by = db.Column(db.String(100), nullable=True)
+    completed_date = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        # looking up an existing document for a request
+        Index('ix_document_job_cache_key_status', 'cache_key', 'status'),
+        # claiming pending jobs
+        Index('ix_document_job_status_id', 'status', 'id'),
+    )
+
+    @classmethod
+    def find_reusable(cls, cache_key: str) -> Optional[DocumentJob]:
+        """Return the job for the key that has completed, or else the one still to be completed."""
+        return db.session.query(cls)\
+            .filter(cls.cache_key == cache_key,
+                    cls.status.in_([DocumentJobStatus.COMPLETED, DocumentJobStatus.PENDING,
+                                    DocumentJobStatus.PROCESSING]))\
+            .order_by(cls.status.desc(), cls.id.desc())\
+            .first()
+
+    @classmethod
+    def claim_pending(cls, max_size: int, worker_id: str, lease_seconds: int) -> List[DocumentJob]:
+        """Claim a batch of pending jobs and lease them to the worker.
+
+        Rows are locked with FOR UPDATE SKIP LOCKED, so concurrent workers never claim
+        the same job. Jobs that are pending and due for a (re)try are claimed, as are
+        PROCESSING jobs whose lease has expired because their worker died.
+        """
+        now = datetime.utcnow()
+        lease_expired_before = now - timedelta(seconds=lease_seconds)
+        query = db.session.query(cls)\
+            .filter(or_(
+                and_(cls.status == DocumentJobStatus.PENDING,
+                     or_(cls.next_retry_at.is_(None), cls.next_retry_at <= now)),
+                and_(cls.status == DocumentJobStatus.PROCESSING,
+                     func.coalesce(cls.locked_at, cls.updated_date, cls.created_date) < lease_expired_before),
+            ))\
+            .order_by(cls.id)\
+            .with_for_update(skip_locked=True)
+        if max_size != 0:
+            query = query.limit(max_size)
+        jobs = query.all()
+        for job in jobs:
+            job.status = DocumentJobStatus.PROCESSING
+            job.attempts = (job.attempts or 0) + 1
+            job.locked_at = now
+            job.locked_by = worker_id
+            job.updated_date = now
+        db.session.commit()
+        return jobs
+
+    @classmethod
+    def mark_completed(cls, job_id: int, artifact_key: str, file_name: str, content_type: str):
+        """Record where the generated document is stored and release the lease."""
+        cls._release(job_id, DocumentJobStatus.COMPLETED, artifact_key=artifact_key, file_name=file_name,
+                     content_type=content_type, completed_date=datetime.utcnow(), last_error=None)
+
+    @classmethod
+    def mark_failed(cls, job_id: int, error: str, next_retry_at: Optional[datetime] = None):
+        """Record a failed attempt; the job is retried at next_retry_at, or given up on if it is None."""
+        status = DocumentJobStatus.PENDING if next_retry_at else DocumentJobStatus.FAILED
+        cls._release(job_id, status, last_error=error, next_retry_at=next_retry_at)
+
+    @classmethod
+    def _release(cls, job_id: int, status: DocumentJobStatus, **values):
+        db.session.query(cls).filter(cls.id == job_id).update({
+            cls.status: status,
+            cls.locked_at: None,
+            cls.locked_by: None,
+            cls.updated_date: datetime.utcnow(),
+            **{getattr(cls, name): value for name, value in values.items()},
+        }, synchronize_session=False)
+        db.session.commit()
@@ -4,8 +4,9 @@ Manages the Email queue
 """
 from __future__ import annotations
 
-from typing import List
-from sqlalchemy import and_, func
+from datetime import datetime, timedelta
+from typing import List, Optional
+from sqlalchemy import and_, func, or_
 
 from api.constants.notification_status import NotificationStatus
 from api.models.engagement import Engagement
@@ -26,17 +27,66 @@ class EmailQueue(BaseModel):  # pylint: disable=too-few-public-methods
                             nullable=False)  # type of the entity which triggers email ,like engagement , user
     action = db.Column(db.String(100))  # created , deleted etc
     notification_status = db.Column(db.Enum(NotificationStatus), nullable=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    last_error = db.Column(db.Text, nullable=True)
+    next_retry_at = db.Column(db.DateTime, nullable=True)  # not picked up again before this time
+    locked_at = db.Column(db.DateTime, nullable=True)  # start of the lease held by the processing worker
+    locked_by = db.Column(db.String(100), nullable=True)
 
-    @staticmethod
-    def get_unprocessed_mails_for_open_engagements(max_size: int) -> List[EmailQueue]:
-        """Return a list of unprocessed emails."""
-        now = local_datetime().date()
-        query = db.session.query(EmailQueue)\
-            .join(Engagement, Engagement.id == EmailQueue.entity_id)\
-            .filter(and_(EmailQueue.notification_status.is_(None),
-                         EmailQueue.entity_type == SourceType.ENGAGEMENT.value,
-                         EmailQueue.action == SourceAction.PUBLISHED.value),
-                    func.date(Engagement.start_date) == now)
+    @classmethod
+    def claim_mails_for_open_engagements(cls, max_size: int, worker_id: str,
+                                         lease_seconds: int) -> List[EmailQueue]:
+        """Claim a batch of due emails for published engagements and lease them to the worker.
+
+        Rows are locked with FOR UPDATE SKIP LOCKED, so concurrent workers never claim
+        the same row. Rows that are pending and due for a (re)try are claimed, as are
+        PROCESSING rows whose lease has expired because their worker died.
+        """
+        now = datetime.utcnow()
+        lease_expired_before = now - timedelta(seconds=lease_seconds)
+        query = db.session.query(cls)\
+            .join(Engagement, Engagement.id == cls.entity_id)\
+            .filter(cls.entity_type == SourceType.ENGAGEMENT.value,
+                    cls.action == SourceAction.PUBLISHED.value,
+                    func.date(Engagement.start_date) == local_datetime().date(),
+                    or_(
+                        and_(cls.notification_status.is_(None),
+                             or_(cls.next_retry_at.is_(None), cls.next_retry_at <= now)),
+                        and_(cls.notification_status == NotificationStatus.PROCESSING,
+                             func.coalesce(cls.locked_at, cls.updated_date, cls.created_date) < lease_expired_before),
+                    ))\
+            .order_by(cls.id)\
+            .with_for_update(skip_locked=True, of=cls)
         if max_size != 0:
             query = query.limit(max_size)
-        return query.all()
+        mails = query.all()
+        for mail in mails:
+            mail.notification_status = NotificationStatus.PROCESSING
+            mail.attempts = (mail.attempts or 0) + 1
+            mail.locked_at = now
+            mail.locked_by = worker_id
+            mail.updated_date = now
+        db.session.commit()
+        return mails
+
+    @classmethod
+    def mark_sent(cls, mail_id: int):
+        """Record that the email was sent and release its lease."""
+        cls._release(mail_id, NotificationStatus.SENT)
+
+    @classmethod
+    def mark_failed(cls, mail_id: int, error: str, next_retry_at: Optional[datetime] = None):
+        """Record a failed attempt; the email is retried at next_retry_at, or given up on if it is None."""
+        status = None if next_retry_at else NotificationStatus.FAILED
+        cls._release(mail_id, status, last_error=error, next_retry_at=next_retry_at)
+
+    @classmethod
+    def _release(cls, mail_id: int, status: Optional[NotificationStatus], **values):
+        db.session.query(cls).filter(cls.id == mail_id).update({
+            cls.notification_status: status,
+            cls.locked_at: None,
+            cls.locked_by: None,
+            cls.updated_date: datetime.utcnow(),
+            **{getattr(cls, name): value for name, value in values.items()},
+        }, synchronize_session=False)
+        db.session.commit()
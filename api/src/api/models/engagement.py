@@ -9,7 +9,7 @@ import logging
 from datetime import datetime
 from typing import List, Optional
 
-from sqlalchemy import and_, asc, desc, or_
+from sqlalchemy import Index, and_, asc, desc, or_
 from sqlalchemy.dialects.postgresql import JSON
 from sqlalchemy.ext.associationproxy import association_proxy
 from sqlalchemy.ext.orderinglist import ordering_list
@@ -26,6 +26,7 @@ from api.schemas.engagement import EngagementSchema
 from api.utils.datetime import local_datetime
 from api.utils.enums import MembershipStatus
 from api.utils.filter_types import filter_map
+from api.utils.keyset_pagination import paginate_by_cursor
 
 from .base_model import BaseModel
 from .db import db
@@ -85,6 +86,8 @@ class Engagement(BaseModel):
     subscribe_consent_message = db.Column(JSON, unique=False, nullable=True)
     sponsor_name = db.Column(db.String(50), nullable=True)
     more_engagements_heading = db.Column(db.String(60), nullable=True)
+    # bumped on every change to the public content of the engagement, see engagement_version
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
     suggested_engagement_links = db.relationship(
         'SuggestedEngagement',
         back_populates='source_engagement',
@@ -107,6 +110,15 @@ class Engagement(BaseModel):
     suggested_engagements = association_proxy('suggested_engagement_links', 'suggested_engagement')
     suggested_engagement_ids = association_proxy('suggested_engagement_links', 'suggested_engagement_id')
 
+    __table_args__ = (
+        # support keyset pagination of the engagement listing on each of its cursor sort keys
+        Index('ix_engagement_tenant_name_id', 'tenant_id', 'name', 'id'),
+        Index('ix_engagement_tenant_created_date_id', 'tenant_id', 'created_date', 'id'),
+        Index('ix_engagement_tenant_published_date_id', 'tenant_id', 'published_date', 'id'),
+        # support substring search of engagement names
+        Index('ix_engagement_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+    )
+
     @classmethod
     def get_engagements_paginated(
             cls,
@@ -144,6 +156,9 @@ class Engagement(BaseModel):
                 statuses = scope_options.engagement_status_ids
                 query = cls._filter_by_statuses(query, statuses)
 
+        if pagination_options.use_cursor:
+            return paginate_by_cursor(query, pagination_options, cls._cursor_sort_columns(), Engagement.id)
+
         sort = cls._get_sort_order(pagination_options)
 
         query = query.order_by(sort)
@@ -226,6 +241,7 @@ class Engagement(BaseModel):
         # Ensure no relationship fields are included in the update payload, only real columns
         updatable_columns = {column.name for column in Engagement.__table__.columns}
         updatable_columns.discard('id')  # ID can never be updated
+        updatable_columns.discard('version')  # only bumped by the engagement_version listeners
         update_payload = {
             key: value for key, value in engagement_data.items() if key in updatable_columns
         }
@@ -234,6 +250,11 @@ class Engagement(BaseModel):
             db.session.commit()
         return engagement
 
+    @classmethod
+    def get_version(cls, engagement_id) -> Optional[int]:
+        """Return the version of the public content of the engagement, or None if it does not exist."""
+        return db.session.query(cls.version).filter_by(id=engagement_id).scalar()
+
     @classmethod
     def find_tenant_id_by_id(cls, engagement_id):
         """Return the tenant id for the engagement."""
@@ -283,6 +304,15 @@ class Engagement(BaseModel):
         db.session.commit()
         return records
 
+    @staticmethod
+    def _cursor_sort_columns():
+        columns = {
+            'name': Engagement.name,
+            'created_date': Engagement.created_date,
+            'published_date': Engagement.published_date,
+        }
+        return {**columns, **{f'engagement.{key}': column for key, column in columns.items()}}
+
     @staticmethod
     def _get_sort_order(pagination_options):
         sort = asc(text(pagination_options.sort_key)) if pagination_options.sort_order == 'asc' \
@@ -11,6 +11,7 @@ from sqlalchemy.sql.schema import ForeignKey
 
 from .base_model import BaseModel
 from .db import db
+from .engagement_version import touch_engagements
 
 
 class EngagementDetailsTab(BaseModel):
@@ -37,12 +38,14 @@ class EngagementDetailsTab(BaseModel):
     def bulk_insert_details_tabs(cls, insert_mappings: list) -> None:
         """Insert multiple engagement details tabs."""
         db.session.bulk_insert_mappings(cls, insert_mappings)
+        touch_engagements(db.session, cls, insert_mappings)
         db.session.commit()
 
     @classmethod
     def bulk_update_details_tabs(cls, update_mappings: list) -> None:
         """Update multiple engagement details tabs."""
         db.session.bulk_update_mappings(cls, update_mappings)
+        touch_engagements(db.session, cls, update_mappings)
         db.session.commit()
 
     @classmethod
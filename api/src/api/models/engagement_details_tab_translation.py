@@ -9,6 +9,7 @@ from typing import Iterable, Optional
 from sqlalchemy import UniqueConstraint
 from .base_model import BaseModel
 from .db import db
+from .engagement_version import touch_engagements
 from .engagement_details_tab import EngagementDetailsTab
 
 
@@ -59,12 +60,14 @@ class EngagementDetailsTabTranslation(BaseModel):
     def bulk_insert_details_tab_translations(cls, insert_mappings: list) -> None:
         """Insert multiple engagement details tab translations."""
         db.session.bulk_insert_mappings(cls, insert_mappings)
+        touch_engagements(db.session, cls, insert_mappings)
         db.session.commit()
 
     @classmethod
     def bulk_update_details_tab_translations(cls, update_mappings: list) -> None:
         """Update multiple engagement details tab translations."""
         db.session.bulk_update_mappings(cls, update_mappings)
+        touch_engagements(db.session, cls, update_mappings)
         db.session.commit()
 
     @classmethod
@@ -3,7 +3,7 @@
 Manages the engagement slug
 """
 from sqlalchemy import ForeignKey, Index, or_
-from sqlalchemy.orm import backref, relationship
+from sqlalchemy.orm import backref, relationship, validates
 
 from .base_model import BaseModel
 from .db import db
@@ -26,6 +26,7 @@ class EngagementSlug(BaseModel):
         index=True,
     )
 
+    # stored case-folded, so lookups are exact matches on the unique index
     slug = db.Column(db.String(200), nullable=False, unique=True)
 
     engagement = relationship(
@@ -34,13 +35,24 @@ class EngagementSlug(BaseModel):
     )
 
     __table_args__ = (
-        Index('idx_slug', slug),
+        # support the prefix matches used to find similar slugs
+        Index('ix_engagement_slug_slug_pattern', slug, postgresql_ops={'slug': 'varchar_pattern_ops'}),
     )
 
+    @staticmethod
+    def normalize(slug: str) -> str:
+        """Return the stored form of a slug."""
+        return slug.strip().lower()
+
+    @validates('slug')
+    def validate_slug(self, _, slug):
+        """Store slugs case-folded."""
+        return self.normalize(slug)
+
     @classmethod
     def find_by_slug(cls, slug):
         """Return engagement slug by slug."""
-        return cls.query.filter(cls.slug.ilike(slug)).first()
+        return cls.query.filter(cls.slug == cls.normalize(slug)).first()
 
     @classmethod
     def find_by_engagement_id(cls, engagement_id):
@@ -50,10 +62,11 @@ class EngagementSlug(BaseModel):
     @classmethod
     def find_similar_slugs(cls, target_slug: str):
         """Find already saved slugs with similar name and pattern."""
+        target_slug = cls.normalize(target_slug)
         similar_slugs = EngagementSlug.query.filter(
             or_(
                 EngagementSlug.slug == target_slug,
-                EngagementSlug.slug.ilike(target_slug + '-%')
+                EngagementSlug.slug.startswith(target_slug + '-', autoescape=True)
             )
         ).all()
         return similar_slugs
@@ -11,6 +11,7 @@ from sqlalchemy.sql.schema import ForeignKey
 from api.constants.engagement_status import SubmissionStatus
 from .base_model import BaseModel
 from .db import db
+from .engagement_version import touch_engagements
 
 
 class EngagementStatusBlock(BaseModel):
@@ -50,3 +51,4 @@ class EngagementStatusBlock(BaseModel):
     def save_status_blocks(cls, status_blocks: list) -> None:
         """Update widgets.."""
         db.session.bulk_save_objects(status_blocks)
+        touch_engagements(db.session, cls, status_blocks)
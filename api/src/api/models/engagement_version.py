@@ -0,0 +1,221 @@
+"""Versions of the public content of engagements.
+
+The public view of an engagement is cached per version of the engagement. Every
+write to the engagement, or to a row shown on its public page, bumps that version
+in the same transaction, so a cached view is never served once a newer edit has
+been committed.
+
+Writes through the unit of work and ORM enabled update and delete queries are
+picked up by the session events below. Bulk operations bypass both, so models
+using them call touch_engagements themselves.
+"""
+from collections import defaultdict
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import Column, event, inspect, select
+from sqlalchemy.orm import Mapper, Session
+
+from .db import db
+
+
+ENGAGEMENT_TABLE = 'engagement'
+
+# Tables whose rows are part of the public view of an engagement. The owning
+# engagement of a row is found through its foreign keys to these tables.
+VERSIONED_TABLES = frozenset({
+    ENGAGEMENT_TABLE,
+    'engagement_translation',
+    'engagement_metadata',
+    'engagement_status_block',
+    'engagement_details_tabs',
+    'engagement_details_tab_translations',
+    'suggested_engagements',
+    'survey',
+    'widget',
+    'widget_item',
+    'widget_translation',
+    'widget_documents',
+    'widget_events',
+    'event_item',
+    'event_item_translation',
+    'widget_subscribe',
+    'subscribe_item',
+    'subscribe_item_translation',
+    'widget_map',
+    'widget_video',
+    'widget_image',
+    'widget_listening',
+    'widget_timeline',
+    'timeline_event',
+    'timeline_event_translation',
+    'widget_polls',
+    'poll_answers',
+    'poll_answer_translation',
+})
+
+# Returns the known values of an attribute of a row, given the attribute key
+AttributeValues = Callable[[str], Iterable]
+
+# mappers of the models, by the name of their table; filled in on first use
+_mappers_by_table: Dict[str, Mapper] = {}
+
+
+def bump_versions(session: Session, engagement_ids: Iterable[int]):
+    """Increment the version of the given engagements within the session's transaction."""
+    engagement_ids = sorted(set(engagement_ids))
+    if not engagement_ids:
+        return
+    table = db.metadata.tables[ENGAGEMENT_TABLE]
+    session.connection().execute(
+        table.update()
+        .where(table.c.id.in_(engagement_ids))
+        .values(version=table.c.version + 1)
+    )
+
+
+def touch_engagements(session: Session, model, rows: Iterable):
+    """Bump the version of the engagements owning the rows written by a bulk operation.
+
+    Rows are the mappings or the objects handed to the bulk operation.
+    """
+    mapper = inspect(model)
+    engagement_ids = set()
+    with session.no_autoflush:
+        for row in rows:
+            if isinstance(row, dict):
+                engagement_ids |= _mapping_engagement_ids(session, mapper, row)
+            else:
+                engagement_ids |= _engagement_ids(session, mapper, [_loaded_values(row)])
+    bump_versions(session, engagement_ids)
+
+
+@event.listens_for(Session, 'after_flush')
+def _bump_flushed_engagements(session, _flush_context):
+    modified = [instance for instance in session.dirty if session.is_modified(instance)]
+    flushed_values = defaultdict(list)
+    for instance in (*session.new, *modified, *session.deleted):
+        state = inspect(instance)
+        if state.mapper.local_table.name in VERSIONED_TABLES:
+            flushed_values[state.mapper].append(_flushed_values(state))
+    engagement_ids = set()
+    with session.no_autoflush:
+        for mapper, rows in flushed_values.items():
+            engagement_ids |= _engagement_ids(session, mapper, rows)
+    bump_versions(session, engagement_ids)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _bump_queried_engagements(orm_execute_state):
+    mapper = orm_execute_state.bind_mapper
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete) or mapper is None \
+            or mapper.local_table.name not in VERSIONED_TABLES:
+        return
+    # the rows are read before the statement runs, while they still exist and are unchanged
+    session = orm_execute_state.session
+    with session.no_autoflush:
+        rows = _selected_values(session, mapper, orm_execute_state.statement.whereclause)
+        engagement_ids = _engagement_ids(session, mapper, rows)
+    bump_versions(session, engagement_ids)
+
+
+def _flushed_values(state) -> AttributeValues:
+    # both the old and the new value of a changed foreign key, without loading anything
+    return lambda key: state.attrs[key].history.sum() or [state.dict.get(key)]
+
+
+def _loaded_values(instance) -> AttributeValues:
+    return lambda key: [getattr(instance, key, None)]
+
+
+def _mapping_values(mapping: dict) -> AttributeValues:
+    return lambda key: [mapping.get(key)]
+
+
+def _mapping_engagement_ids(session, mapper, mapping: dict) -> Set[int]:
+    engagement_ids = _engagement_ids(session, mapper, [_mapping_values(mapping)])
+    if engagement_ids:
+        return engagement_ids
+    # update mappings usually only carry the primary key and the changed columns
+    primary_key = mapper.get_property_by_column(mapper.primary_key[0]).key
+    if mapping.get(primary_key) is None:
+        return set()
+    return _engagement_ids(session, mapper, _stored_values(session, mapper, {mapping[primary_key]}))
+
+
+def _engagement_ids(session, mapper, rows: Iterable[AttributeValues]) -> Set[int]:
+    table = mapper.local_table
+    if table.name == ENGAGEMENT_TABLE:
+        key = mapper.get_property_by_column(table.c.id).key
+        return {engagement_id for values in rows for engagement_id in _present(values(key))}
+
+    engagement_ids = set()
+    parent_ids = defaultdict(set)
+    for values in rows:
+        row_engagement_ids, row_parents = set(), []
+        for column, target in _references(mapper):
+            ids = _present(values(mapper.get_property_by_column(column).key))
+            if target == ENGAGEMENT_TABLE:
+                row_engagement_ids |= ids
+            else:
+                row_parents.extend((target, parent_id) for parent_id in ids)
+        engagement_ids |= row_engagement_ids
+        if not row_engagement_ids:
+            # rows not referencing the engagement belong to it through their parent row
+            for target, parent_id in row_parents:
+                parent_ids[target].add(parent_id)
+
+    # the parents of every row at once, one table at a time
+    for target, ids in parent_ids.items():
+        parent_mapper = _mapper_for_table(target)
+        if parent_mapper is not None:
+            engagement_ids |= _engagement_ids(session, parent_mapper, _stored_values(session, parent_mapper, ids))
+    return engagement_ids
+
+
+def _stored_values(session, mapper, ids: Iterable[int]) -> List[AttributeValues]:
+    # rows already in the session are read from it, the others from the columns referencing their parents
+    rows, missing_ids = [], []
+    for row_id in ids:
+        instance = session.identity_map.get(mapper.identity_key_from_primary_key([row_id]))
+        if instance is None:
+            missing_ids.append(row_id)
+        else:
+            rows.append(_loaded_values(instance))
+    if missing_ids:
+        rows.extend(_selected_values(session, mapper, mapper.primary_key[0].in_(missing_ids)))
+    return rows
+
+
+def _selected_values(session, mapper, whereclause) -> List[AttributeValues]:
+    # only the primary key and the columns referencing the engagement or parent rows, rather than whole rows
+    columns = [mapper.primary_key[0], *(column for column, _ in _references(mapper))]
+    keys = [mapper.get_property_by_column(column).key for column in columns]
+    query = select(*columns)
+    if whereclause is not None:
+        query = query.where(whereclause)
+    return [_mapping_values(dict(zip(keys, row))) for row in session.execute(query)]
+
+
+@lru_cache(maxsize=None)
+def _references(mapper) -> Tuple[Tuple[Column, str], ...]:
+    # the columns of the table referencing other versioned tables, with the table they reference
+    table = mapper.local_table
+    return tuple(
+        (column, foreign_key.column.table.name)
+        for column in table.columns
+        for foreign_key in column.foreign_keys
+        if foreign_key.column.table.name in VERSIONED_TABLES and foreign_key.column.table.name != table.name
+    )
+
+
+def _mapper_for_table(table_name: str) -> Optional[Mapper]:
+    if table_name not in _mappers_by_table:
+        # models may have been mapped since the last lookup
+        for mapper in db.Model.registry.mappers:
+            _mappers_by_table.setdefault(mapper.local_table.name, mapper)
+    return _mappers_by_table.get(table_name)
+
+
+def _present(values: Iterable) -> Set[int]:
+    return {value for value in values if value is not None}
@@ -8,6 +8,7 @@ from sqlalchemy.sql.schema import ForeignKey
 
 from .base_model import BaseModel
 from .db import db
+from .engagement_version import touch_engagements
 
 
 class EventItem(BaseModel):  # pylint: disable=too-few-public-methods, too-many-instance-attributes
@@ -30,3 +31,4 @@ class EventItem(BaseModel):  # pylint: disable=too-few-public-methods, too-many-
     def save_event_items(cls, event_items: list) -> None:
         """Update widgets.."""
         db.session.bulk_save_objects(event_items)
+        touch_engagements(db.session, cls, event_items)
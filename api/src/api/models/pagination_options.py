@@ -1,13 +1,30 @@
 """This module holds data classes."""
 
+from typing import Optional
+
 from attr import dataclass
 
 
 @dataclass
 class PaginationOptions:  # pylint: disable=too-many-instance-attributes
-    """Used to store pagination options."""
+    """Used to store pagination options.
+
+    When cursor is set (an empty string requests the first page) the listing is paginated by keyset
+    instead of by page number, and the cursor for the following page is recorded in next_cursor.
+    """
 
     page: int
     size: int
     sort_key: str
     sort_order: str
+    cursor: Optional[str] = None
+    next_cursor: Optional[str] = None
+
+    @property
+    def use_cursor(self) -> bool:
+        """Return True if the listing should be paginated by keyset."""
+        return self.cursor is not None and bool(self.size)
+
+    def cursor_fields(self) -> dict:
+        """Return the fields to add to a listing response for its pagination mode."""
+        return {'next_cursor': self.next_cursor} if self.use_cursor else {}
@@ -9,6 +9,7 @@ from sqlalchemy.sql.schema import ForeignKey
 
 from .base_model import BaseModel
 from .db import db
+from .engagement_version import touch_engagements
 
 
 class PollAnswer(BaseModel):
@@ -53,4 +54,5 @@ class PollAnswer(BaseModel):
             for answer in answers
         ]
         db.session.bulk_insert_mappings(PollAnswer, answer_data)
+        touch_engagements(db.session, PollAnswer, answer_data)
         db.session.commit()
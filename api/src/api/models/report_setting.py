@@ -5,6 +5,8 @@ questions will either be displayed/hidden on the dashboard
 """
 from __future__ import annotations
 
+from typing import Dict, Tuple
+
 from sqlalchemy import ForeignKey
 from api.schemas.report_setting import ReportSettingSchema
 
@@ -34,6 +36,16 @@ class ReportSetting(BaseModel):  # pylint: disable=too-few-public-methods
             .all()
         return report_settings
 
+    @classmethod
+    def get_display_by_question(cls, survey_ids) -> Dict[Tuple[int, str], bool]:
+        """Return the display flag of every question of the surveys, keyed by (survey id, question key)."""
+        if not survey_ids:
+            return {}
+        rows = db.session.query(ReportSetting.survey_id, ReportSetting.question_key, ReportSetting.display) \
+            .filter(ReportSetting.survey_id.in_(list(survey_ids))) \
+            .all()
+        return {(survey_id, question_key): display for survey_id, question_key, display in rows}
+
     @classmethod
     def find_by_question_key(cls, survey_id, question_key):
         """Return report setting by survey id."""
@@ -7,7 +7,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import List
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index, text
 from sqlalchemy.dialects import postgresql
 
 from api.constants.comment_status import Status
@@ -38,9 +38,24 @@ class Submission(BaseModel):  # pylint: disable=too-few-public-methods
     rejected_reason_other = db.Column(db.String(500), nullable=True)
     has_threat = db.Column(db.Boolean, nullable=True)
     notify_email = db.Column(db.Boolean(), default=True)
+    # set once a rejected submission has been redacted after its engagement closed
+    redacted_date = db.Column(db.DateTime, nullable=True)
     comments = db.relationship('Comment', backref='submission', cascade='all, delete')
     staff_note = db.relationship('StaffNote', backref='submission', cascade='all, delete')
 
+    __table_args__ = (
+        # support keyset pagination of the comment review queue on each of its cursor sort keys
+        Index('ix_submission_survey_id_id', 'survey_id', 'id'),
+        Index('ix_submission_survey_created_date_id', 'survey_id', 'created_date', 'id'),
+        Index('ix_submission_survey_review_date_id', 'survey_id', 'review_date', 'id'),
+        # support substring search of reviewers
+        Index('ix_submission_reviewed_by_trgm', 'reviewed_by', postgresql_using='gin',
+              postgresql_ops={'reviewed_by': 'gin_trgm_ops'}),
+        # support finding the submissions still to be redacted
+        Index('ix_submission_unredacted_engagement_id', 'engagement_id',
+              postgresql_where=text('redacted_date IS NULL')),
+    )
+
     @classmethod
     def get_by_survey_id(cls, survey_id) -> List[SubmissionSchema]:
         """Get submissions by survey id."""
@@ -8,6 +8,7 @@ from sqlalchemy.sql.schema import ForeignKey
 
 from .base_model import BaseModel
 from .db import db
+from .engagement_version import touch_engagements
 
 
 class SubscribeItem(BaseModel):  # pylint: disable=too-few-public-methods, too-many-instance-attributes
@@ -27,3 +28,4 @@ class SubscribeItem(BaseModel):  # pylint: disable=too-few-public-methods, too-m
     def save_subscribe_items(cls, subscribe_items: list) -> None:
         """Update widgets.."""
         db.session.bulk_save_objects(subscribe_items)
+        touch_engagements(db.session, cls, subscribe_items)
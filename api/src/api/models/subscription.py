@@ -4,12 +4,17 @@ Manages the Subscription
 """
 from __future__ import annotations
 from datetime import datetime
-from sqlalchemy import ForeignKey
+from typing import Iterator, Tuple
+
+from sqlalchemy import ForeignKey, and_, func, or_
+from sqlalchemy.orm import aliased
 
 from api.constants.subscription_type import SubscriptionType
 
 from .base_model import BaseModel
 from .db import db
+from .engagement import Engagement
+from .participant import Participant
 
 
 class Subscription(BaseModel):  # pylint: disable=too-few-public-methods
@@ -57,6 +62,33 @@ class Subscription(BaseModel):  # pylint: disable=too-few-public-methods
             .first()
         return db_subscription
 
+    @classmethod
+    def get_subscribed_participants(cls, engagement_id, tenant_id, batch_size=500) -> Iterator[Tuple[int, str]]:
+        """Stream (participant id, encoded email address) for everyone subscribed to an engagement.
+
+        A participant is subscribed if they hold an active tenant-level subscription
+        made within the engagement's tenant, or an active project- or engagement-level
+        subscription to the engagement itself. Each encoded email address is returned
+        once. Rows are streamed from a server-side cursor in batches of batch_size.
+        """
+        subscribed_engagement = aliased(Engagement)
+        return db.session.query(func.min(Participant.id), Participant.email_address) \
+            .join(cls, cls.participant_id == Participant.id) \
+            .outerjoin(subscribed_engagement, subscribed_engagement.id == cls.engagement_id) \
+            .filter(
+                cls.is_subscribed.is_(True),
+                Participant.email_address.isnot(None),
+                or_(
+                    and_(cls.type == SubscriptionType.TENANT, subscribed_engagement.tenant_id == tenant_id),
+                    and_(
+                        cls.type.in_([SubscriptionType.PROJECT, SubscriptionType.ENGAGEMENT]),
+                        cls.engagement_id == engagement_id,
+                    ),
+                )) \
+            .group_by(Participant.email_address) \
+            .execution_options(stream_results=True) \
+            .yield_per(batch_size)
+
     @classmethod
     def create(cls, subscription: dict, session=None) -> Subscription:
         """Create a subscription."""
@@ -8,7 +8,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import ForeignKey, and_, asc, desc, func, or_
+from sqlalchemy import ForeignKey, Index, and_, asc, desc, func, or_
 from sqlalchemy.dialects import postgresql
 from sqlalchemy.sql import text
 
@@ -18,6 +18,7 @@ from api.models.engagement_status import EngagementStatus
 from api.models.pagination_options import PaginationOptions
 from api.models.survey_search_options import SurveySearchOptions
 from api.schemas.survey import SurveySchema
+from api.utils.keyset_pagination import paginate_by_cursor
 
 from .base_model import BaseModel
 from .db import db
@@ -45,6 +46,12 @@ class Survey(BaseModel):  # pylint: disable=too-few-public-methods
         foreign_keys=[engagement_id]
     )
 
+    # support keyset pagination of the survey listing on each of its cursor sort keys
+    __table_args__ = (
+        Index('ix_survey_tenant_name_id', 'tenant_id', 'name', 'id'),
+        Index('ix_survey_tenant_created_date_id', 'tenant_id', 'created_date', 'id'),
+    )
+
     @classmethod
     def get_survey(cls, survey_id) -> Survey:
         """Get a single survey by ID, status agnostic."""
@@ -86,6 +93,11 @@ class Survey(BaseModel):  # pylint: disable=too-few-public-methods
 
         query = cls.filter_by_search_options(survey_search_options, query)
 
+        if pagination_options.use_cursor:
+            columns = {'name': Survey.name, 'created_date': Survey.created_date}
+            return paginate_by_cursor(query, pagination_options, {
+                **columns, **{f'survey.{key}': column for key, column in columns.items()}}, Survey.id)
+
         sort = asc(text(pagination_options.sort_key)) if pagination_options.sort_order == 'asc'\
             else desc(text(pagination_options.sort_key))
 
@@ -6,6 +6,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Optional
 
+from sqlalchemy.orm import selectinload
 from sqlalchemy.sql.schema import ForeignKey
 
 
@@ -48,7 +49,7 @@ class Widget(BaseModel):  # pylint: disable=too-few-public-methods
     def get_widgets_by_engagement_id(cls, engagement_id):
         """Get widgets by engagement_id."""
         return db.session.query(Widget)\
-            .join(WidgetItem, Widget.id == WidgetItem.widget_id, isouter=True)\
+            .options(selectinload(Widget.items))\
             .filter(Widget.engagement_id == engagement_id)\
             .order_by(Widget.location.asc())\
             .all()
@@ -21,6 +21,9 @@ class WidgetMap(BaseModel):  # pylint: disable=too-few-public-methods, too-many-
     latitude = db.Column(db.Float, nullable=False)
     longitude = db.Column(db.Float, nullable=False)
     geojson = db.Column(db.Text())
+    # the geojson simplified to lower levels of detail, for a smaller download
+    geojson_medium = db.Column(db.Text())
+    geojson_low = db.Column(db.Text())
     file_name = db.Column(db.Text())
 
     @classmethod
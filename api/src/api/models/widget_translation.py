@@ -43,6 +43,16 @@ class WidgetTranslation(BaseModel):  # pylint: disable=too-few-public-methods
         widget_translation_records = query.all()
         return widget_translation_records
 
+    @classmethod
+    def get_translations_by_widget_ids(cls, widget_ids, language_id):
+        """Get the translations of the given widgets into a language."""
+        if not widget_ids:
+            return []
+        return WidgetTranslation.query \
+            .filter(WidgetTranslation.widget_id.in_(list(widget_ids))) \
+            .filter_by(language_id=language_id) \
+            .all()
+
     @classmethod
     def create_widget_translation(cls, translation) -> WidgetTranslation:
         """Create widget translation."""
@@ -29,6 +29,7 @@ from .oidc_config import API as OIDC_CONFIG_API
 from .comment import API as COMMENT_API
 from .contact import API as CONTACT_API
 from .document import API as DOCUMENT_API
+from .document_job import API as DOCUMENT_JOB_API
 from .email_verification import API as EMAIL_VERIFICATION_API
 from .engagement_details_tab import API as ENGAGEMENT_DETAILS_TAB_API
 from .engagement import API as ENGAGEMENT_API
@@ -67,6 +68,7 @@ from .timeline_event_translation import API as TIMELINE_EVENT_TRANSLATION_API
 from .engagement_translation import API as ENGAGEMENT_TRANSLATION_API
 from .engagement_details_tab_translation import API as ENGAGEMENT_DETAILS_TAB_TRANSLATION_API
 from .version import API as VERSION_API
+from .ops import API as OPS_API
 
 __all__ = ('API_BLUEPRINT',)
 
@@ -83,6 +85,7 @@ API.add_namespace(OIDC_CONFIG_API, path='/oidc_config')
 API.add_namespace(ENGAGEMENT_API)
 API.add_namespace(USER_API)
 API.add_namespace(DOCUMENT_API)
+API.add_namespace(DOCUMENT_JOB_API, path='/document_jobs')
 API.add_namespace(SURVEY_API)
 API.add_namespace(SUBMISSION_API)
 API.add_namespace(SUBSCRIPTION_API)
@@ -121,3 +124,4 @@ API.add_namespace(TIMELINE_EVENT_TRANSLATION_API, path='/timelines/<int:timeline
 API.add_namespace(ENGAGEMENT_TRANSLATION_API, path='/engagement/<int:engagement_id>/translations')
 API.add_namespace(ENGAGEMENT_DETAILS_TAB_TRANSLATION_API, path='/engagement/<int:engagement_id>/details/translations')
 API.add_namespace(VERSION_API, path='/version')
+API.add_namespace(OPS_API, path='/ops')
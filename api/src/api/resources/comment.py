@@ -15,14 +15,19 @@
 
 from http import HTTPStatus
 
-from flask import Response, request
+from flask import Response, request, stream_with_context
 from flask_cors import cross_origin
 from flask_restx import Namespace, Resource
 
 from api.auth import auth
+from api.constants.document_job_status import DocumentJobStatus
+from api.exceptions.business_exception import BusinessException
 from api.models.pagination_options import PaginationOptions
 from api.services.comment_service import CommentService
+from api.services.document_job_service import DocumentJobService
+from api.utils.enums import GeneratedDocumentTypes
 from api.utils.roles import Role
+from api.utils.spreadsheet import SpreadsheetExport, SpreadsheetFormat
 from api.utils.tenant_validator import require_role
 from api.utils.util import allowedorigins, cors_preflight
 
@@ -48,8 +53,9 @@ class SurveyComments(Resource):
             pagination_options = PaginationOptions(
                 page=args.get('page', None, int),
                 size=args.get('size', None, int),
-                sort_key=args.get('sort_key', 'name', str),
+                sort_key=args.get('sort_key', None, str),
                 sort_order=args.get('sort_order', 'asc', str),
+                cursor=args.get('cursor', None, str),
             )
             comment_records = CommentService()\
                 .get_comments_paginated(
@@ -60,6 +66,8 @@ class SurveyComments(Resource):
             return comment_records, HTTPStatus.OK
         except ValueError as err:
             return str(err), HTTPStatus.INTERNAL_SERVER_ERROR
+        except BusinessException as err:
+            return {'message': err.error}, err.status_code
 
 
 @cors_preflight('GET, OPTIONS')
@@ -74,19 +82,14 @@ class GeneratedStaffCommentsSheet(Resource):
         """Export comments."""
         try:
 
-            response = CommentService().export_comments_to_spread_sheet_staff(survey_id)
-            response_headers = dict(response.headers)
-            headers = {
-                'content-type': response_headers.get('content-type'),
-                'content-disposition': response_headers.get('content-disposition'),
-            }
-            return Response(
-                response=response.content,
-                status=response.status_code,
-                headers=headers
-            )
+            args = request.args
+            export = CommentService().export_comments_to_spread_sheet_staff(
+                survey_id, args.get('format', SpreadsheetFormat.CSV, str))
+            return Response(stream_with_context(export.chunks), mimetype=export.mimetype, headers=export.headers)
         except ValueError as err:
             return str(err), HTTPStatus.INTERNAL_SERVER_ERROR
+        except BusinessException as err:
+            return {'message': err.error}, err.status_code
 
 
 @cors_preflight('GET, OPTIONS')
@@ -101,7 +104,12 @@ class GeneratedProponentCommentsSheet(Resource):
         """Export comments."""
         try:
 
-            response = CommentService().export_comments_to_spread_sheet_proponent(survey_id)
+            args = request.args
+            response = CommentService().export_comments_to_spread_sheet_proponent(
+                survey_id, args.get('format', None, str))
+            if isinstance(response, SpreadsheetExport):
+                return Response(stream_with_context(response.chunks), mimetype=response.mimetype,
+                                headers=response.headers)
             response_headers = dict(response.headers)
             headers = {
                 'content-type': response_headers.get('content-type'),
@@ -114,3 +122,26 @@ class GeneratedProponentCommentsSheet(Resource):
             )
         except ValueError as err:
             return str(err), HTTPStatus.INTERNAL_SERVER_ERROR
+        except BusinessException as err:
+            return {'message': err.error}, err.status_code
+
+
+@cors_preflight('POST, OPTIONS')
+@API.route('/survey/<survey_id>/sheet/proponent/jobs')
+class ProponentCommentsSheetJob(Resource):
+    """Resource for generating the proponent comments sheet in the background."""
+
+    @staticmethod
+    @cross_origin(origins=allowedorigins())
+    @require_role([Role.EXPORT_PROPONENT_COMMENT_SHEET.value])
+    def post(survey_id):
+        """Request the proponent comments sheet, returning the job that generates it."""
+        try:
+            job = DocumentJobService.request_document(GeneratedDocumentTypes.COMMENT_SHEET_PROPONENT.value,
+                                                      int(survey_id))
+            status = HTTPStatus.OK if job['status'] == DocumentJobStatus.COMPLETED.name else HTTPStatus.ACCEPTED
+            return job, status
+        except ValueError as err:
+            return str(err), HTTPStatus.INTERNAL_SERVER_ERROR
+        except BusinessException as err:
+            return {'message': err.error}, err.status_code
@@ -0,0 +1,68 @@
+# Copyright © 2021 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""API endpoints for following document jobs and downloading their documents."""
+
+from http import HTTPStatus
+
+from flask import Response, request, stream_with_context
+from flask_cors import cross_origin
+from flask_restx import Namespace, Resource
+
+from api.auth import auth
+from api.constants.document_job_status import DocumentJobStatus
+from api.exceptions.business_exception import BusinessException
+from api.services.document_job_service import DocumentJobService
+from api.utils.spreadsheet import CHUNK_SIZE
+from api.utils.util import allowedorigins, cors_preflight
+
+
+API = Namespace('document_jobs', description='Endpoints for Document Jobs')
+"""Document jobs"""
+
+
+@cors_preflight('GET, OPTIONS')
+@API.route('/<int:job_id>')
+class DocumentJob(Resource):
+    """Resource for following a document job."""
+
+    @staticmethod
+    @cross_origin(origins=allowedorigins())
+    @auth.require
+    def get(job_id):
+        """Return the status of the job, with the download url of its document once it is generated."""
+        try:
+            job = DocumentJobService.get_job(job_id)
+            if job['status'] == DocumentJobStatus.COMPLETED.name:
+                job['download_url'] = f'{request.base_url}/download'
+            return job, HTTPStatus.OK
+        except BusinessException as err:
+            return {'message': err.error}, err.status_code
+
+
+@cors_preflight('GET, OPTIONS')
+@API.route('/<int:job_id>/download')
+class DocumentJobDownload(Resource):
+    """Resource for downloading the document generated by a job."""
+
+    @staticmethod
+    @cross_origin(origins=allowedorigins())
+    @auth.require
+    def get(job_id):
+        """Stream the generated document from object storage."""
+        try:
+            document, file_name, content_type = DocumentJobService.get_document(job_id)
+            return Response(stream_with_context(document.iter_content(CHUNK_SIZE)), content_type=content_type,
+                            headers={'content-disposition': f'attachment; filename="{file_name}"'})
+        except BusinessException as err:
+            return {'message': err.error}, err.status_code
@@ -23,9 +23,11 @@ from marshmallow import ValidationError
 
 from api.auth import auth
 from api.auth import jwt as _jwt
+from api.exceptions.business_exception import BusinessException
 from api.models.pagination_options import PaginationOptions
 from api.schemas.engagement import EngagementSchema
 from api.services.engagement_service import EngagementService
+from api.services.engagement_view_service import EngagementViewService
 from api.utils.roles import Role
 from api.utils.tenant_validator import require_role
 from api.utils.token_info import TokenInfo
@@ -60,6 +62,30 @@ class Engagement(Resource):
             return str(err), HTTPStatus.INTERNAL_SERVER_ERROR
 
 
+@cors_preflight('GET,OPTIONS')
+@API.route('/<int:engagement_id>/view')
+@API.route('/slug/<string:slug>/view')
+class EngagementView(Resource):
+    """Resource for the public view of an engagement, with its widgets, metadata and details tabs."""
+
+    @staticmethod
+    @cross_origin(origins=allowedorigins())
+    @auth.optional
+    def get(engagement_id=None, slug=None):
+        """Fetch the public view of an engagement by id or slug, translated if a language_id is given."""
+        try:
+            language_id = request.args.get('language_id', None, type=int)
+            engagement_view = EngagementViewService.get_engagement_view(
+                engagement_id=engagement_id, slug=slug, language_id=language_id)
+
+            if engagement_view:
+                return engagement_view, HTTPStatus.OK
+
+            return 'Engagement was not found', HTTPStatus.NOT_FOUND
+        except ValueError as err:
+            return str(err), HTTPStatus.NOT_FOUND
+
+
 @cors_preflight('DELETE, OPTIONS')
 @API.route('/<engagement_id>/delete')
 class EngagementDelete(Resource):
@@ -98,6 +124,7 @@ class Engagements(Resource):
                 size=args.get('size', 10, int),
                 sort_key=args.get('sort_key', 'name', str),
                 sort_order=args.get('sort_order', 'asc', str),
+                cursor=args.get('cursor', None, str),
             )
 
             exclude_internal = None
@@ -147,6 +174,8 @@ class Engagements(Resource):
             return engagement_records, HTTPStatus.OK
         except ValueError as err:
             return str(err), HTTPStatus.INTERNAL_SERVER_ERROR
+        except BusinessException as err:
+            return {'message': err.error}, err.status_code
 
     @staticmethod
     @cross_origin(origins=allowedorigins())
@@ -19,6 +19,7 @@ from flask import jsonify, make_response, request
 from flask_cors import cross_origin
 from flask_restx import Namespace, Resource
 
+from api.constants.map_detail import MapDetail
 from api.exceptions.business_exception import BusinessException
 from api.services.shapefile_service import ShapefileService
 from api.utils.roles import Role
@@ -45,7 +46,7 @@ class ShapeFile(Resource):
             if not file:
                 return jsonify({'error': 'No file uploaded.'}), HTTPStatus.BAD_REQUEST
             geojson = ShapefileService().convert_to_geojson(file)
-            response = make_response(geojson)
+            response = make_response(geojson[MapDetail.FULL.value])
             response.headers['Content-Type'] = 'application/json'
             return response, HTTPStatus.OK
         except BusinessException as err:
@@ -20,6 +20,7 @@ from flask_cors import cross_origin
 from flask_restx import Namespace, Resource
 from api.auth import jwt as _jwt
 
+from api.exceptions.business_exception import BusinessException
 from api.models.pagination_options import PaginationOptions
 from api.schemas import utils as schema_utils
 from api.schemas.submission import SubmissionSchema
@@ -134,6 +135,7 @@ class SurveySubmissions(Resource):
                 size=args.get('size', None, int),
                 sort_key=args.get('sort_key', 'submission.id', str),
                 sort_order=args.get('sort_order', 'asc', str),
+                cursor=args.get('cursor', None, str),
             )
             advanced_search_filters = {
                 'status': args.get('status', None, int),
@@ -153,3 +155,5 @@ class SurveySubmissions(Resource):
             return submission_page, HTTPStatus.OK
         except ValueError as err:
             return str(err), HTTPStatus.INTERNAL_SERVER_ERROR
+        except BusinessException as err:
+            return {'message': err.error}, err.status_code
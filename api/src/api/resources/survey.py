@@ -81,6 +81,7 @@ class Surveys(Resource):
                 size=args.get('size', None, int),
                 sort_key=args.get('sort_key', 'survey.name', str),
                 sort_order=args.get('sort_order', 'asc', str),
+                cursor=args.get('cursor', None, str),
             )
 
             search_options = SurveySearchOptions(
@@ -106,6 +107,8 @@ class Surveys(Resource):
             return survey_records, HTTPStatus.OK
         except ValueError as err:
             return str(err), HTTPStatus.INTERNAL_SERVER_ERROR
+        except BusinessException as err:
+            return {'message': err.error}, err.status_code
 
     @staticmethod
     @require_role([Role.CREATE_SURVEY.value])
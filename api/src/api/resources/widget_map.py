@@ -20,6 +20,7 @@ from flask_cors import cross_origin
 from flask_restx import Namespace, Resource
 
 from api.auth import jwt as _jwt
+from api.constants.map_detail import MapDetail
 from api.exceptions.business_exception import BusinessException
 from api.schemas.widget_map import WidgetMapSchema
 from api.services.widget_map_service import WidgetMapService
@@ -42,8 +43,12 @@ class Map(Resource):
     def get(widget_id):
         """Get map widget."""
         try:
+            detail = request.args.get('detail', MapDetail.LOW.value)
             widget_map = WidgetMapService().get_map(widget_id)
-            return jsonify(WidgetMapSchema().dump(widget_map, many=True)), HTTPStatus.OK
+            schema = WidgetMapSchema(context={'detail': MapDetail(detail).value})
+            return jsonify(schema.dump(widget_map, many=True)), HTTPStatus.OK
+        except ValueError as err:
+            return str(err), HTTPStatus.BAD_REQUEST
         except BusinessException as err:
             return str(err), err.status_code
 
@@ -58,7 +63,7 @@ class Map(Resource):
             widget_map = WidgetMapService().create_map(widget_id, request_json, file)
             if widget_map.geojson:
                 widget_map.geojson = json.loads(widget_map.geojson)
-            return WidgetMapSchema().dump(widget_map), HTTPStatus.OK
+            return WidgetMapSchema(context={'detail': MapDetail.FULL.value}).dump(widget_map), HTTPStatus.OK
         except BusinessException as err:
             return str(err), err.status_code
 
@@ -70,6 +75,6 @@ class Map(Resource):
         request_json = request.get_json()
         try:
             widget_map = WidgetMapService().update_map(widget_id, request_json)
-            return WidgetMapSchema().dump(widget_map), HTTPStatus.OK
+            return WidgetMapSchema(context={'detail': MapDetail.FULL.value}).dump(widget_map), HTTPStatus.OK
         except BusinessException as err:
             return str(err), err.status_code
@@ -3,7 +3,7 @@
 Manages the comment
 """
 
-from marshmallow import EXCLUDE, Schema, fields
+from marshmallow import EXCLUDE, Schema, fields, pre_dump
 
 
 class CommentSchema(Schema):
@@ -26,6 +26,23 @@ class CommentSchema(Schema):
     status_id = fields.Method('get_comment_status_id')
     reviewed_by = fields.Method('get_comment_reviewed_by')
     label = fields.Method('get_comment_label')
+    headline = fields.Str(data_key='headline', dump_only=True)
+
+    @pre_dump(pass_many=True)
+    def load_related(self, data, many, **kwargs):  # pylint: disable=unused-argument
+        """Load what the dumped fields need for all the comments at once."""
+        if many:
+            from api.models.comment import Comment  # pylint: disable=import-outside-toplevel,cyclic-import
+
+            data = list(data)
+            comments = [comment for comment in data if isinstance(comment, Comment)]
+            Comment.load_for_dump(
+                comments,
+                display='is_displayed' in self.fields,
+                submissions='status_id' in self.fields or 'reviewed_by' in self.fields,
+                surveys='label' in self.fields,
+            )
+        return data
 
     def get_comment_status_id(self, obj):
         """Get the associated status of the comment."""
@@ -0,0 +1,28 @@
+"""Document job schema class.
+
+Manages the document job
+"""
+
+from marshmallow import EXCLUDE, Schema, fields
+
+
+class DocumentJobSchema(Schema):
+    """Schema for document job."""
+
+    class Meta:  # pylint: disable=too-few-public-methods
+        """Exclude unknown fields in the deserialized output."""
+
+        unknown = EXCLUDE
+
+    id = fields.Int(data_key='id')
+    document_type_id = fields.Int(data_key='document_type_id')
+    survey_id = fields.Int(data_key='survey_id')
+    status = fields.Method('get_status')
+    file_name = fields.Str(data_key='file_name')
+    attempts = fields.Int(data_key='attempts')
+    created_date = fields.Str(data_key='created_date')
+    completed_date = fields.Str(data_key='completed_date')
+
+    def get_status(self, obj):
+        """Get the name of the job status."""
+        return obj.status.name if obj.status else None
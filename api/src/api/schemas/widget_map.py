@@ -13,9 +13,18 @@
 # limitations under the License.
 """Manager for widget map schema."""
 
+from api.constants.map_detail import MapDetail
 from api.models.widget_map import WidgetMap as WidgetMapModel
 
-from marshmallow import Schema
+from marshmallow import Schema, fields
+
+
+# the geojson column of each level of detail
+GEOJSON_COLUMNS = {
+    MapDetail.FULL.value: 'geojson',
+    MapDetail.MEDIUM.value: 'geojson_medium',
+    MapDetail.LOW.value: 'geojson_low',
+}
 
 
 class WidgetMapSchema(Schema):  # pylint: disable=too-many-ancestors, too-few-public-methods
@@ -26,3 +35,13 @@ class WidgetMapSchema(Schema):  # pylint: disable=too-many-ancestors, too-few-pu
 
         model = WidgetMapModel
         fields = ('id', 'widget_id', 'engagement_id', 'marker_label', 'latitude', 'longitude', 'geojson', 'file_name')
+
+    geojson = fields.Method('get_geojson')
+
+    def get_geojson(self, obj):
+        """Return the geojson at the level of detail of the context, low by default.
+
+        Maps stored before geojson was simplified only have it at full detail.
+        """
+        detail = self.context.get('detail', MapDetail.LOW.value)
+        return getattr(obj, GEOJSON_COLUMNS[detail]) or obj.geojson
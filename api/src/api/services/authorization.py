@@ -9,9 +9,7 @@ from flask_restx import abort
 
 from api.constants.membership_type import MembershipType
 from api.models.engagement import Engagement as EngagementModel
-from api.models.membership import Membership as MembershipModel
-from api.models.staff_user import StaffUser as StaffUserModel
-from api.utils.enums import MembershipStatus
+from api.services.principal_service import Principal, PrincipalService
 from api.utils.roles import Role
 from api.utils.user_context import UserContext, user_context
 
@@ -25,8 +23,8 @@ def check_auth(**kwargs):
     """Check if user is authorized to perform action on the service."""
     skip_tenant_check = current_app.config.get('IS_SINGLE_TENANT_ENVIRONMENT')
     user_from_context: UserContext = kwargs['user_context']
-    user_from_db = StaffUserModel.get_user_by_external_id(user_from_context.sub)
-    if not user_from_db:
+    principal = PrincipalService.get_principal(user_from_context.sub)
+    if not principal.is_staff_user:
         abort(HTTPStatus.FORBIDDEN, 'User not found')
 
     # Retrieve tenant specific user roles from OIDC token info
@@ -49,8 +47,7 @@ def check_auth(**kwargs):
     membership_eligible_roles = {MembershipType.TEAM_MEMBER.name, MembershipType.REVIEWER.name
                                  } & required_roles
     # check if the user is a member of a passed engagement
-    if membership_eligible_roles and _has_team_membership(kwargs, user_from_context,
-                                                          membership_eligible_roles):
+    if membership_eligible_roles and _has_team_membership(kwargs, principal, membership_eligible_roles):
         return
 
     abort(HTTPStatus.FORBIDDEN, UNAUTHORIZED_MSG)
@@ -69,20 +66,14 @@ def _check_engagement_has_tenant(eng_id, tenant_id):
         abort(HTTPStatus.FORBIDDEN, UNAUTHORIZED_MSG)
 
 
-def _has_team_membership(kwargs, user_from_context, team_permitted_roles) -> bool:
+def _has_team_membership(kwargs, principal: Principal, team_permitted_roles) -> bool:
     eng_id = kwargs.get('engagement_id')
 
     if not eng_id:
 
         return False
 
-    user = StaffUserModel.get_user_by_external_id(user_from_context.sub)
-
-    if not user:
-
-        return False
-
-    membership = MembershipModel.find_by_engagement_and_user_id(eng_id, user.id, status=MembershipStatus.ACTIVE.value)
+    membership = principal.get_membership(eng_id)
 
     if not membership:
 
@@ -91,10 +82,10 @@ def _has_team_membership(kwargs, user_from_context, team_permitted_roles) -> boo
     skip_tenant_check = current_app.config.get('IS_SINGLE_TENANT_ENVIRONMENT')
     if not skip_tenant_check:
         # check tenant matching
-        if membership.tenant_id and str(membership.tenant_id) != str(g.tenant_id):
+        if membership['tenant_id'] and str(membership['tenant_id']) != str(g.tenant_id):
             current_app.logger.debug(f'Aborting . Tenant Id on membership and user context Mismatch'
-                                     f'membership.tenant_id:{membership.tenant_id} '
+                                     f'membership.tenant_id:{membership["tenant_id"]} '
                                      f'user_from_context.tenant_id: {g.tenant_id}')
             abort(HTTPStatus.FORBIDDEN, UNAUTHORIZED_MSG)
 
-    return membership.type.name in team_permitted_roles
+    return membership['type'] in team_permitted_roles
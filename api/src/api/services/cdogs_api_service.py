@@ -14,7 +14,6 @@
 
 
 """Service for receipt generation."""
-import base64
 import json
 import re
 from http import HTTPStatus
@@ -23,6 +22,8 @@ import requests
 from flask import current_app
 
 from api.config import Config
+from api.utils.cache import cache
+from api.utils.token_manager import client_credentials_fetcher, token_manager
 
 
 class CdogsApiService:
@@ -34,7 +35,10 @@ class CdogsApiService:
         config = Config().CDOGS_CONFIG
         self.base_url = config['BASE_URL']
 
-        self.access_token = self._get_access_token()
+    @property
+    def access_token(self):
+        """Return the access token, which is only fetched once a request to CDOGS is made."""
+        return self._get_access_token()
 
     def generate_document(self, template_hash_code: str, data, options):
         """Generate document based on template and data."""
@@ -95,7 +99,16 @@ class CdogsApiService:
         return response
 
     def check_template_cached(self, template_hash_code: str):
-        """Check if template of given hashcode is cached."""
+        """Check if template of given hashcode is cached.
+
+        A positive answer is remembered for CDOGS_TEMPLATE_CACHE_TIMEOUT seconds, which should
+        stay below the time CDOGS keeps unused templates.
+        """
+        timeout = current_app.config.get('CDOGS_TEMPLATE_CACHE_TIMEOUT', 0)
+        template_cache = cache.namespace('cdogs_template')
+        if timeout > 0 and template_cache.get(template_hash_code):
+            return True
+
         headers = {
             'Authorization': f'Bearer {self.access_token}'
         }
@@ -103,7 +116,10 @@ class CdogsApiService:
         url = f'{self.base_url}/api/v2/template/{template_hash_code}'
 
         response = requests.get(url, headers=headers, timeout=None)
-        return response.status_code == HTTPStatus.OK
+        template_cached = response.status_code == HTTPStatus.OK
+        if template_cached and timeout > 0:
+            template_cache.set(template_hash_code, True, timeout=timeout)
+        return template_cached
 
     @staticmethod
     def _get_access_token():
@@ -111,18 +127,8 @@ class CdogsApiService:
         service_client = Config().CDOGS_CONFIG['SERVICE_CLIENT']
         service_client_secret = Config().CDOGS_CONFIG['SERVICE_CLIENT_SECRET']
 
-        basic_auth_encoded = base64.b64encode(
-            bytes(f'{service_client}:{service_client_secret}', 'utf-8')).decode('utf-8')
-        data = 'grant_type=client_credentials'
-        response = requests.post(
-            token_url,
-            data=data,
-            headers={
-                'Authorization': f'Basic {basic_auth_encoded}',
-                'Content-Type': 'application/x-www-form-urlencoded'
-            },
-            timeout=None
+        # Tokens are cached per (client, token url) and refreshed shortly before they expire
+        return token_manager.get_token(
+            (service_client, token_url),
+            client_credentials_fetcher(token_url, service_client, service_client_secret),
         )
-
-        response_json = response.json()
-        return response_json['access_token']
@@ -1,5 +1,6 @@
 """Service for comment management."""
 import itertools
+from collections import defaultdict
 
 from api.constants.comment_status import Status
 from api.constants.membership_type import MembershipType
@@ -18,6 +19,15 @@ from api.services.document_generation_service import DocumentGenerationService
 from api.utils.roles import Role
 from api.utils.token_info import TokenInfo
 from api.utils.enums import GeneratedDocumentTypes, MembershipStatus
+from api.utils.spreadsheet import SpreadsheetFormat, spreadsheet_export
+
+
+PROPONENT_SHEET_OPTIONS = {
+    'document_type': GeneratedDocumentTypes.COMMENT_SHEET_PROPONENT.value,
+    'template_name': 'proponent_comments_sheet.xlsx',
+    'convert_to': 'xlsx',
+    'report_name': 'proponent_comments_sheet'
+}
 
 
 class CommentService:
@@ -81,12 +91,14 @@ class CommentService:
         """Get comments paginated."""
         include_unpublished = CommentService.can_view_unapproved_comments(survey_id)
 
-        comment_schema = CommentSchema(many=True, only=('text', 'submission_date', 'label', 'submission_id'))
+        comment_schema = CommentSchema(
+            many=True, only=('text', 'submission_date', 'label', 'submission_id', 'headline'))
         items, total = Comment.get_accepted_comments_by_survey_id_paginated(
             survey_id, pagination_options, search_text, include_unpublished)
         return {
             'items': comment_schema.dump(items),
-            'total': total
+            'total': total,
+            **pagination_options.cursor_fields(),
         }
 
     @classmethod
@@ -148,27 +160,45 @@ class CommentService:
         return comments
 
     @classmethod
-    def export_comments_to_spread_sheet_staff(cls, survey_id):
-        """Export comments to spread sheet."""
+    def export_comments_to_spread_sheet_staff(cls, survey_id, file_format=SpreadsheetFormat.CSV):
+        """Export comments to a spread sheet that is streamed from the database as it is written."""
         survey = SurveyModel.find_by_id(survey_id)
-        comments = Comment.get_comments_by_survey_id(survey_id)
+        if not survey:
+            raise ValueError('Survey not found')
         # TODO: Uncomment depending on future metadata work
         # metadata_model = EngagementMetadataModel.find_by_id(survey.engagement_id)
 
-        titles = cls.get_titles(survey)
-        data_rows = cls.get_data_rows(titles, comments, None)
+        labels = [title['label'] for title in cls.get_titles(survey)]
+        header = ['Comment No.', 'Submitted', *labels, 'Status', 'Published Date', 'Reason for Rejection', 'Reviewer']
+        return spreadsheet_export('comments_sheet', file_format, header,
+                                  cls._staff_sheet_rows(survey, labels))
 
-        formatted_comments = {
-            'titles': titles,
-            'comments': data_rows
-        }
-        document_options = {
-            'document_type': GeneratedDocumentTypes.COMMENT_SHEET_STAFF.value,
-            'template_name': 'staff_comments_sheet.xlsx',
-            'convert_to': 'csv',
-            'report_name': 'comments_sheet'
-        }
-        return DocumentGenerationService().generate_document(data=formatted_comments, options=document_options)
+    @classmethod
+    def _staff_sheet_rows(cls, survey: SurveyModel, labels):
+        """Yield a sheet row per submission, with the text of its comments in the columns of their questions."""
+        component_labels = cls.get_component_labels(survey.form_json)
+        rows = Comment.stream_comments_by_survey_id(survey.id)
+        for _, submission_rows in itertools.groupby(rows, key=lambda row: row.submission_id):
+            submission_rows = list(submission_rows)
+            submission = submission_rows[0]._asdict()
+            texts = {component_labels.get(row.component_id): row.text for row in submission_rows}
+            yield [
+                submission['submission_id'],
+                str(submission['created_date']),
+                *(texts.get(label, '') for label in labels),
+                Status(submission['comment_status_id']).name,
+                str(submission['review_date']),
+                cls.get_rejection_note(submission),
+                submission['reviewed_by'],
+            ]
+
+    @classmethod
+    def get_component_labels(cls, survey_form: dict):
+        """Return the label of each component of the survey form, keyed by component key."""
+        component_labels = {}
+        for component in cls.extract_components(survey_form):
+            component_labels.setdefault(component.get('key', None), component.get('label', None))
+        return component_labels
 
     @classmethod
     def get_titles(cls, survey: SurveySchema):
@@ -186,46 +216,6 @@ class CommentService:
 
         return [{'label': label} for label in labels if label is not None]
 
-    @classmethod
-    def get_data_rows(cls, titles, comments, project_name):
-        """Get the content to be exported on to the sheet."""
-        data_rows = []
-
-        for comment in comments:
-            comment_text = cls.get_comment_text(titles, comment)
-
-            rejection_note = cls.get_rejection_note(comment)
-
-            data_rows.append({
-                'commentNumber': comment.get('id'),
-                'dateSubmitted': str(comment.get('created_date')),
-                'commentText': comment_text,
-                'status': Status(comment.get('comment_status_id')).name,
-                'datePublished': str(comment.get('review_date')),
-                'rejectionNote': rejection_note,
-                'reviewer': comment.get('reviewed_by'),
-                'projectName': project_name
-            })
-
-        return data_rows
-
-    @classmethod
-    def get_comment_text(cls, titles, comment):
-        """Get the comments to be exported to the sheet."""
-        # Making sure that the number of comments matches the number of questions on the comment to keep
-        # the layout intact. In case user has not responded to a question the column value should be
-        # blank.
-        comment_dict = {item['label']: {'text': ''} for item in titles}
-
-        for item in comment['comments']:
-            label = item['label']
-            if label in comment_dict:
-                comment_dict[label]['text'] = item['text']
-
-        comments = [comment_dict[item['label']] for item in titles]
-
-        return comments
-
     @classmethod
     def get_rejection_note(cls, comment):
         """Get the rejection note."""
@@ -243,65 +233,92 @@ class CommentService:
         return ', '.join(rejection_note)
 
     @classmethod
-    def export_comments_to_spread_sheet_proponent(cls, survey_id):
-        """Export comments to spread sheet."""
+    def export_comments_to_spread_sheet_proponent(cls, survey_id, file_format=None):
+        """Export comments to spread sheet.
+
+        Without a file format the sheet is rendered from the styled CDOGS template, otherwise it is
+        streamed from the database in the requested format.
+        """
         survey = SurveyModel.find_by_id(survey_id)
+        cls.check_proponent_sheet_access(survey)
+        if file_format is not None:
+            return cls._export_proponent_spread_sheet(survey, file_format)
+        return DocumentGenerationService().generate_document(data=cls.get_proponent_sheet_data(survey_id),
+                                                             options=PROPONENT_SHEET_OPTIONS)
+
+    @staticmethod
+    def check_proponent_sheet_access(survey: SurveyModel):
+        """Check that the user may export the proponent sheet of the survey."""
         one_of_roles = (
             MembershipType.TEAM_MEMBER.name,
             Role.EXPORT_ALL_TO_CSV.value
         )
         authorization.check_auth(one_of_roles=one_of_roles, engagement_id=survey.engagement_id)
+
+    @classmethod
+    def get_proponent_sheet_data(cls, survey_id):
+        """Return the data rendered into the proponent sheet template."""
         comments = Comment.get_public_viewable_comments_by_survey_id(survey_id)
-        formatted_comments = cls.format_comments(comments)
-        document_options = {
-            'document_type': GeneratedDocumentTypes.COMMENT_SHEET_PROPONENT.value,
-            'template_name': 'proponent_comments_sheet.xlsx',
-            'convert_to': 'xlsx',
-            'report_name': 'proponent_comments_sheet'
-        }
-        return DocumentGenerationService().generate_document(data=formatted_comments, options=document_options)
+        return cls.format_comments(comments)
+
+    @classmethod
+    def _export_proponent_spread_sheet(cls, survey: SurveyModel, file_format):
+        """Stream the proponent sheet, laid out as format_comments lays out the templated document."""
+        component_labels = cls.get_component_labels(survey.form_json)
+        # labels are ordered by their first comment, as the comments are ordered by text
+        first_texts = {}
+        component_ids = defaultdict(list)
+        for component_id, first_text in Comment.get_public_viewable_first_texts(survey.id):
+            label = component_labels.get(component_id)
+            component_ids[label].append(component_id)
+            if label not in first_texts or first_text < first_texts[label]:
+                first_texts[label] = first_text
+        labels = sorted(first_texts, key=first_texts.get)
+
+        header = ['No.', *itertools.chain.from_iterable((label, 'Proponent Answer') for label in labels)]
+
+        def rows():
+            comments_by_label = [
+                Comment.stream_public_viewable_comments(survey.id, component_ids[label]) for label in labels]
+            for row_id, row in enumerate(itertools.zip_longest(*comments_by_label), start=1):
+                yield [row_id, *itertools.chain.from_iterable(
+                    (comment.text if comment is not None else '', '') for comment in row)]
+
+        return spreadsheet_export('proponent_comments_sheet', file_format, header, rows())
 
     @classmethod
     def group_comments_by_submission_id(cls, comments):
         """Group the comments together, arranging them in the same order as the titles."""
-        grouped_comments = []
+        # groups keyed by submission id, in order of first appearance
+        groups = {}
         for comment in comments:
             submission_id = comment['submission_id']
             text = comment.get('text', '')  # Get the text, or an empty string if it's missing
-            label = comment['label']
+            group = groups.get(submission_id)
+            if group is None:
+                group = groups[submission_id] = {'submission_id': submission_id, 'commentText': []}
+            group['commentText'].append({'text': text, 'label': comment['label']})
 
-            # Check if a group with the same submission ID already exists
-            existing_group = next((group for group in grouped_comments
-                                   if group['submission_id'] == submission_id), None)
-
-            if existing_group:
-                # Add the new comment
-                existing_group['commentText'].append({'text': text, 'label': label})
-            else:
-                new_group = {'submission_id': submission_id, 'commentText': [{'text': text, 'label': label}]}
-                grouped_comments.append(new_group)
-
-        return grouped_comments
+        return list(groups.values())
 
     @classmethod
     def get_visible_titles(cls, survey, comments):
-        """Add unique labels to titles list in order of appearance."""
-        visible_titles = []
-        for comment in comments:
-            label = comment['label']
-            if label not in [title['label'] for title in visible_titles]:
-                visible_titles.append({'label': label})
-
-        return [title for title in cls.get_titles(survey) if title in visible_titles]
+        """Return the titles of the survey that have at least one comment, in survey order."""
+        visible_labels = {comment['label'] for comment in comments}
+        return [title for title in cls.get_titles(survey) if title['label'] in visible_labels]
 
     @classmethod
     def sort_comments_by_titles(cls, titles, grouped_comments):
         """Sort commentText within each group based on the order of titles."""
         for group in grouped_comments:
+            comments_by_label = defaultdict(list)
+            for comment in group['commentText']:
+                comments_by_label[comment['label']].append(comment)
+
             sorted_comment_text = []
             for title in titles:
                 label = title['label']
-                matching_comments = [comment for comment in group['commentText'] if comment['label'] == label]
+                matching_comments = comments_by_label.get(label)
                 if not matching_comments:
                     sorted_comment_text.append({'text': '', 'label': label})
                 else:
@@ -312,57 +329,28 @@ class CommentService:
 
     @classmethod
     def format_comments(cls, comments):
-        """Format comments."""
-        # Create a dictionary to store comments grouped by labels
+        """Format comments into rows holding the next comment for each label, in order of appearance."""
+        # comments grouped by label; labels are kept in order of first appearance
         comments_by_label = {}
-
-        # Create a list to store unique titles in order of appearance
-        unique_titles = []
-
-        # Iterate over the input data
         for comment in comments:
-            # Get the submission_id, or an empty string if it's missing
-            submission_id = comment.get('submission_id', '')
-            label = comment['label']
-            text = comment.get('text', '')  # Get the text, or an empty string if it's missing
-
-            # If the label is not already in unique_titles, add it
-            if label not in unique_titles:
-                unique_titles.append(label)
-
-            # If label is not in comments_by_label, create an empty list for it
-            if label not in comments_by_label:
-                comments_by_label[label] = []
-
-            # Append the comment to the corresponding label in comments_by_label
-            comments_by_label[label].append({'text': text, 'submission_id': submission_id})
-
-        # Create a list of titles with label information in order of appearance
-        titles = [{'label': title, 'proponent_answers': 'Proponent Answer'} for title in unique_titles]
-
-        # Create a list of comments organized by label order
-        formatted_comments = []
-        row_id = 1
-
-        # Iterate over each row_id until there are no more comments
-        while any(comments_by_label.get(title['label']) for title in titles):
-            comment_row = {'row_id': row_id, 'commentText': []}
-
-            for title in titles:
-                label = title['label']
-                label_comments = comments_by_label.get(label, [{'text': '', 'submission_id': ''}])
-                # If there are comments for this label, pop the first one
-                if label_comments:
-                    comment_text = label_comments.pop(0)
-                else:
-                    # If there are no comments for this label, use a default empty text
-                    comment_text = {'text': '', 'submission_id': ''}
+            # Get the submission_id and text, or an empty string if they are missing
+            comments_by_label.setdefault(comment['label'], []).append({
+                'text': comment.get('text', ''),
+                'submission_id': comment.get('submission_id', ''),
+            })
 
-                comment_row['commentText'].append(comment_text)
+        titles = [{'label': label, 'proponent_answers': 'Proponent Answer'} for label in comments_by_label]
 
-            # Append the comment row to the list of comments
-            formatted_comments.append(comment_row)
-            row_id += 1
+        # Row n holds the n-th comment of every label, blank where a label has fewer comments
+        formatted_comments = [
+            {
+                'row_id': row_id,
+                'commentText': [
+                    comment_text if comment_text is not None else {'text': '', 'submission_id': ''}
+                    for comment_text in row
+                ],
+            }
+            for row_id, row in enumerate(itertools.zip_longest(*comments_by_label.values()), start=1)
+        ]
 
-        # Create the final output structure
         return {'titles': titles, 'comments': formatted_comments}
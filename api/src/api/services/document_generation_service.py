@@ -14,7 +14,9 @@
 
 
 """Service for document generation."""
+import hashlib
 import os
+from functools import lru_cache
 
 from flask import current_app
 
@@ -22,6 +24,22 @@ from api.models.generated_document_template import GeneratedDocumentTemplate
 from api.services.cdogs_api_service import CdogsApiService
 
 
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))),
+                             'generated_documents_carbone_templates')
+
+
+def get_template_path(template_name: str) -> str:
+    """Return the path of the template file, whatever the working directory."""
+    return os.path.join(TEMPLATES_DIR, template_name)
+
+
+@lru_cache(maxsize=None)
+def get_template_digest(template_name: str) -> str:
+    """Return the sha256 digest of the template file, which changes whenever the template does."""
+    with open(get_template_path(template_name), 'rb') as template_file:
+        return hashlib.sha256(template_file.read()).hexdigest()
+
+
 class DocumentGenerationService:  # pylint:disable=too-few-public-methods
     """document generation Service class."""
 
@@ -51,13 +69,7 @@ class DocumentGenerationService:  # pylint:disable=too-few-public-methods
         if document_template.hash_code is None or not template_cached:
             current_app.logger.info('Uploading new template')
 
-            template_name = options.get('template_name')
-            file_dir = os.path.dirname(os.path.realpath('__file__'))
-            document_template_path = os.path.join(
-                file_dir,
-                'src/api/generated_documents_carbone_templates/',
-                template_name
-            )
+            document_template_path = get_template_path(options.get('template_name'))
 
             if not os.path.exists(document_template_path):
                 raise ValueError('Template file does not exist')
@@ -0,0 +1,182 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Service for documents generated outside of the request that asked for them.
+
+A request enqueues a document job and returns at once; the document job worker
+renders the document through CDOGS and stores it in object storage. Documents
+are keyed by their type, survey, template digest and a watermark of the data
+they are rendered from, so a document whose data has not changed since it was
+last generated is served from object storage without being rendered again.
+"""
+import hashlib
+from datetime import datetime, timedelta
+from http import HTTPStatus
+from typing import Callable, NamedTuple
+
+from flask import current_app
+
+from api.constants.document_job_status import DocumentJobStatus
+from api.exceptions.business_exception import BusinessException
+from api.models.comment import Comment as CommentModel
+from api.models.db import db
+from api.models.document_job import DocumentJob as DocumentJobModel
+from api.models.survey import Survey as SurveyModel
+from api.schemas.document_job import DocumentJobSchema
+from api.services.comment_service import PROPONENT_SHEET_OPTIONS, CommentService
+from api.services.document_generation_service import DocumentGenerationService, get_template_digest
+from api.services.object_storage_service import ObjectStorageService
+from api.utils.enums import GeneratedDocumentTypes
+
+
+# object storage folder holding the generated documents
+ARTIFACT_PREFIX = 'generated-documents'
+
+
+class JobDocument(NamedTuple):
+    """A document that can be generated by the document job worker."""
+
+    options: dict
+    # returns the data rendered into the template, given the survey id
+    get_data: Callable[[int], dict]
+    # raises if the user may not request the document, given the survey
+    check_access: Callable[[SurveyModel], None]
+    # returns values that change whenever the data does, given the survey id
+    get_watermark: Callable[[int], tuple]
+
+
+class ClaimedJob(NamedTuple):
+    """The values of a claimed job needed to generate its document."""
+
+    id: int
+    document_type_id: int
+    survey_id: int
+    cache_key: str
+    attempts: int
+
+
+DOCUMENTS = {
+    GeneratedDocumentTypes.COMMENT_SHEET_PROPONENT.value: JobDocument(
+        PROPONENT_SHEET_OPTIONS,
+        CommentService.get_proponent_sheet_data,
+        CommentService.check_proponent_sheet_access,
+        CommentModel.get_export_watermark,
+    ),
+}
+
+
+class DocumentJobService:
+    """Document job management service."""
+
+    @classmethod
+    def request_document(cls, document_type: int, survey_id: int) -> dict:
+        """Return the job generating the document, reusing a job with a matching document when there is one."""
+        document = cls._get_document(document_type)
+        survey = SurveyModel.find_by_id(survey_id)
+        if not survey:
+            raise ValueError('Survey not found')
+        document.check_access(survey)
+
+        cache_key = cls.get_cache_key(document_type, survey.id)
+        job = DocumentJobModel.find_reusable(cache_key)
+        if job is None:
+            job = DocumentJobModel(document_type_id=document_type, survey_id=survey.id, cache_key=cache_key,
+                                   status=DocumentJobStatus.PENDING)
+            job.save()
+        return DocumentJobSchema().dump(job)
+
+    @classmethod
+    def get_job(cls, job_id: int) -> dict:
+        """Return the job, once the user is known to have access to its document."""
+        return DocumentJobSchema().dump(cls._get_accessible_job(job_id))
+
+    @classmethod
+    def get_document(cls, job_id: int):
+        """Return the streamed object storage response, file name and content type of the generated document."""
+        job = cls._get_accessible_job(job_id)
+        if job.status != DocumentJobStatus.COMPLETED:
+            raise BusinessException('The document has not been generated yet.', HTTPStatus.CONFLICT)
+        return ObjectStorageService().get_object(job.artifact_key), job.file_name, job.content_type
+
+    @staticmethod
+    def get_cache_key(document_type: int, survey_id: int) -> str:
+        """Return the key of the document as it would be generated from the current data."""
+        document = DOCUMENTS[document_type]
+        watermark = document.get_watermark(survey_id)
+        template_digest = get_template_digest(document.options['template_name'])
+        key = ':'.join(str(part) for part in (document_type, survey_id, template_digest, *watermark))
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    @classmethod
+    def process_pending_jobs(cls, worker_id: str, job_config: dict) -> dict:
+        """Generate the documents of pending jobs until none are left, returning counts of the outcomes.
+
+        job_config holds the BATCH_SIZE, LEASE_SECONDS, MAX_ATTEMPTS and RETRY_BACKOFF_SECONDS of the worker.
+        """
+        outcomes = {'claimed': 0, 'completed': 0, 'reused': 0, 'retried': 0, 'failed': 0}
+        while jobs := DocumentJobModel.claim_pending(job_config['BATCH_SIZE'], worker_id,
+                                                     job_config['LEASE_SECONDS']):
+            outcomes['claimed'] += len(jobs)
+            claimed = [ClaimedJob(job.id, job.document_type_id, job.survey_id, job.cache_key, job.attempts)
+                       for job in jobs]
+            for job in claimed:
+                outcomes[cls._process_job(job, job_config)] += 1
+        return outcomes
+
+    @classmethod
+    def _process_job(cls, job: ClaimedJob, job_config: dict) -> str:
+        # a job requested before the document was generated for an earlier job is completed with that document
+        completed_job = DocumentJobModel.find_reusable(job.cache_key)
+        if completed_job is not None and completed_job.status == DocumentJobStatus.COMPLETED:
+            DocumentJobModel.mark_completed(job.id, completed_job.artifact_key, completed_job.file_name,
+                                            completed_job.content_type)
+            return 'reused'
+
+        document = DOCUMENTS[job.document_type_id]
+        options = document.options
+        try:
+            response = DocumentGenerationService().generate_document(data=document.get_data(job.survey_id),
+                                                                     options=options)
+            if response.status_code != HTTPStatus.OK:
+                raise ValueError(f'Document generation failed with status {response.status_code}')
+            artifact_key = f'{ARTIFACT_PREFIX}/{job.cache_key}.{options["convert_to"]}'
+            content_type = response.headers.get('content-type')
+            ObjectStorageService().put_object(artifact_key, response.content, content_type)
+        except Exception as exc:  # NOQA # pylint:disable=broad-except
+            current_app.logger.error('Document job %s failed on attempt %s: %s', job.id, job.attempts, exc)
+            # the failure may have left the session in a failed transaction, which would fail recording it too
+            db.session.rollback()
+            if job.attempts >= job_config['MAX_ATTEMPTS']:
+                DocumentJobModel.mark_failed(job.id, str(exc))
+                return 'failed'
+            backoff = job_config['RETRY_BACKOFF_SECONDS'] * 2 ** (job.attempts - 1)
+            DocumentJobModel.mark_failed(job.id, str(exc), datetime.utcnow() + timedelta(seconds=backoff))
+            return 'retried'
+
+        DocumentJobModel.mark_completed(job.id, artifact_key, f'{options["report_name"]}.{options["convert_to"]}',
+                                        content_type)
+        return 'completed'
+
+    @staticmethod
+    def _get_document(document_type: int) -> JobDocument:
+        if document_type not in DOCUMENTS:
+            raise BusinessException('Documents of this type cannot be generated by a job.', HTTPStatus.BAD_REQUEST)
+        return DOCUMENTS[document_type]
+
+    @classmethod
+    def _get_accessible_job(cls, job_id: int) -> DocumentJobModel:
+        job = DocumentJobModel.find_by_id(job_id)
+        if job is None:
+            raise BusinessException('Document job not found.', HTTPStatus.NOT_FOUND)
+        cls._get_document(job.document_type_id).check_access(SurveyModel.find_by_id(job.survey_id))
+        return job
@@ -33,12 +33,18 @@ from api.services.engagement_slug_service import EngagementSlugService
 from api.services.object_storage_service import ObjectStorageService
 from api.services.project_service import ProjectService
 from api.utils import email_util, notification
+from api.utils.cache import cache
+from api.utils.datetime import local_datetime
 from api.utils.enums import SourceAction, SourceType
 from api.utils.roles import Role
 from api.utils.template import Template
 from api.utils.token_info import TokenInfo
 
 
+# lower case name as used by convention for module level singletons
+public_engagement_cache = cache.namespace('public_engagement')  # pylint: disable=invalid-name
+
+
 class EngagementService:
     """Engagement management service."""
 
@@ -57,12 +63,49 @@ class EngagementService:
         self.object_storage = ObjectStorageService()
 
     def get_engagement(self, engagement_id) -> Optional[EngagementDump]:
-        """Get Engagement by the id."""
+        """Get Engagement by the id.
+
+        Anonymous users only see published and closed engagements, which look the same to
+        all of them, so their reads are cached per version of the engagement. Any edit bumps
+        the version (see api.models.engagement_version), so a cache hit only costs the
+        lookup of the version.
+        """
+        timeout = current_app.config['PUBLIC_ENGAGEMENT_CACHE_TIMEOUT']
+        if TokenInfo.get_id() is not None or timeout <= 0:
+            return self._get_engagement(engagement_id)
+
+        version = EngagementModel.get_version(engagement_id)
+        if version is None:
+            return None
+        # the submission status of the engagement depends on the current date
+        key = f'{engagement_id}:{version}:{local_datetime().date().isoformat()}'
+        engagement = public_engagement_cache.get(key)
+        if engagement is None:
+            # the submission counts are for staff and would load every submission
+            engagement = self._get_engagement(engagement_id, exclude=('submissions_meta_data',))
+            if engagement:
+                public_engagement_cache.set(key, engagement, timeout=timeout)
+        return engagement
+
+    def _get_engagement(self, engagement_id, exclude=()) -> Optional[EngagementDump]:
+        engagement_model = self.get_accessible_engagement_model(engagement_id)
+        if engagement_model:
+            engagement = EngagementSchema(exclude=exclude).dump(engagement_model)
+            engagement['banner_url'] = self.object_storage.get_url(
+                engagement['banner_filename']
+            )
+            return engagement
+        return None
+
+    @staticmethod
+    def get_accessible_engagement_model(engagement_id, *options) -> Optional[EngagementModel]:
+        """Get the engagement model if the user has access to it, loading it with the given options."""
         engagement_model: EngagementModel = (
             EngagementModel.query
             .options(
                 selectinload(EngagementModel.suggested_engagement_links)
-                .selectinload(SuggestedEngagementModel.suggested_engagement)
+                .selectinload(SuggestedEngagementModel.suggested_engagement),
+                *options,
             )
             .filter_by(id=engagement_id)
             .one_or_none()
@@ -87,13 +130,7 @@ class EngagementService:
                 authorization.check_auth(
                     one_of_roles=one_of_roles, engagement_id=engagement_id
                 )
-
-            engagement = EngagementSchema().dump(engagement_model)
-            engagement['banner_url'] = self.object_storage.get_url(
-                engagement['banner_filename']
-            )
-            return engagement
-        return None
+        return engagement_model
 
     def get_engagements_paginated(
         self,
@@ -118,7 +155,7 @@ class EngagementService:
 
         if include_banner_url:
             engagements = self._attach_banner_url(engagements)
-        return {'items': engagements, 'total': total}
+        return {'items': engagements, 'total': total, **pagination_options.cursor_fields()}
 
     def _attach_banner_url(self, engagements: list):
         for engagement in engagements:
@@ -466,31 +503,30 @@ class EngagementService:
             raise ValueError('Some required fields are empty')
 
     @staticmethod
-    def _send_closeout_emails(engagement: EngagementModel) -> None:
-        """Send the engagement closeout emails. Throws error if fails."""
+    def _send_closeout_emails(engagement: EngagementModel) -> notification.EmailBatchReport:
+        """Send the engagement closeout emails and return the per-recipient report."""
         lang_code = current_app.config['DEFAULT_LANGUAGE']
         subject, body, args = EngagementService._render_email_template(
             engagement, lang_code
         )
         participants = SubmissionModel.get_engaged_participants(engagement.id)
         template_id = current_app.config['EMAIL_TEMPLATES']['CLOSEOUT']['ID']
-        emails = [
+        # Removes duplicated records
+        emails = {
             participant.decode_email(participant.email_address)
             for participant in participants
-        ]
-        # Removes duplicated records
-        emails = list(set(emails))
+        }
         try:
-            [
-                notification.send_email(
-                    subject=subject,
-                    email=email_address,
-                    html_body=body,
-                    args=args,
-                    template_id=template_id,
-                )
+            report = notification.send_email_batch(
+                {
+                    'subject': subject,
+                    'email': email_address,
+                    'html_body': body,
+                    'args': args,
+                    'template_id': template_id,
+                }
                 for email_address in emails
-            ]
+            )
         except Exception as exc:  # noqa: B902
             current_app.logger.error(
                 '<Notification for engagement closeout failed', exc
@@ -499,6 +535,12 @@ class EngagementService:
                 error='Error sending engagement closeout.',
                 status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
             ) from exc
+        if report.failed:
+            current_app.logger.error(
+                'Closeout emails for engagement %s failed for %s of %s recipients',
+                engagement.id, len(report.failed), len(report.results)
+            )
+        return report
 
     @staticmethod
     def _render_email_template(engagement: EngagementModel, lang_code):
@@ -563,6 +605,7 @@ class EngagementService:
         try:
             for translation in (EngagementTranslation.get_available_translation_languages(engagement.id) or []):
                 EngagementTranslation.delete_engagement_translation(translation.id)
+            EngagementSlugService.invalidate_engagement(engagement_id)
             deleted = EngagementModel.delete_engagement(engagement_id)
         except ValueError as exc:
             raise ValueError(str(exc)) from exc
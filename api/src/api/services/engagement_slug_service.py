@@ -1,8 +1,21 @@
-"""Service for engagement slug management."""
+"""Service for engagement slug management.
+
+Public pages resolve their engagement by slug on every load, so resolved slugs
+are cached. Every change to a slug goes through this service, which drops the
+affected entries.
+"""
+from typing import Optional
+
+from flask import current_app
+
 from api.models.engagement_slug import EngagementSlug as EngagementSlugModel
 from api.models.engagement import Engagement as EngagementModel
 from api.constants.engagement_status import Status
 from api.services.slug_generation_service import SlugGenerationService
+from api.utils.cache import cache
+
+
+slug_cache = cache.namespace('engagement_slug')
 
 
 class EngagementSlugService:
@@ -11,13 +24,34 @@ class EngagementSlugService:
     @classmethod
     def get_engagement_slug(cls, slug: str) -> EngagementSlugModel:
         """Get an engagement slug by slug."""
-        engagement_slug = EngagementSlugModel.find_by_slug(slug)
-        if not engagement_slug:
-            raise ValueError(f'No engagement slug found for {slug}')
-        return {
-            'slug': engagement_slug.slug,
-            'engagement_id': engagement_slug.engagement_id,
-        }
+        key = EngagementSlugModel.normalize(slug)
+        timeout = current_app.config.get('ENGAGEMENT_SLUG_CACHE_TIMEOUT', 0)
+        engagement_slug = slug_cache.get(key) if timeout > 0 else None
+        if engagement_slug is None:
+            engagement_slug_model = EngagementSlugModel.find_by_slug(key)
+            if not engagement_slug_model:
+                raise ValueError(f'No engagement slug found for {slug}')
+            engagement_slug = {
+                'slug': engagement_slug_model.slug,
+                'engagement_id': engagement_slug_model.engagement_id,
+            }
+            if timeout > 0:
+                slug_cache.set(key, engagement_slug, timeout=timeout)
+        return dict(engagement_slug)
+
+    @staticmethod
+    def invalidate(*slugs: Optional[str]):
+        """Drop the cached resolution of the given slugs."""
+        for slug in slugs:
+            if slug:
+                slug_cache.delete(EngagementSlugModel.normalize(slug))
+
+    @classmethod
+    def invalidate_engagement(cls, engagement_id: int):
+        """Drop the cached resolution of the slug of an engagement."""
+        engagement_slug = EngagementSlugModel.find_by_engagement_id(engagement_id)
+        if engagement_slug:
+            cls.invalidate(engagement_slug.slug)
 
     @classmethod
     def get_engagement_slug_by_engagement_id(cls, engagement_id: int) -> EngagementSlugModel:
@@ -47,6 +81,7 @@ class EngagementSlugService:
         slug = cls.generate_unique_slug(engagement.name)
         engagement_slug = EngagementSlugModel(engagement_id=engagement_id, slug=slug)
         engagement_slug.save()
+        cls.invalidate(engagement_slug.slug)
         return {
             'slug': engagement_slug.slug,
             'engagement_id': engagement_slug.engagement_id,
@@ -90,12 +125,15 @@ class EngagementSlugService:
             raise ValueError(f'{slug} is already used by another engagement')
 
         engagement_slug = EngagementSlugModel.find_by_engagement_id(engagement_id)
+        previous_slug = None
         if engagement_slug:
+            previous_slug = engagement_slug.slug
             engagement_slug.slug = slug
         else:
             engagement_slug = EngagementSlugModel(engagement_id=engagement_id, slug=slug)
 
         engagement_slug.save()
+        cls.invalidate(previous_slug, engagement_slug.slug)
         return {
             'slug': engagement_slug.slug,
             'engagement_id': engagement_slug.engagement_id,
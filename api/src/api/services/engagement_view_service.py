@@ -0,0 +1,133 @@
+"""Service assembling the public view of an engagement.
+
+The public page of an engagement needs the engagement, its translation, its
+widgets with their content, metadata and details tabs. These are assembled into
+a single view, which is cached per engagement, language and version of the
+engagement. The version is bumped on every write to any of those rows (see
+api.models.engagement_version), so a cached view is never stale.
+"""
+from typing import Optional
+
+from flask import current_app
+from sqlalchemy.orm import selectinload
+
+from api.constants.engagement_status import Status
+from api.constants.widget import WidgetType
+from api.models.engagement import Engagement as EngagementModel
+from api.models.widget_translation import WidgetTranslation as WidgetTranslationModel
+from api.schemas.engagement import EngagementSchema
+from api.schemas.engagement_metadata import EngagementMetadataSchema
+from api.schemas.widget_events import WidgetEventsSchema
+from api.schemas.widget_image import WidgetImageSchema
+from api.schemas.widget_listening import WidgetListeningSchema
+from api.schemas.widget_map import WidgetMapSchema
+from api.schemas.widget_poll import WidgetPollSchema
+from api.schemas.widget_subscribe import WidgetSubscribeSchema
+from api.schemas.widget_timeline import WidgetTimelineSchema
+from api.schemas.widget_translation import WidgetTranslationSchema
+from api.schemas.widget_video import WidgetVideoSchema
+from api.services.engagement_details_tab_service import EngagementDetailsTabService
+from api.services.engagement_details_tab_translation_service import EngagementDetailsTabTranslationService
+from api.services.engagement_service import EngagementService
+from api.services.engagement_slug_service import EngagementSlugService
+from api.services.engagement_translation_service import EngagementTranslationService
+from api.services.object_storage_service import ObjectStorageService
+from api.services.widget_documents_service import WidgetDocumentService
+from api.services.widget_events_service import WidgetEventsService
+from api.services.widget_image_service import WidgetImageService
+from api.services.widget_listening_service import WidgetListeningService
+from api.services.widget_map_service import WidgetMapService
+from api.services.widget_poll_service import WidgetPollService
+from api.services.widget_service import WidgetService
+from api.services.widget_subscribe_service import WidgetSubscribeService
+from api.services.widget_timeline_service import WidgetTimelineService
+from api.services.widget_video_service import WidgetVideoService
+from api.utils.cache import cache
+from api.utils.datetime import local_datetime
+
+
+# lower case name as used by convention for module level singletons
+view_cache = cache.namespace('engagement_view')  # pylint: disable=invalid-name
+
+# Views are only shared between users for the engagements everyone may see
+CACHED_STATUSES = (Status.Published.value, Status.Closed.value)
+
+# The typed content of each type of widget, and the schema it is dumped with.
+# Widget items (e.g. the contacts of who is listening) are dumped with the widget itself.
+WIDGET_CONTENT = {
+    WidgetType.WHO_IS_LISTENING.value: (WidgetListeningService.get_listening, WidgetListeningSchema),
+    WidgetType.DOCUMENTS.value: (WidgetDocumentService.get_documents_by_widget_id, None),
+    WidgetType.SUBSCRIBE.value: (WidgetSubscribeService.get_subscribe_by_widget_id, WidgetSubscribeSchema),
+    WidgetType.EVENTS.value: (WidgetEventsService.get_event_by_widget_id, WidgetEventsSchema),
+    WidgetType.Map.value: (WidgetMapService.get_map, WidgetMapSchema),
+    WidgetType.Video.value: (WidgetVideoService.get_video, WidgetVideoSchema),
+    WidgetType.Timeline.value: (WidgetTimelineService.get_timeline, WidgetTimelineSchema),
+    WidgetType.Poll.value: (WidgetPollService.get_polls_by_widget_id, WidgetPollSchema),
+    WidgetType.Image.value: (WidgetImageService.get_image, WidgetImageSchema),
+}
+
+
+class EngagementViewService:
+    """Engagement view management service."""
+
+    @classmethod
+    def get_engagement_view(cls, engagement_id: int = None, slug: str = None,
+                            language_id: int = None) -> Optional[dict]:
+        """Get the public view of an engagement by its id or slug, translated into a language if given."""
+        if slug is not None:
+            engagement_id = EngagementSlugService.get_engagement_slug(slug)['engagement_id']
+        version = EngagementModel.get_version(engagement_id)
+        if version is None:
+            return None
+
+        # the submission status of the engagement depends on the current date
+        key = f'{engagement_id}:{language_id}:{version}:{local_datetime().date().isoformat()}'
+        timeout = current_app.config['ENGAGEMENT_VIEW_CACHE_TIMEOUT']
+        view = view_cache.get(key) if timeout > 0 else None
+        if view is None:
+            view = cls._assemble_view(engagement_id, language_id)
+            if view and timeout > 0 and view['engagement']['status_id'] in CACHED_STATUSES:
+                view_cache.set(key, view, timeout=timeout)
+        return view
+
+    @staticmethod
+    def _assemble_view(engagement_id: int, language_id: Optional[int]) -> Optional[dict]:
+        engagement_model = EngagementService.get_accessible_engagement_model(
+            engagement_id,
+            selectinload(EngagementModel.status_block),
+        )
+        if not engagement_model:
+            return None
+
+        # the submission counts are for staff and would load every submission
+        engagement = EngagementSchema(exclude=('submissions_meta_data',)).dump(engagement_model)
+        engagement['banner_url'] = ObjectStorageService().get_url(engagement['banner_filename'])
+
+        widgets = WidgetService.get_widgets_by_engagement_id(engagement_id)
+        for widget in widgets:
+            get_content, schema = WIDGET_CONTENT.get(widget['widget_type_id'], (None, None))
+            content = get_content(widget['id']) if get_content else None
+            widget['content'] = schema().dump(content, many=True) if schema else content
+
+        view = {
+            'engagement': engagement,
+            'translation': None,
+            'widgets': widgets,
+            'metadata': EngagementMetadataSchema(many=True).dump(engagement_model.metadata),
+            'details_tabs': EngagementDetailsTabService.get_tabs_by_engagement_id(engagement_id),
+            'details_tab_translations': [],
+        }
+        if language_id is not None:
+            translations = EngagementTranslationService.get_translation_by_engagement_and_language(
+                engagement_id, language_id)
+            view['translation'] = translations[0] if translations else None
+            widget_translations = WidgetTranslationSchema(many=True).dump(
+                WidgetTranslationModel.get_translations_by_widget_ids([widget['id'] for widget in widgets],
+                                                                      language_id))
+            translation_by_widget = {translation['widget_id']: translation for translation in widget_translations}
+            for widget in widgets:
+                widget['translation'] = translation_by_widget.get(widget['id'])
+            view['details_tab_translations'] = \
+                EngagementDetailsTabTranslationService.get_translations_by_engagement_and_language(
+                    engagement_id, language_id)
+        return view
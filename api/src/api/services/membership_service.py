@@ -10,6 +10,7 @@ from api.models.engagement import Engagement as EngagementModel
 from api.models.membership import Membership as MembershipModel
 from api.schemas.staff_user import StaffUserSchema
 from api.services import authorization
+from api.services.principal_service import PrincipalService
 from api.services.staff_user_service import StaffUserService
 from api.services.user_group_membership_service import UserGroupMembershipService
 from api.utils.constants import CompositeRoles
@@ -141,6 +142,7 @@ class MembershipService:
             user_id,
             new_membership_details
         )
+        PrincipalService.invalidate_by_user_id(user_id)
         return new_membership
 
     @staticmethod
@@ -214,6 +216,7 @@ class MembershipService:
             membership.user_id,
             new_membership_details
         )
+        PrincipalService.invalidate_by_user_id(membership.user_id)
 
         return new_membership
 
@@ -234,16 +237,19 @@ class MembershipService:
             membership.user_id,
             new_membership_details
         )
+        PrincipalService.invalidate_by_user_id(membership.user_id)
         return new_membership
 
     @staticmethod
     def revoke_memberships_bulk(user_id: int):
         """Revoke memberships in bulk."""
         revoked_memberships = MembershipModel.revoke_memberships_bulk(user_id)
+        PrincipalService.invalidate_by_user_id(user_id)
         return revoked_memberships
 
     @staticmethod
     def deactivate_memberships_bulk(user_id: int):
         """Revoke memberships in bulk."""
         revoked_memberships = MembershipModel.deactivate_memberships_bulk(user_id)
+        PrincipalService.invalidate_by_user_id(user_id)
         return revoked_memberships
@@ -1,13 +1,16 @@
 """Service for object storage management."""
 import os
 import uuid
+from datetime import datetime, timezone
 from typing import List
+from urllib.parse import unquote, urlparse
 
 import requests
 from aws_requests_auth.aws_auth import AWSRequestsAuth
 
 from api.config import Config
 from api.schemas.document import Document
+from api.utils.s3_signer import S3Credentials, S3Signer
 
 
 class ObjectStorageService:
@@ -25,6 +28,14 @@ class ObjectStorageService:
             aws_service=s3_client['SERVICE']
         )
         self.s3_bucket = s3_client['BUCKET']
+        self.signer = S3Signer(
+            credentials=S3Credentials(s3_client['ACCESS_KEY_ID'], s3_client['SECRET_ACCESS_KEY']),
+            host=s3_client['HOST'],
+            region=s3_client['REGION'],
+            service=s3_client['SERVICE'],
+        )
+        self.presigned_url_expiry = s3_client['PRESIGNED_URL_EXPIRY']
+        self.timeout = s3_client['TIMEOUT']
 
     def get_url(self, filename: str):
         """Get the object url."""
@@ -33,8 +44,25 @@ class ObjectStorageService:
 
         return f'https://{self.s3_auth.aws_host}/{self.s3_bucket}/{filename}'
 
+    def put_object(self, key: str, content: bytes, content_type: str):
+        """Store the content in the bucket under the key."""
+        response = requests.put(self.get_url(key), data=content, headers={'Content-Type': content_type},
+                                auth=self.s3_auth, timeout=self.timeout)
+        response.raise_for_status()
+
+    def get_object(self, key: str) -> requests.Response:
+        """Return the streamed response for the object stored in the bucket under the key."""
+        response = requests.get(self.get_url(key), auth=self.s3_auth, stream=True, timeout=self.timeout)
+        response.raise_for_status()
+        return response
+
     def get_auth_headers(self, documents: List[Document]):
-        """Get the S3 auth headers for the provided documents."""
+        """Get the S3 auth headers for the provided documents.
+
+        New documents are given a unique name and authorized for upload, documents with an
+        s3sourceuri are authorized for download. Requests are signed locally, so the object
+        store is not contacted. Each document also gets a presigned URL for the same request.
+        """
         if (
             self.s3_auth.aws_access_key is None or
             self.s3_auth.aws_secret_access_key is None or
@@ -46,21 +74,22 @@ class ObjectStorageService:
                 'message': 'accesskey is None or secretkey is None or S3 host is None or formsbucket is None'
             }, 500
 
+        # the whole batch is signed with the same date, so the signing key is derived once
+        now = datetime.now(timezone.utc)
         for file in documents:
             s3sourceuri = file.get('s3sourceuri', None)
             filenamesplittext = os.path.splitext(file.get('filename'))
             uniquefilename = f'{uuid.uuid4()}{filenamesplittext[1]}'
 
             s3uri = s3sourceuri if s3sourceuri is not None else self.get_url(uniquefilename)
-
-            if s3sourceuri is None:
-                response = requests.put(s3uri, data=None, auth=self.s3_auth, timeout=None)
-            else:
-                response = requests.get(s3uri, auth=self.s3_auth, timeout=None)
+            method = 'PUT' if s3sourceuri is None else 'GET'
+            path = unquote(urlparse(s3uri).path)
+            headers = self.signer.sign_headers(method, path, now=now)
 
             file['filepath'] = s3uri
-            file['authheader'] = response.request.headers['Authorization']
-            file['amzdate'] = response.request.headers['x-amz-date']
+            file['authheader'] = headers['Authorization']
+            file['amzdate'] = headers['x-amz-date']
+            file['presignedurl'] = self.signer.presign_url(method, path, self.presigned_url_expiry, now=now)
             file['uniquefilename'] = uniquefilename if s3sourceuri is None else ''
 
         return documents
@@ -0,0 +1,130 @@
+"""Service for resolving the authenticated principal.
+
+A principal bundles everything authorization needs to know about the caller
+within the current tenant: the staff user, their tenant roles and their active
+engagement memberships. It is resolved once per request and stored on ``g``,
+and shared across requests through a short-lived cache keyed on (sub, tenant).
+"""
+from typing import Dict, List, Optional
+
+from attr import dataclass, field
+from flask import current_app, g, has_request_context
+from sqlalchemy import func
+
+from api.models.db import db
+from api.models.group_role_mapping import GroupRoleMapping
+from api.models.membership import Membership as MembershipModel
+from api.models.staff_user import StaffUser as StaffUserModel
+from api.models.user_group_membership import UserGroupMembership as UserGroupMembershipModel
+from api.models.user_role import UserRole as UserRoleModel
+from api.utils.cache import cache
+from api.utils.enums import MembershipStatus, UserStatus
+
+
+principal_cache = cache.namespace('principal')
+
+
+@dataclass
+class Principal:
+    """The resolved identity and permissions of a user within a tenant."""
+
+    external_id: str
+    tenant_id: Optional[int] = None
+    staff_user_id: Optional[int] = None
+    roles: List[str] = field(factory=list)
+    # engagement id -> {'type': membership type name, 'tenant_id': membership tenant id}
+    memberships: Dict[int, dict] = field(factory=dict)
+
+    @property
+    def is_staff_user(self) -> bool:
+        """Return True if the principal is an active staff user."""
+        return self.staff_user_id is not None
+
+    def get_membership(self, engagement_id) -> Optional[dict]:
+        """Return the active membership for an engagement, if any."""
+        return self.memberships.get(int(engagement_id))
+
+
+class PrincipalService:
+    """Resolves and caches principals."""
+
+    @classmethod
+    def get_principal(cls, external_id: str) -> Principal:
+        """Return the principal for the user in the current tenant."""
+        tenant_id = getattr(g, 'tenant_id', None)
+        principal: Principal = g.get('principal') if has_request_context() else None
+        if principal and principal.external_id == external_id and principal.tenant_id == tenant_id:
+            return principal
+
+        timeout = current_app.config.get('PRINCIPAL_CACHE_TIMEOUT', 0)
+        key = cls._cache_key(external_id, tenant_id)
+        principal = principal_cache.get(key) if timeout > 0 else None
+        if principal is None:
+            principal = cls._resolve(external_id, tenant_id)
+            if timeout > 0:
+                principal_cache.set(key, principal, timeout=timeout)
+
+        if has_request_context():
+            g.principal = principal
+        return principal
+
+    @classmethod
+    def invalidate(cls, external_id: str):
+        """Drop any cached principal for the user, in every tenant they belong to."""
+        if not external_id:
+            return
+        tenant_ids = {
+            membership.tenant_id for membership in UserGroupMembershipModel.get_groups_by_user_id(external_id)
+        }
+        tenant_ids.add(getattr(g, 'tenant_id', None))
+        for tenant_id in tenant_ids:
+            principal_cache.delete(cls._cache_key(external_id, tenant_id))
+        principal = g.get('principal')
+        if principal and principal.external_id == external_id:
+            g.pop('principal')
+
+    @classmethod
+    def invalidate_by_user_id(cls, user_id: int):
+        """Drop any cached principal for the staff user with the given id."""
+        user = StaffUserModel.find_by_id(user_id)
+        if user:
+            cls.invalidate(user.external_id)
+
+    @staticmethod
+    def _cache_key(external_id: str, tenant_id) -> str:
+        return f'{external_id.lower()}:{tenant_id}'
+
+    @staticmethod
+    def _resolve(external_id: str, tenant_id) -> Principal:
+        """Load the principal from the database."""
+        principal = Principal(external_id=external_id, tenant_id=tenant_id)
+
+        user = db.session.query(StaffUserModel.id) \
+            .filter(func.lower(StaffUserModel.external_id) == func.lower(external_id)) \
+            .filter(StaffUserModel.status_id == UserStatus.ACTIVE.value) \
+            .first()
+        if not user:
+            return principal
+        principal.staff_user_id = user.id
+
+        roles = db.session.query(UserRoleModel.name) \
+            .join(GroupRoleMapping, GroupRoleMapping.role_id == UserRoleModel.id) \
+            .join(UserGroupMembershipModel, UserGroupMembershipModel.group_id == GroupRoleMapping.group_id) \
+            .filter(UserGroupMembershipModel.staff_user_external_id == external_id) \
+            .filter(UserGroupMembershipModel.tenant_id == tenant_id) \
+            .distinct() \
+            .all()
+        principal.roles = [role.name for role in roles]
+
+        memberships = db.session.query(
+            MembershipModel.engagement_id, MembershipModel.type, MembershipModel.tenant_id
+        ).filter(
+            MembershipModel.user_id == user.id,
+            MembershipModel.is_latest.is_(True),
+            MembershipModel.status == MembershipStatus.ACTIVE.value,
+        ).all()
+        principal.memberships = {
+            membership.engagement_id: {'type': membership.type.name, 'tenant_id': membership.tenant_id}
+            for membership in memberships
+        }
+        return principal
@@ -23,6 +23,7 @@ from requests.exceptions import ConnectionError as ReqConnectionError
 
 from api.utils.enums import AuthHeaderType, ContentType
 from api.utils.logging_masker import mask_dict
+from api.utils.token_manager import client_credentials_fetcher, token_manager
 
 
 class RestService:
@@ -120,11 +121,11 @@ class RestService:
             raise ValueError('Missing required parameters')
 
         token_url = issuer_url + '/protocol/openid-connect/token'
-        auth_response = requests.post(token_url, auth=(kc_service_id, kc_secret), headers={
-            'Content-Type': ContentType.FORM_URL_ENCODED.value}, data='grant_type=client_credentials',
-            timeout=None)
-        auth_response.raise_for_status()
-        return auth_response.json().get('access_token')
+        # Tokens are cached per (client, issuer) and refreshed shortly before they expire
+        return token_manager.get_token(
+            (kc_service_id, issuer_url),
+            client_credentials_fetcher(token_url, kc_service_id, kc_secret),
+        )
 
     @staticmethod
     def get_access_token_with_password(username, password, client_id, issuer_url):
@@ -13,73 +13,108 @@
 # limitations under the License.
 
 
-"""Service for shapefile service."""
-import json
+"""Service for shapefile service.
+
+Every shapefile is converted to geojson in a process of its own, so that reading
+and simplifying large geometries does not hold up the process serving requests,
+and a conversion taking too long can be stopped without affecting the others.
+Every conversion has its own temporary workspace under SHAPEFILE_UPLOAD_FOLDER,
+which is removed once the conversion is done.
+"""
+import multiprocessing
 import os
-import shutil
-import zipfile
+import tempfile
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
 from http import HTTPStatus
+from typing import Dict, Iterator
 
-import geopandas as gpd
 from flask import current_app
-from werkzeug.utils import secure_filename
 
+from api.constants.map_detail import MapDetail
 from api.exceptions.business_exception import BusinessException
+from api.utils.shapefile import ShapefileError, ShapefileLimitError, ShapefileLimits, convert_shapefile
 
 
-class ShapefileService:   # pylint: disable=too-few-public-methods
-    """This is the shapefile related service class."""
-
-    @staticmethod
-    def convert_to_geojson(file):
-        """Convert to Geojson."""
-        upload_folder = current_app.config.get('SHAPEFILE_UPLOAD_FOLDER')
-        shapefile_path = ShapefileService._unzip_file(file, upload_folder)
-        geojson_string = ShapefileService._get_geojson(shapefile_path)
-        # Clean up uploaded files
-        shutil.rmtree(os.path.join(upload_folder))
-        return geojson_string
+UPLOAD_FILE_NAME = 'upload.zip'
+EXTRACT_DIR_NAME = 'shapefile'
 
-    @staticmethod
-    def _get_geojson(shapefile_path):
-        gdf = gpd.read_file(shapefile_path)
+_conversion_slots = None  # pylint: disable=invalid-name
+_conversion_slots_lock = threading.Lock()
 
-        # Check if the GeoDataFrame's CRS is not EPSG:4326, if so transform it to EPSG:4326
-        if gdf.crs and gdf.crs.to_epsg() != 4326:
-            gdf = gdf.to_crs(epsg=4326)
 
-        geojson_dict = json.loads(gdf.to_json())
-        geojson_string = json.dumps(geojson_dict)
-        return geojson_string
+class ShapefileService:   # pylint: disable=too-few-public-methods
+    """This is the shapefile related service class."""
 
     @staticmethod
-    def _unzip_file(file, upload_folder):
-        filename = secure_filename(file.filename)
-        ShapefileService._create_upload_dir(upload_folder)
-        file_path = os.path.join(upload_folder, filename)
-        file.save(file_path)
-        with zipfile.ZipFile(file_path, 'r') as zip_ref:
-            zip_ref.extractall(upload_folder)
-            shapefile_name = ShapefileService._get_shapefile_name(zip_ref)
-            if not shapefile_name:
+    def convert_to_geojson(file) -> Dict[str, str]:
+        """Convert to Geojson, at every level of detail keyed on the level."""
+        config = current_app.config['SHAPEFILE_CONFIG']
+        limits = ShapefileLimits(
+            max_uncompressed_size=config['MAX_UNCOMPRESSED_SIZE'],
+            max_members=config['MAX_MEMBERS'],
+            max_features=config['MAX_FEATURES'],
+            tolerances={
+                MapDetail.MEDIUM.value: config['MEDIUM_TOLERANCE'],
+                MapDetail.LOW.value: config['LOW_TOLERANCE'],
+            },
+        )
+        upload_folder = current_app.config.get('SHAPEFILE_UPLOAD_FOLDER')
+        os.makedirs(upload_folder, exist_ok=True)
+        with tempfile.TemporaryDirectory(dir=upload_folder, ignore_cleanup_errors=True) as workspace:
+            zip_path = os.path.join(workspace, UPLOAD_FILE_NAME)
+            file.save(zip_path)
+            try:
+                with ShapefileService._conversion_slot(config['WORKERS'], config['TIMEOUT']):
+                    return ShapefileService._convert_in_process(
+                        zip_path, os.path.join(workspace, EXTRACT_DIR_NAME), limits, config['TIMEOUT'])
+            except ShapefileLimitError as err:
+                raise BusinessException(error=str(err), status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE) from err
+            except ShapefileError as err:
+                raise BusinessException(error=str(err), status_code=HTTPStatus.BAD_REQUEST) from err
+            except FutureTimeoutError as err:
                 raise BusinessException(
-                    error='No Valid shapefile found.',
-                    status_code=HTTPStatus.BAD_REQUEST)
-
-        shapefile_path = os.path.join(upload_folder, shapefile_name)
-        return shapefile_path
+                    error='The shapefile took too long to convert.',
+                    status_code=HTTPStatus.GATEWAY_TIMEOUT) from err
+            except BrokenProcessPool as err:
+                # the conversion process died, e.g. running out of memory
+                raise BusinessException(
+                    error='The shapefile could not be converted.',
+                    status_code=HTTPStatus.INTERNAL_SERVER_ERROR) from err
 
     @staticmethod
-    def _get_shapefile_name(zip_ref):
-        shapefile_name = None
-        for name in zip_ref.namelist():
-            if name.endswith('.shp') and 'MACOSX' not in name:
-                shapefile_name = name
-        return shapefile_name
+    @contextmanager
+    def _conversion_slot(max_workers: int, timeout: int) -> Iterator[None]:
+        """Hold one of the slots bounding the conversions running at a time in each server process."""
+        global _conversion_slots  # pylint: disable=global-statement
+        with _conversion_slots_lock:
+            if _conversion_slots is None:
+                _conversion_slots = threading.BoundedSemaphore(max_workers)
+            slots = _conversion_slots
+        if not slots.acquire(timeout=timeout):
+            raise BusinessException(
+                error='Too many shapefiles are being converted, please try again later.',
+                status_code=HTTPStatus.SERVICE_UNAVAILABLE)
+        try:
+            yield
+        finally:
+            slots.release()
 
     @staticmethod
-    def _create_upload_dir(upload_folder):
-        is_exist = os.path.exists(upload_folder)
-        if not is_exist:
-            # Create a new directory because it does not exist
-            os.makedirs(upload_folder)
+    def _convert_in_process(zip_path: str, extract_dir: str, limits: ShapefileLimits,
+                            timeout: int) -> Dict[str, str]:
+        """Convert the shapefile in a process of its own, which is stopped if the conversion takes too long."""
+        # spawned rather than forked, as the server process runs threads and holds connections
+        executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn'))
+        try:
+            return executor.submit(convert_shapefile, zip_path, extract_dir, limits).result(timeout=timeout)
+        except FutureTimeoutError:
+            # a running conversion cannot be cancelled, so its process is stopped
+            for process in list((executor._processes or {}).values()):  # pylint: disable=protected-access
+                process.terminate()
+            raise
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -1,5 +1,4 @@
 """Service for generating slugs."""
-from slugify import UniqueSlugify
 from api.config import Config
 
 
@@ -17,6 +16,9 @@ class SlugGenerationService:
     @staticmethod
     def create_custom_unique_slugify():
         """Create and return a unique slugify."""
+        # slugify is only needed when creating engagements, so it is not imported while the application starts
+        from slugify import UniqueSlugify  # pylint: disable=import-outside-toplevel
+
         slugify = UniqueSlugify(
             to_lower=True,  # NOSONAR # to_lower is a valid paramter for awesome-slugify
             max_length=Config.SLUG_MAX_CHARACTERS,
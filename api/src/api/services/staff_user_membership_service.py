@@ -5,6 +5,7 @@ from api.exceptions.business_exception import BusinessException
 from api.models.staff_user import StaffUser as StaffUserModel
 from api.schemas.staff_user import StaffUserSchema
 from api.services.membership_service import MembershipService
+from api.services.principal_service import PrincipalService
 from api.services.staff_user_service import StaffUserService
 from api.services.user_group_membership_service import UserGroupMembershipService
 from api.utils.constants import CompositeRoles
@@ -69,4 +70,5 @@ class StaffUserMembershipService:
 
         user.status_id = UserStatus.ACTIVE.value if active else UserStatus.INACTIVE.value
         user.save()
+        PrincipalService.invalidate(user.external_id)
         return StaffUserSchema().dump(user)
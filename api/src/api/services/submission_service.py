@@ -321,7 +321,8 @@ class SubmissionService:
         )
         return {
             'items': SubmissionSchema(many=True, exclude=['submission_json']).dump(items),
-            'total': total
+            'total': total,
+            **pagination_options.cursor_fields(),
         }
 
     @staticmethod
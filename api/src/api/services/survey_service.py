@@ -93,7 +93,8 @@ class SurveyService:
 
         return {
             'items': surveys_schema.dump(items),
-            'total': total
+            'total': total,
+            **pagination_options.cursor_fields(),
         }
 
     @staticmethod
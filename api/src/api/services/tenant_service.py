@@ -11,18 +11,30 @@ from ..utils.cache import cache
 
 NOT_FOUND_MSG = 'Tenant not found.'
 
+tenant_cache = cache.namespace('tenant')
+
 
 class TenantService:
     """Tenant management service."""
 
+    CACHE_WARM_KEY = '__warm__'
+
+    @classmethod
+    def cache_tenant(cls, tenant: TenantModel) -> dict:
+        """Cache the fields needed to resolve a tenant and return them."""
+        key = tenant.short_name.upper()
+        cached_tenant = {'id': tenant.id, 'short_name': key}
+        tenant_cache.set(key, cached_tenant)
+        return cached_tenant
+
     @classmethod
     def build_all_tenant_cache(cls):
         """Build cache for all tenant values."""
         try:
             tenants = TenantModel.query.all()
             for tenant in tenants:
-                key = tenant.short_name.upper()
-                cache.set(f'tenant_{key}', tenant)
+                cls.cache_tenant(tenant)
+            tenant_cache.set(cls.CACHE_WARM_KEY, True)
         except SQLAlchemyError as e:
             current_app.logger.info('Error on building cache {}', e)
 
@@ -65,6 +77,7 @@ class TenantService:
         tenant = TenantModel.find_by_short_name(tenant_id)
         if not tenant:
             raise ValueError(NOT_FOUND_MSG, cls, tenant_id)
+        tenant_cache.delete(tenant.short_name.upper())
         try:
             tenant.update(data)
         except SQLAlchemyError as e:
@@ -82,6 +95,7 @@ class TenantService:
         tenant = TenantModel.find_by_short_name(tenant_id)
         if not tenant:
             raise ValueError(NOT_FOUND_MSG, cls, tenant_id)
+        tenant_cache.delete(tenant.short_name.upper())
         try:
             tenant.delete()
         except SQLAlchemyError as e:
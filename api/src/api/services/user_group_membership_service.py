@@ -3,6 +3,7 @@ from typing import List, Tuple
 
 from api.models.user_group_membership import UserGroupMembership
 from api.models.user_role import UserRole
+from api.services.principal_service import PrincipalService
 
 
 class UserGroupMembershipService:
@@ -46,9 +47,13 @@ class UserGroupMembershipService:
     @staticmethod
     def assign_composite_role_to_user(membership_data):
         """Create user_group_membership."""
-        return UserGroupMembership.create_user_group_membership(membership_data)
+        membership = UserGroupMembership.create_user_group_membership(membership_data)
+        PrincipalService.invalidate(membership_data.get('external_id'))
+        return membership
 
     @staticmethod
     def reassign_composite_role_to_user(membership_data):
         """Update user_group_membership."""
-        return UserGroupMembership.update_user_group_membership(membership_data)
+        membership = UserGroupMembership.update_user_group_membership(membership_data)
+        PrincipalService.invalidate(membership_data.get('external_id'))
+        return membership
@@ -1,10 +1,6 @@
 """Service for widget Document management."""
 from http import HTTPStatus
 
-from anytree import AnyNode
-from anytree.exporter import DictExporter
-from anytree.search import find_by_attr
-
 from api.exceptions.business_exception import BusinessException
 from api.models.widget_documents import WidgetDocuments as WidgetDocumentsModel
 from api.utils.enums import WidgetDocumentType
@@ -16,6 +12,10 @@ class WidgetDocumentService:
     @staticmethod
     def get_documents_by_widget_id(widget_id):
         """Get documents by widget id."""
+        # anytree is only needed for document widgets, so it is not imported while the application starts
+        from anytree import AnyNode  # pylint: disable=import-outside-toplevel
+        from anytree.exporter import DictExporter  # pylint: disable=import-outside-toplevel
+
         docs = WidgetDocumentsModel.get_all_by_widget_id(widget_id)
         if not docs:
             return {}
@@ -29,6 +29,9 @@ class WidgetDocumentService:
 
     @staticmethod
     def _attach_file_nodes(docs, root):
+        from anytree import AnyNode  # pylint: disable=import-outside-toplevel
+        from anytree.search import find_by_attr  # pylint: disable=import-outside-toplevel
+
         files = list(filter(lambda doc: doc.type == WidgetDocumentType.FILE.value, docs))
         for file in files:
             props = WidgetDocumentService._fetch_props(file)
@@ -39,6 +42,8 @@ class WidgetDocumentService:
 
     @staticmethod
     def _attach_folder_nodes(docs, root):
+        from anytree import AnyNode  # pylint: disable=import-outside-toplevel
+
         folders = list(filter(lambda doc: doc.type == WidgetDocumentType.FOLDER.value, docs))
         for folder in folders:
             props = WidgetDocumentService._fetch_props(folder)
@@ -1,6 +1,7 @@
 """Service for Widget Map management."""
 from http import HTTPStatus
 
+from api.constants.map_detail import MapDetail
 from api.constants.membership_type import MembershipType
 from api.exceptions.business_exception import BusinessException
 from api.models.widget_map import WidgetMap as WidgetMapModel
@@ -28,7 +29,9 @@ class WidgetMapService:
                                                Role.EDIT_ENGAGEMENT.value), engagement_id=eng_id)
         if shape_file:
             geojson = ShapefileService().convert_to_geojson(shape_file)
-            map_data['geojson'] = geojson
+            map_data['geojson'] = geojson[MapDetail.FULL.value]
+            map_data['geojson_medium'] = geojson[MapDetail.MEDIUM.value]
+            map_data['geojson_low'] = geojson[MapDetail.LOW.value]
             map_data['file_name'] = shape_file.filename
         widget_map = WidgetMapService._create_map_model(widget_id, map_data)
         widget_map.commit()
@@ -58,5 +61,7 @@ class WidgetMapService:
         map_model.engagement_id = map_data.get('engagement_id')
         map_model.file_name = map_data.get('file_name')
         map_model.geojson = map_data.get('geojson')
+        map_model.geojson_medium = map_data.get('geojson_medium')
+        map_model.geojson_low = map_data.get('geojson_low')
         map_model.flush()
         return map_model
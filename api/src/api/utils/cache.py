@@ -11,9 +11,210 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-"""Bring in the common cache."""
+"""Bring in the common cache.
+
+The cache is split into two tiers:
+
+* a small in-process L1 tier with a TTL and LRU eviction, so hot keys are
+  served from memory without any network round-trip, and
+* a shared L2 tier provided by Flask-Caching. In deployed environments this is
+  Redis, so every gunicorn worker in every pod sees the same entries. Tests may
+  use ``FakeRedisCache`` (backed by fakeredis) or the default ``SimpleCache``.
+
+Keys are namespaced (``<namespace>:<key>``) so unrelated features can share the
+backend without colliding, and hit/miss counters are kept for both tiers.
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Hashable, Optional
+
 from flask_caching import Cache
+from flask_caching.backends.rediscache import RedisCache
+
+
+_MISSING = object()
+
+
+class FakeRedisCache(RedisCache):
+    """A Redis cache backed by an in-memory fakeredis server, for tests and local development."""
+
+    @classmethod
+    def factory(cls, _app, config, args, kwargs):
+        """Create the backend; called by Flask-Caching when CACHE_TYPE points at this class."""
+        import fakeredis  # pylint: disable=import-outside-toplevel
+
+        kwargs.update({'key_prefix': config['CACHE_KEY_PREFIX']})
+        kwargs['host'] = fakeredis.FakeStrictRedis()
+        return cls(*args, **kwargs)
+
+
+@dataclass
+class CacheStats:
+    """Hit and miss counters for the tiered cache."""
+
+    local_hits: int = 0
+    shared_hits: int = 0
+    misses: int = 0
+    sets: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Return the fraction of lookups served by either tier."""
+        lookups = self.local_hits + self.shared_hits + self.misses
+        return (self.local_hits + self.shared_hits) / lookups if lookups else 0.0
+
+    def as_dict(self) -> dict:
+        """Return the counters as a plain dict."""
+        return {**asdict(self), 'hit_ratio': self.hit_ratio}
+
+    def reset(self):
+        """Reset all counters to zero."""
+        self.local_hits = self.shared_hits = self.misses = self.sets = self.evictions = 0
+
+
+class LocalCache:
+    """A thread-safe, size-bounded LRU cache whose entries expire after a TTL."""
+
+    def __init__(self, max_size: int = 1024, ttl: float = 30):
+        """Initialize the cache."""
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default=None):
+        """Return the value for key, or default if it is absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> int:
+        """Store a value, returning the number of entries evicted to make room for it."""
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        evicted = 0
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                evicted += 1
+        return evicted
+
+    def delete(self, key: Hashable):
+        """Remove a key if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        """Return the number of entries currently held, including expired ones not yet purged."""
+        return len(self._entries)
+
+
+class TieredCache:
+    """Two-tier cache: an in-process LRU in front of a shared Flask-Caching backend."""
+
+    def __init__(self):
+        """Initialize the cache. Call init_app before use."""
+        self.shared = Cache()
+        self.local = LocalCache()
+        self.stats = CacheStats()
+        self.default_timeout = 300
+
+    def init_app(self, app):
+        """Configure both tiers from the CACHE_CONFIG app setting."""
+        cache_config = app.config.get('CACHE_CONFIG', {})
+        self.default_timeout = cache_config.get('DEFAULT_TIMEOUT', self.default_timeout)
+        self.local = LocalCache(
+            max_size=cache_config.get('LOCAL_MAX_SIZE', 1024),
+            ttl=cache_config.get('LOCAL_TTL', 30),
+        )
+        self.stats.reset()
+        self.shared.init_app(app, config={
+            'CACHE_TYPE': cache_config.get('TYPE', 'SimpleCache'),
+            'CACHE_REDIS_URL': cache_config.get('REDIS_URL'),
+            'CACHE_KEY_PREFIX': cache_config.get('KEY_PREFIX', 'dep:'),
+            'CACHE_DEFAULT_TIMEOUT': self.default_timeout,
+        })
+
+    @staticmethod
+    def make_key(key: str, namespace: Optional[str] = None) -> str:
+        """Return the fully qualified key for a namespace."""
+        return f'{namespace}:{key}' if namespace else key
+
+    def get(self, key: str, namespace: Optional[str] = None, default=None):
+        """Return a cached value, checking the local tier before the shared tier."""
+        full_key = self.make_key(key, namespace)
+        value = self.local.get(full_key, _MISSING)
+        if value is not _MISSING:
+            self.stats.local_hits += 1
+            return value
+        value = self.shared.get(full_key)
+        if value is None:
+            self.stats.misses += 1
+            return default
+        self.stats.shared_hits += 1
+        self.stats.evictions += self.local.set(full_key, value)
+        return value
+
+    def set(self, key: str, value: Any, timeout: Optional[int] = None, namespace: Optional[str] = None):
+        """Store a value in both tiers."""
+        full_key = self.make_key(key, namespace)
+        timeout = self.default_timeout if timeout is None else timeout
+        self.shared.set(full_key, value, timeout=timeout)
+        self.stats.evictions += self.local.set(full_key, value, ttl=timeout or None)
+        self.stats.sets += 1
+
+    def delete(self, key: str, namespace: Optional[str] = None):
+        """Remove a value from both tiers."""
+        full_key = self.make_key(key, namespace)
+        self.local.delete(full_key)
+        self.shared.delete(full_key)
+
+    def clear(self):
+        """Remove every entry from both tiers."""
+        self.local.clear()
+        self.shared.clear()
+
+    def namespace(self, name: str) -> 'CacheNamespace':
+        """Return a view of the cache whose keys are scoped to the given namespace."""
+        return CacheNamespace(self, name)
+
+
+class CacheNamespace:
+    """A view of a TieredCache scoped to a single key namespace."""
+
+    def __init__(self, tiered_cache: TieredCache, name: str):
+        """Initialize the namespace."""
+        self._cache = tiered_cache
+        self.name = name
+
+    def get(self, key: str, default=None):
+        """Return a cached value from this namespace."""
+        return self._cache.get(key, namespace=self.name, default=default)
+
+    def set(self, key: str, value: Any, timeout: Optional[int] = None):
+        """Store a value in this namespace."""
+        self._cache.set(key, value, timeout=timeout, namespace=self.name)
+
+    def delete(self, key: str):
+        """Remove a value from this namespace."""
+        self._cache.delete(key, namespace=self.name)
 
 
 # lower case name as used by convention in most Flask apps
-cache = Cache(config={'CACHE_TYPE': 'simple'})  # pylint: disable=invalid-name
+cache = TieredCache()  # pylint: disable=invalid-name
@@ -21,6 +21,8 @@ class ContentType(Enum):
     JSON = 'application/json'
     FORM_URL_ENCODED = 'application/x-www-form-urlencoded'
     PDF = 'application/pdf'
+    CSV = 'text/csv'
+    XLSX = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
 
 
 class AuthHeaderType(Enum):
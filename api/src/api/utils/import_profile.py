@@ -0,0 +1,95 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Profiling of what the application costs to start.
+
+Every server process imports the application and creates it before serving its
+first request. The profile is taken in a fresh interpreter, with python's
+-X importtime, so that nothing imported by the caller is counted or missed.
+"""
+import json
+import os
+import subprocess  # nosec
+import sys
+from typing import List, NamedTuple, Set
+
+
+# Heavy dependencies only some rarely used endpoints need, which must be imported on first use
+DEFERRED_MODULES = ('geopandas', 'pandas', 'shapely', 'pyproj', 'anytree', 'slugify', 'xlsxwriter')
+
+_STARTUP_SCRIPT = """
+import json, resource, sys, time
+started = time.perf_counter()
+from api import create_app
+create_app(sys.argv[1])
+sys.stdout.write('\\n' + json.dumps({
+    'seconds': time.perf_counter() - started,
+    # in kilobytes on Linux, where the application runs
+    'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'modules': sorted(sys.modules),
+}))
+"""
+
+
+class ImportTiming(NamedTuple):
+    """The time taken to import a module, in microseconds, alone and with the modules it imports."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+class StartupProfile(NamedTuple):
+    """The time and memory taken to import and create the application."""
+
+    seconds: float
+    max_rss_mb: float
+    imports: List[ImportTiming]
+    modules: Set[str]
+
+    def slowest_imports(self, limit: int) -> List[ImportTiming]:
+        """Return the top level imports which took the longest, with what they imported."""
+        top_level = [timing for timing in self.imports if '.' not in timing.module]
+        return sorted(top_level, key=lambda timing: timing.cumulative_us, reverse=True)[:limit]
+
+    def deferred_modules_imported(self) -> List[str]:
+        """Return the deferred modules which were imported anyway."""
+        return [module for module in DEFERRED_MODULES if module in self.modules]
+
+
+def profile_startup(run_mode: str) -> StartupProfile:
+    """Import and create the application in a new interpreter, and return what it took."""
+    env = {**os.environ, 'FLASK_ENV': run_mode, 'PYTHONPATH': os.pathsep.join(sys.path)}
+    result = subprocess.run(  # nosec
+        [sys.executable, '-X', 'importtime', '-c', _STARTUP_SCRIPT, run_mode],
+        capture_output=True, text=True, env=env, check=True)
+    # the report is the last line, after anything printed while creating the application
+    report = json.loads(result.stdout.splitlines()[-1])
+    return StartupProfile(
+        seconds=report['seconds'],
+        max_rss_mb=report['max_rss_kb'] / 1024,
+        imports=_parse_importtime(result.stderr),
+        modules=set(report['modules']),
+    )
+
+
+def _parse_importtime(output: str) -> List[ImportTiming]:
+    # lines look like "import time:       412 |       1285 |   flask.app"
+    timings = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        if self_us.strip().isdigit():
+            timings.append(ImportTiming(module.strip(), int(self_us), int(cumulative_us)))
+    return timings
@@ -0,0 +1,144 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Keyset (cursor) pagination for list queries.
+
+Rather than skipping OFFSET rows, each page seeks past the (sort key, id) of the
+last row of the previous page, so every page costs the same however deep it is.
+Only sort columns backed by a (column, id) index are accepted. The cursor is an
+opaque token that encodes the sort and the position of the last row.
+
+Totals are counted once per distinct query and cached for a short time, rather
+than being recounted for every page.
+"""
+import base64
+import binascii
+import hashlib
+import json
+from datetime import datetime
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
+
+from flask import current_app
+from sqlalchemy import DateTime, and_, or_, tuple_
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Query
+from sqlalchemy.orm.attributes import InstrumentedAttribute
+from sqlalchemy.sql.elements import Label
+
+from api.exceptions.business_exception import BusinessException
+from api.utils.cache import cache
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from api.models.pagination_options import PaginationOptions
+
+
+count_cache = cache.namespace('pagination_count')
+
+
+def encode_cursor(sort_key: str, sort_order: str, value, row_id: int) -> str:
+    """Return an opaque cursor positioned after the given row."""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps([sort_key, sort_order, value, row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, sort_key: str, sort_order: str):
+    """Return the (sort value, id) a cursor is positioned after."""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        cursor_sort_key, cursor_sort_order, value, row_id = json.loads(payload)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as err:
+        raise BusinessException('Invalid pagination cursor.', HTTPStatus.BAD_REQUEST) from err
+    if (cursor_sort_key, cursor_sort_order) != (sort_key, sort_order) or not isinstance(row_id, int):
+        raise BusinessException('The pagination cursor does not match the requested sort.', HTTPStatus.BAD_REQUEST)
+    return value, row_id
+
+
+def paginate_by_cursor(query: Query, pagination_options: 'PaginationOptions',
+                       sort_columns: Dict[str, Union[InstrumentedAttribute, Label]],
+                       id_column: InstrumentedAttribute) -> Tuple[List, int]:
+    """Return a page of the query and its total, seeking past pagination_options.cursor.
+
+    sort_columns maps the accepted sort keys to columns with a supporting (column, id) index,
+    or to labelled expressions the query selects along with its entity.
+    The cursor for the following page, if any, is recorded in pagination_options.next_cursor.
+    """
+    sort_key, sort_order = pagination_options.sort_key, pagination_options.sort_order
+    sort_column = sort_columns.get(sort_key)
+    if sort_column is None:
+        raise BusinessException(
+            f'Sorting by {sort_key} is not supported with cursor pagination. '
+            f'Use one of: {", ".join(sorted(sort_columns))}.', HTTPStatus.BAD_REQUEST)
+    descending = sort_order == 'desc'
+
+    total = _cached_count(query)
+
+    if pagination_options.cursor:
+        value, row_id = decode_cursor(pagination_options.cursor, sort_key, sort_order)
+        if value is not None and isinstance(sort_column.type, DateTime):
+            value = datetime.fromisoformat(value)
+        query = query.filter(_seek(sort_column, id_column, value, row_id, descending))
+
+    # PostgreSQL sorts nulls last ascending and first descending, which matches the index in both directions
+    if descending:
+        query = query.order_by(None).order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(None).order_by(sort_column.asc(), id_column.asc())
+
+    items = query.limit(pagination_options.size + 1).all()
+    pagination_options.next_cursor = None
+    if len(items) > pagination_options.size:
+        items = items[:pagination_options.size]
+        last = items[-1]
+        pagination_options.next_cursor = encode_cursor(
+            sort_key, sort_order, _row_value(last, sort_column), _row_value(last, id_column))
+
+    return items, total
+
+
+def _seek(sort_column, id_column, value, row_id, descending):
+    """Return the criterion selecting the rows after (value, row_id) in the sort order."""
+    if descending:
+        if value is None:
+            return or_(sort_column.isnot(None), and_(sort_column.is_(None), id_column < row_id))
+        return tuple_(sort_column, id_column) < tuple_(value, row_id)
+    if value is None:
+        return and_(sort_column.is_(None), id_column > row_id)
+    return or_(tuple_(sort_column, id_column) > tuple_(value, row_id), sort_column.is_(None))
+
+
+def _row_value(row, column):
+    """Return the value of the column in a result row, which leads with its entity when columns were added."""
+    if isinstance(row, Row) and not hasattr(row, column.key):
+        row = row[0]
+    return getattr(row, column.key)
+
+
+def _cached_count(query: Query) -> int:
+    """Return the number of rows of the query, cached by its SQL and parameters."""
+    timeout = current_app.config.get('PAGINATION_COUNT_CACHE_TIMEOUT', 0)
+    count_query = query.order_by(None)
+    if timeout <= 0:
+        return count_query.count()
+
+    compiled = count_query.statement.compile()
+    params = sorted((key, repr(value)) for key, value in compiled.params.items())
+    key = hashlib.sha1(f'{compiled}{params}'.encode()).hexdigest()
+    total: Optional[int] = count_cache.get(key)
+    if total is None:
+        total = count_query.count()
+        count_cache.set(key, total, timeout=timeout)
+    return total
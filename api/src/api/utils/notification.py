@@ -2,8 +2,14 @@
 
 import json
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Iterable, List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from flask import current_app
 from api.models.tenant import Tenant
@@ -11,6 +17,49 @@ from api.services.rest_service import RestService
 from api.constants.email_verification import INTERNAL_EMAIL_DOMAIN
 
 
+class EmailDeliveryStatus:  # pylint: disable=too-few-public-methods
+    """Outcome of a single recipient in a batch send."""
+
+    SENT = 'sent'
+    FAILED = 'failed'
+    SKIPPED = 'skipped'
+
+
+@dataclass
+class EmailResult:
+    """Delivery result for a single recipient."""
+
+    email: str
+    status: str
+    attempts: int = 0
+    error: Optional[str] = None
+
+
+@dataclass
+class EmailBatchReport:
+    """Per-recipient results of a batch send."""
+
+    results: List[EmailResult] = field(default_factory=list)
+
+    def _with_status(self, status) -> List[EmailResult]:
+        return [result for result in self.results if result.status == status]
+
+    @property
+    def sent(self) -> List[EmailResult]:
+        """Return the recipients that were sent successfully."""
+        return self._with_status(EmailDeliveryStatus.SENT)
+
+    @property
+    def failed(self) -> List[EmailResult]:
+        """Return the recipients that could not be sent after all retries."""
+        return self._with_status(EmailDeliveryStatus.FAILED)
+
+    @property
+    def skipped(self) -> List[EmailResult]:
+        """Return the recipients that were not attempted, e.g. invalid or disallowed addresses."""
+        return self._with_status(EmailDeliveryStatus.SKIPPED)
+
+
 def get_tenant_site_url(tenant_id, path=''):
     """Get the tenant specific site url (domain / tenant / path)."""
     is_single_tenant_environment = current_app.config.get('IS_SINGLE_TENANT_ENVIRONMENT', False)
@@ -39,24 +88,162 @@ def send_email(subject, email, html_body, args, template_id):
     send_email_endpoint = current_app.config.get('NOTIFICATIONS_EMAIL_ENDPOINT')
     if not send_email_endpoint:
         raise ValueError('NOTIFICATIONS_EMAIL_ENDPOINT is not configured.')
-    payload = {
-        'bodyType': 'html',
-        'body': html_body,
-        'from': sender,
-        'subject': subject,
-        'to': email.split(),
-        'args': args,
-        'template_id': template_id,
-    }
+    payload = _build_email_payload({'subject': subject, 'email': email, 'html_body': html_body,
+                                    'args': args, 'template_id': template_id}, sender)
     response = requests.post(send_email_endpoint,
-                             headers={
-                                 'Content-Type': 'application/json',
-                                 'Authorization': f'Bearer {service_account_token}'},
+                             headers=_email_headers(service_account_token),
                              data=json.dumps(payload),
                              timeout=30)
     response.raise_for_status()
 
 
+def send_email_batch(messages: Iterable[dict]) -> EmailBatchReport:
+    """Send many emails and report the outcome for each recipient.
+
+    Each message is a dict with the same keys as the send_email arguments
+    (subject, email, html_body, args, template_id). Messages are posted in
+    batches of BATCH_SIZE to the batch endpoint of the notifications API, which
+    reports the outcome of every email, over a pooled HTTP session by a bounded
+    worker pool. Failures to connect, throttling and server errors are retried
+    with exponential backoff, as are the emails the notifications API reports as
+    failed. Other failures, e.g. a read timeout, may come after the batch was
+    delivered, so its emails are reported failed rather than sent twice. A
+    failed recipient never aborts the rest of the batch.
+    """
+    config = current_app.config
+    batch_config = config['EMAIL_BATCH_CONFIG']
+    batch_endpoint = config.get('NOTIFICATIONS_EMAIL_BATCH_ENDPOINT')
+    if not batch_endpoint:
+        raise ValueError('NOTIFICATIONS_EMAIL_BATCH_ENDPOINT is not configured.')
+    sender = config['EMAIL_TEMPLATES']['FROM_ADDRESS']
+
+    report = EmailBatchReport()
+    payloads = _build_email_payloads(messages, sender, report)
+    if not payloads:
+        return report
+
+    batch_size = batch_config['BATCH_SIZE']
+    batches = [payloads[start:start + batch_size] for start in range(0, len(payloads), batch_size)]
+    report.results.extend(_deliver_batches(batch_endpoint, batches, batch_config))
+
+    current_app.logger.info('Email batch finished: %s sent, %s failed, %s skipped',
+                            len(report.sent), len(report.failed), len(report.skipped))
+    return report
+
+
+def _deliver_batches(endpoint: str, batches: List[List[dict]], batch_config: dict) -> List[EmailResult]:
+    """Post the batches concurrently over one pooled session, returning the results of every email."""
+    app = current_app._get_current_object()  # pylint: disable=protected-access
+    max_workers = max(1, min(batch_config['MAX_WORKERS'], len(batches)))
+
+    with requests.Session() as session:
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+        def deliver(batch) -> List[EmailResult]:
+            # worker threads need their own app context for config and token lookups
+            with app.app_context():
+                return _send_batch_with_retries(session, endpoint, batch,
+                                                batch_config['MAX_RETRIES'], batch_config['BACKOFF_SECONDS'])
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return [result for results in executor.map(deliver, batches) for result in results]
+
+
+def _send_batch_with_retries(session: requests.Session, endpoint: str, payloads: List[dict],
+                             max_retries: int, backoff_seconds: float) -> List[EmailResult]:
+    """Post a batch of emails in one request, retrying transient failures with exponential backoff.
+
+    Only the emails not sent yet are posted again, and only when the batch is
+    known not to have been delivered: the connection could not be made, or the
+    notifications API throttled or failed the request.
+    """
+    results = [EmailResult(' '.join(payload['to']), EmailDeliveryStatus.FAILED) for payload in payloads]
+    pending = list(range(len(payloads)))
+    attempt = 0
+    while pending and attempt <= max_retries:
+        if attempt:
+            time.sleep(backoff_seconds * 2 ** (attempt - 1))
+        attempt += 1
+        for index in pending:
+            results[index].attempts += 1
+        try:
+            response = session.post(endpoint,
+                                    headers=_email_headers(RestService.get_service_account_token()),
+                                    data=json.dumps({'emails': [payloads[index] for index in pending]}),
+                                    timeout=60)
+            response.raise_for_status()
+            outcomes = response.json()['results']
+        except (requests.RequestException, ValueError, KeyError) as exc:
+            for index in pending:
+                results[index].error = str(exc)
+            if _is_undelivered(exc):
+                continue
+            break
+
+        # the outcomes are in the order of the emails posted
+        still_pending = []
+        for index, outcome in zip(pending, outcomes):
+            if outcome.get('status') == EmailDeliveryStatus.SENT:
+                results[index].status = EmailDeliveryStatus.SENT
+                results[index].error = None
+            else:
+                results[index].error = outcome.get('error')
+                still_pending.append(index)
+        pending = still_pending
+
+    for index in pending:
+        current_app.logger.error('Sending email to %s failed after %s attempts: %s',
+                                 results[index].email, results[index].attempts, results[index].error)
+    return results
+
+
+def _is_undelivered(exc: Exception) -> bool:
+    """Return whether the batch is known not to have been delivered, so posting it again sends no email twice."""
+    if isinstance(exc, requests.HTTPError):
+        status_code = exc.response.status_code if exc.response is not None else None
+        # any other client error means the request itself is bad; retrying will not help
+        return status_code is not None and (status_code == HTTPStatus.TOO_MANY_REQUESTS
+                                            or status_code >= HTTPStatus.INTERNAL_SERVER_ERROR)
+    # a read timeout or an unreadable response may come after the notifications API sent the emails
+    return isinstance(exc, (requests.ConnectionError, requests.ConnectTimeout))
+
+
+def _build_email_payloads(messages: Iterable[dict], sender: str, report: EmailBatchReport) -> List[dict]:
+    """Return the payloads of the messages to send, reporting the others as skipped."""
+    payloads = []
+    for message in messages:
+        email = message.get('email')
+        if not email or not is_valid_email(email):
+            report.results.append(EmailResult(email, EmailDeliveryStatus.SKIPPED, error='Invalid email address.'))
+        elif not is_allowed_email(email):
+            report.results.append(EmailResult(email, EmailDeliveryStatus.SKIPPED,
+                                              error='The email provided is not allowed in this environment.'))
+        else:
+            payloads.append(_build_email_payload(message, sender))
+    return payloads
+
+
+def _build_email_payload(message: dict, sender: str) -> dict:
+    return {
+        'bodyType': 'html',
+        'body': message.get('html_body'),
+        'from': sender,
+        'subject': message.get('subject'),
+        'to': message['email'].split(),
+        'args': message.get('args'),
+        'template_id': message.get('template_id'),
+    }
+
+
+def _email_headers(service_account_token) -> dict:
+    return {
+        'Content-Type': 'application/json',
+        'Authorization': f'Bearer {service_account_token}'
+    }
+
+
 def is_valid_email(email: str):
     """Return if the email is valid or not."""
     if email:
@@ -0,0 +1,110 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Conversion of zipped shapefiles to geojson.
+
+These functions run in the worker processes of the shapefile service, so they
+only depend on their arguments and never on the application or its context.
+Each conversion works in its own workspace directory, which the caller owns.
+"""
+import os
+import zipfile
+from typing import Dict, NamedTuple
+
+from api.constants.map_detail import MapDetail
+
+
+SHAPEFILE_EXTENSION = '.shp'
+CHUNK_SIZE = 64 * 1024
+
+
+class ShapefileLimits(NamedTuple):
+    """The limits a shapefile upload must stay within, and how much to simplify its geometries."""
+
+    max_uncompressed_size: int
+    max_members: int
+    max_features: int
+    # simplification tolerance of each reduced level of detail, in degrees
+    tolerances: Dict[str, float]
+
+
+class ShapefileError(ValueError):
+    """The upload is not a valid shapefile."""
+
+
+class ShapefileLimitError(ShapefileError):
+    """The upload exceeds one of the shapefile limits."""
+
+
+def convert_shapefile(zip_path: str, workspace: str, limits: ShapefileLimits) -> Dict[str, str]:
+    """Return the geojson of the zipped shapefile at every level of detail, keyed on the level."""
+    # geopandas pulls in pandas, shapely and pyproj, so it is only imported by the worker processes
+    import geopandas as gpd  # pylint: disable=import-outside-toplevel
+
+    shapefile_path = unzip_shapefile(zip_path, workspace, limits)
+    # read one feature past the limit, which is enough to tell it is exceeded
+    gdf = gpd.read_file(shapefile_path, rows=limits.max_features + 1)
+    if len(gdf) > limits.max_features:
+        raise ShapefileLimitError(f'Shapefiles may contain at most {limits.max_features} features.')
+
+    # Check if the GeoDataFrame's CRS is not EPSG:4326, if so transform it to EPSG:4326
+    if gdf.crs and gdf.crs.to_epsg() != 4326:
+        gdf = gdf.to_crs(epsg=4326)
+
+    geojson = {MapDetail.FULL.value: gdf.to_json()}
+    for level, tolerance in limits.tolerances.items():
+        simplified = gdf.copy()
+        simplified.geometry = gdf.simplify(tolerance, preserve_topology=True)
+        geojson[level] = simplified.to_json()
+    return geojson
+
+
+def unzip_shapefile(zip_path: str, workspace: str, limits: ShapefileLimits) -> str:
+    """Extract the zipped shapefile into the workspace and return the path of its .shp file.
+
+    Members are streamed to disk in chunks, counting the bytes actually written rather than
+    trusting the sizes the archive declares, and may not be written outside of the workspace.
+    """
+    workspace = os.path.realpath(workspace)
+    shapefile_path = None
+    remaining = limits.max_uncompressed_size
+    if not zipfile.is_zipfile(zip_path):
+        raise ShapefileError('Shapefiles must be uploaded as a zip archive.')
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        members = [info for info in zip_ref.infolist() if not info.is_dir() and 'MACOSX' not in info.filename]
+        if len(members) > limits.max_members:
+            raise ShapefileLimitError(f'Shapefile archives may contain at most {limits.max_members} files.')
+
+        for info in members:
+            target = os.path.realpath(os.path.join(workspace, info.filename))
+            if not target.startswith(workspace + os.sep):
+                raise ShapefileError(f'Invalid file name {info.filename} in shapefile archive.')
+            if info.file_size > remaining:
+                raise _size_limit_error(limits)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with zip_ref.open(info) as source, open(target, 'wb') as destination:
+                while chunk := source.read(CHUNK_SIZE):
+                    remaining -= len(chunk)
+                    if remaining < 0:
+                        raise _size_limit_error(limits)
+                    destination.write(chunk)
+            if target.endswith(SHAPEFILE_EXTENSION):
+                shapefile_path = target
+
+    if not shapefile_path:
+        raise ShapefileError('No Valid shapefile found.')
+    return shapefile_path
+
+
+def _size_limit_error(limits: ShapefileLimits) -> ShapefileLimitError:
+    return ShapefileLimitError(f'Shapefiles may be at most {limits.max_uncompressed_size} bytes uncompressed.')
@@ -0,0 +1,98 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Streaming spreadsheet writers.
+
+Rows are consumed lazily and written out in chunks, so an export of any size
+is served with flat memory. CSV chunks are emitted as soon as they fill; XLSX
+workbooks are assembled on disk in constant-memory mode and then streamed.
+"""
+import csv
+import io
+import os
+import tempfile
+from http import HTTPStatus
+from typing import Iterable, Iterator, NamedTuple, Sequence
+
+from api.exceptions.business_exception import BusinessException
+from api.utils.enums import ContentType
+
+
+# size, in characters or bytes, of the chunks sent to the client
+CHUNK_SIZE = 64 * 1024
+
+
+class SpreadsheetFormat:  # pylint: disable=too-few-public-methods
+    """Formats the spreadsheet writers can produce."""
+
+    CSV = 'csv'
+    XLSX = 'xlsx'
+
+    ALL = (CSV, XLSX)
+
+
+class SpreadsheetExport(NamedTuple):
+    """A spreadsheet ready to be streamed in a response."""
+
+    chunks: Iterator
+    mimetype: str
+    filename: str
+
+    @property
+    def headers(self) -> dict:
+        """Return the response headers for the download."""
+        return {'content-disposition': f'attachment; filename="{self.filename}"'}
+
+
+def spreadsheet_export(name: str, file_format: str, header: Sequence, rows: Iterable[Sequence]) -> SpreadsheetExport:
+    """Return an export of the rows, which are only read once the export is streamed."""
+    if file_format == SpreadsheetFormat.CSV:
+        return SpreadsheetExport(stream_csv(header, rows), ContentType.CSV.value, f'{name}.csv')
+    if file_format == SpreadsheetFormat.XLSX:
+        return SpreadsheetExport(stream_xlsx(header, rows), ContentType.XLSX.value, f'{name}.xlsx')
+    raise BusinessException(
+        f'Unsupported export format {file_format}; use one of {", ".join(SpreadsheetFormat.ALL)}.',
+        HTTPStatus.BAD_REQUEST)
+
+
+def stream_csv(header: Sequence, rows: Iterable[Sequence], chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Yield the rows as CSV, in chunks of about chunk_size characters."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= chunk_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def stream_xlsx(header: Sequence, rows: Iterable[Sequence], chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield the rows as an XLSX workbook, written row by row to a temporary file."""
+    import xlsxwriter  # pylint: disable=import-outside-toplevel
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'export.xlsx')
+        workbook = xlsxwriter.Workbook(path, {'constant_memory': True, 'tmpdir': directory})
+        worksheet = workbook.add_worksheet()
+        bold = workbook.add_format({'bold': True})
+        worksheet.write_row(0, 0, header, bold)
+        for row_number, row in enumerate(rows, start=1):
+            worksheet.write_row(row_number, 0, row)
+        workbook.close()
+
+        with open(path, 'rb') as workbook_file:
+            while chunk := workbook_file.read(chunk_size):
+                yield chunk
@@ -0,0 +1,185 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Instrumentation of the SQL statements issued by the application.
+
+Statements are counted and timed through SQLAlchemy engine events, into every
+tracker active on the current thread: one per request (see init_app), and any
+opened with track_queries, e.g. by jobs or tests. A statement issued many times
+within one request, only with different parameters, is the mark of an N+1
+query pattern and is logged.
+
+The totals of every request are kept per endpoint, in the memory of the server
+process, and rendered in the Prometheus text format by the ops resource.
+"""
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+
+from flask import Flask, current_app, g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryStats:
+    """The SQL statements issued within a request or a tracked block of code."""
+
+    def __init__(self):
+        """Initialize the stats."""
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = Counter()
+
+    def record(self, statement: str, seconds: float):
+        """Record a statement and the time it took."""
+        self.count += 1
+        self.seconds += seconds
+        self.statements[statement] += 1
+
+    def repeated_statements(self, threshold: int) -> List[Tuple[str, int]]:
+        """Return the statements issued at least threshold times, with how many times."""
+        if threshold <= 0:
+            return []
+        return [(statement, count) for statement, count in self.statements.most_common() if count >= threshold]
+
+
+class _EndpointTotals:  # pylint: disable=too-few-public-methods
+
+    def __init__(self):
+        self.requests = 0
+        self.queries = 0
+        self.seconds = 0.0
+        self.max_queries = 0
+        self.repeated_requests = 0
+
+
+class SqlMetrics:
+    """The SQL statements issued by the requests of each endpoint, since the server process started."""
+
+    def __init__(self):
+        """Initialize the metrics."""
+        self._lock = threading.Lock()
+        self._totals: Dict[Tuple[str, str], _EndpointTotals] = {}
+
+    def observe(self, method: str, endpoint: str, stats: QueryStats, repeated: bool):
+        """Add the statements of a request to the totals of its endpoint."""
+        with self._lock:
+            totals = self._totals.setdefault((method, endpoint), _EndpointTotals())
+            totals.requests += 1
+            totals.queries += stats.count
+            totals.seconds += stats.seconds
+            totals.max_queries = max(totals.max_queries, stats.count)
+            totals.repeated_requests += int(repeated)
+
+    def render(self, namespace: str) -> str:
+        """Return the metrics in the Prometheus text exposition format."""
+        families = (
+            ('requests_total', 'counter', 'Requests served.', lambda totals: totals.requests),
+            ('sql_queries_total', 'counter', 'SQL statements issued.', lambda totals: totals.queries),
+            ('sql_seconds_total', 'counter', 'Time spent executing SQL statements.', lambda totals: totals.seconds),
+            ('sql_queries_per_request_max', 'gauge', 'Most SQL statements issued by one request.',
+             lambda totals: totals.max_queries),
+            ('sql_repeated_statement_requests_total', 'counter',
+             'Requests which issued the same SQL statement repeatedly, e.g. N+1 queries.',
+             lambda totals: totals.repeated_requests),
+        )
+        with self._lock:
+            totals_by_endpoint = sorted(self._totals.items())
+            lines = []
+            for name, metric_type, description, value in families:
+                lines.append(f'# HELP {namespace}_{name} {description}')
+                lines.append(f'# TYPE {namespace}_{name} {metric_type}')
+                for (method, endpoint), totals in totals_by_endpoint:
+                    lines.append(f'{namespace}_{name}{{method="{method}",endpoint="{endpoint}"}} {value(totals)}')
+        return '\n'.join(lines) + '\n'
+
+
+# lower case name as used by convention for module level singletons
+metrics = SqlMetrics()  # pylint: disable=invalid-name
+
+_trackers = threading.local()  # pylint: disable=invalid-name
+_listening_lock = threading.Lock()
+_listening = False  # pylint: disable=invalid-name
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Track the SQL statements issued on this thread within the block."""
+    _listen()
+    stats = QueryStats()
+    active = _active_trackers()
+    active.append(stats)
+    try:
+        yield stats
+    finally:
+        active.remove(stats)
+
+
+def init_app(app: Flask):
+    """Track the SQL statements of every request of the app, and keep their totals per endpoint."""
+    _listen()
+
+    @app.before_request
+    def start_tracking_queries():
+        g.query_stats = QueryStats()
+        _active_trackers().append(g.query_stats)
+
+    @app.teardown_request
+    def finish_tracking_queries(_exception=None):
+        stats = g.pop('query_stats', None)
+        if stats is None:
+            return
+        _active_trackers().remove(stats)
+        # the rule rather than the path, so that every engagement is counted under the same endpoint
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        repeated = stats.repeated_statements(current_app.config['SQL_REPEATED_STATEMENT_THRESHOLD'])
+        for statement, count in repeated:
+            current_app.logger.warning('%s %s issued the same statement %s times: %s',
+                                       request.method, endpoint, count, statement)
+        metrics.observe(request.method, endpoint, stats, bool(repeated))
+
+
+def _active_trackers() -> List[QueryStats]:
+    if not hasattr(_trackers, 'active'):
+        _trackers.active = []
+    return _trackers.active
+
+
+def _listen():
+    global _listening  # pylint: disable=global-statement
+    with _listening_lock:
+        if not _listening:
+            # every engine, including those created after this point
+            event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+            event.listen(Engine, 'handle_error', _handle_error)
+            _listening = True
+
+
+def _before_cursor_execute(conn, *_):
+    conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, _cursor, statement, *_):
+    seconds = time.perf_counter() - conn.info['query_started'].pop()
+    for stats in _active_trackers():
+        stats.record(statement, seconds)
+
+
+def _handle_error(exception_context):
+    # failed statements are not tracked, but their start must not be left behind
+    conn = exception_context.connection
+    if conn is not None and conn.info.get('query_started'):
+        conn.info['query_started'].pop()
@@ -0,0 +1,138 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Process-wide cache for OAuth 2.0 client credentials tokens.
+
+Tokens are keyed by (client id, issuer or token url) and reused until shortly
+before they expire. Once a token enters its refresh window it is still handed
+out while a single background thread fetches its replacement, so callers only
+ever block on a token fetch when no valid token exists at all.
+"""
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+import requests
+
+from api.utils.enums import ContentType
+
+
+logger = logging.getLogger(__name__)
+
+TokenKey = Tuple[str, str]
+# A fetcher performs the token request and returns the decoded token response.
+TokenFetcher = Callable[[], dict]
+
+# Used when the token endpoint does not report expires_in
+DEFAULT_EXPIRES_IN = 300
+# Refresh this many seconds before expiry, capped at half of the token lifetime
+DEFAULT_REFRESH_MARGIN = 60
+# Timeout, in seconds, for token endpoint requests
+TOKEN_REQUEST_TIMEOUT = 30
+
+
+class _CachedToken:  # pylint: disable=too-few-public-methods
+    """An access token and the monotonic times at which to refresh and discard it."""
+
+    def __init__(self, access_token: str, expires_in: int, refresh_margin: int):
+        now = time.monotonic()
+        self.access_token = access_token
+        self.expires_at = now + expires_in
+        self.refresh_at = now + max(expires_in - min(refresh_margin, expires_in / 2), 0)
+
+
+class TokenManager:
+    """Caches client credentials tokens and refreshes them ahead of expiry."""
+
+    def __init__(self, refresh_margin: int = DEFAULT_REFRESH_MARGIN):
+        """Initialize the manager."""
+        self.refresh_margin = refresh_margin
+        self._tokens: Dict[TokenKey, _CachedToken] = {}
+        self._locks: Dict[TokenKey, threading.Lock] = {}
+        self._registry_lock = threading.Lock()
+
+    def get_token(self, key: TokenKey, fetch: TokenFetcher) -> str:
+        """Return a valid access token for the key, fetching one only if needed.
+
+        The fetcher must not depend on the Flask app context, since it may run
+        on a background thread.
+        """
+        entry = self._tokens.get(key)
+        now = time.monotonic()
+        if entry and now < entry.refresh_at:
+            return entry.access_token
+        if entry and now < entry.expires_at:
+            self._refresh_in_background(key, fetch)
+            return entry.access_token
+
+        with self._lock_for(key):
+            # another thread may have fetched the token while we waited for the lock
+            entry = self._tokens.get(key)
+            if entry and time.monotonic() < entry.expires_at:
+                return entry.access_token
+            return self._fetch(key, fetch).access_token
+
+    def invalidate(self, key: Optional[TokenKey] = None):
+        """Discard the cached token for a key, or every cached token."""
+        if key is None:
+            self._tokens.clear()
+        else:
+            self._tokens.pop(key, None)
+
+    def _lock_for(self, key: TokenKey) -> threading.Lock:
+        with self._registry_lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _fetch(self, key: TokenKey, fetch: TokenFetcher) -> _CachedToken:
+        token_response = fetch()
+        entry = _CachedToken(
+            token_response['access_token'],
+            int(token_response.get('expires_in') or DEFAULT_EXPIRES_IN),
+            self.refresh_margin,
+        )
+        self._tokens[key] = entry
+        return entry
+
+    def _refresh_in_background(self, key: TokenKey, fetch: TokenFetcher):
+        lock = self._lock_for(key)
+        if not lock.acquire(blocking=False):
+            return  # a refresh is already in flight
+
+        def refresh():
+            try:
+                self._fetch(key, fetch)
+            except Exception as exc:  # NOQA # pylint:disable=broad-except
+                # keep serving the current token; the next caller past expiry fetches synchronously
+                logger.warning('Background token refresh failed for client %s: %s', key[0], exc)
+            finally:
+                lock.release()
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+
+def client_credentials_fetcher(token_url: str, client_id: str, client_secret: str,
+                               timeout: int = TOKEN_REQUEST_TIMEOUT) -> TokenFetcher:
+    """Return a fetcher that requests a token with the client credentials grant."""
+    def fetch() -> dict:
+        response = requests.post(token_url, auth=(client_id, client_secret), headers={
+            'Content-Type': ContentType.FORM_URL_ENCODED.value}, data='grant_type=client_credentials',
+            timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    return fetch
+
+
+# lower case name as used by convention for module level singletons
+token_manager = TokenManager()  # pylint: disable=invalid-name
@@ -16,6 +16,9 @@
 
 Test-Suite to ensure that the /Comment endpoint is working as expected.
 """
+import csv
+import io
+import itertools
 import json
 from http import HTTPStatus
 from unittest.mock import MagicMock, patch
@@ -27,10 +30,11 @@ from api.constants.staff_note_type import StaffNoteType
 from api.services.comment_service import CommentService
 from api.utils import notification
 from api.utils.enums import ContentType
-from tests.utilities.factory_scenarios import TestJwtClaims
+from tests.utilities.factory_scenarios import TestJwtClaims, TestSubmissionInfo
 from tests.utilities.factory_utils import (
     factory_auth_header, factory_comment_model, factory_membership_model, factory_participant_model,
-    factory_staff_user_model, factory_submission_model, factory_survey_and_eng_model, set_global_tenant)
+    factory_staff_user_model, factory_submission_model, factory_survey_and_eng_model,
+    factory_survey_report_setting_model, set_global_tenant)
 
 
 fake = Faker()
@@ -182,43 +186,34 @@ def test_review_comment_review_note(client, jwt, session,
 
 def test_get_comments_spreadsheet_staff(mocker, client, jwt, session,
                                         setup_admin_user_and_claims):  # pylint:disable=unused-argument
-    """Assert that staff comments sheet can be fetched."""
+    """Assert that staff comments sheet is streamed without generating a document."""
     user, claims = setup_admin_user_and_claims
 
-    mock_post_generate_document_response = MagicMock()
-    mock_post_generate_document_response.content = b'mock data'
-    mock_post_generate_document_response.headers = {}
-    mock_post_generate_document_response.status_code = 200
-    mock_post_generate_document = mocker.patch(
-        'api.services.cdogs_api_service.CdogsApiService._post_generate_document',
-        return_value=mock_post_generate_document_response
-    )
-    mock_get_access_token = mocker.patch(
-        'api.services.cdogs_api_service.CdogsApiService._get_access_token',
-        return_value='token'
-    )
-
-    mock_upload_template_response = MagicMock()
-    mock_upload_template_response.headers = {
-        'X-Template-Hash': 'hash_code'
-    }
-    mock_upload_template_response.status_code = 200
-    mock_post_upload_template = mocker.patch(
-        'api.services.cdogs_api_service.CdogsApiService._post_upload_template',
-        return_value=mock_upload_template_response
-    )
+    mock_generate_document = mocker.patch(
+        'api.services.document_generation_service.DocumentGenerationService.generate_document')
 
     participant = factory_participant_model()
     survey, eng = factory_survey_and_eng_model()
     submission = factory_submission_model(survey.id, eng.id, participant.id)
-    factory_comment_model(survey.id, submission.id)
+    comment = factory_comment_model(survey.id, submission.id)
     headers = factory_auth_header(jwt=jwt, claims=claims)
     rv = client.get(f'/api/comments/survey/{survey.id}/sheet/staff',
                     headers=headers, content_type=ContentType.JSON.value)
     assert rv.status_code == HTTPStatus.OK
-    mock_post_generate_document.assert_called()
-    mock_get_access_token.assert_called()
-    mock_post_upload_template.assert_called()
+    assert rv.mimetype == ContentType.CSV.value
+    sheet = rv.get_data(as_text=True)
+    assert sheet.startswith('Comment No.,Submitted,')
+    assert comment.text in sheet
+    mock_generate_document.assert_not_called()
+
+    rv = client.get(f'/api/comments/survey/{survey.id}/sheet/staff?format=xlsx',
+                    headers=headers, content_type=ContentType.JSON.value)
+    assert rv.status_code == HTTPStatus.OK
+    assert rv.mimetype == ContentType.XLSX.value
+
+    rv = client.get(f'/api/comments/survey/{survey.id}/sheet/staff?format=pdf',
+                    headers=headers, content_type=ContentType.JSON.value)
+    assert rv.status_code == HTTPStatus.BAD_REQUEST
 
     with patch.object(CommentService, 'export_comments_to_spread_sheet_staff',
                       side_effect=ValueError('Test error')):
@@ -274,6 +269,56 @@ def test_get_comments_spreadsheet_proponent(mocker, client, jwt, session,
     assert rv.status_code == HTTPStatus.INTERNAL_SERVER_ERROR
 
 
+def test_get_comments_spreadsheet_proponent_csv(mocker, client, jwt, session,
+                                                setup_admin_user_and_claims):  # pylint:disable=unused-argument
+    """Assert that the proponent sheet is streamed as csv in the layout of the templated document."""
+    _, claims = setup_admin_user_and_claims
+    mock_generate_document = mocker.patch(
+        'api.services.document_generation_service.DocumentGenerationService.generate_document')
+
+    questions = {'firstquestion': 'First question', 'secondquestion': 'Second question'}
+    survey, eng = factory_survey_and_eng_model({'form_json': {'display': 'form', 'components': [
+        {'key': key, 'label': label, 'inputType': 'text'} for key, label in questions.items()]}})
+    for key, label in questions.items():
+        factory_survey_report_setting_model({'survey_id': survey.id, 'question_id': key, 'question_key': key,
+                                             'question_type': 'simpletextarea', 'question': label,
+                                             'display': True})
+    participant = factory_participant_model()
+    approved = {**TestSubmissionInfo.approved_submission, 'reviewed_by': 'reviewer'}
+    rejected = {**TestSubmissionInfo.rejected_submission, 'reviewed_by': 'reviewer'}
+    for submission_info, answers in (
+        (approved, {'firstquestion': 'Cherries', 'secondquestion': 'Bananas'}),
+        (approved, {'firstquestion': 'Apples'}),
+        (rejected, {'firstquestion': 'Not public', 'secondquestion': 'Not public either'}),
+    ):
+        submission = factory_submission_model(survey.id, eng.id, participant.id, submission_info)
+        for key, text in answers.items():
+            factory_comment_model(survey.id, submission.id, {'component_id': key, 'text': text})
+
+    headers = factory_auth_header(jwt=jwt, claims=claims)
+    rv = client.get(f'/api/comments/survey/{survey.id}/sheet/proponent?format=csv',
+                    headers=headers, content_type=ContentType.JSON.value)
+    assert rv.status_code == HTTPStatus.OK
+    assert rv.mimetype == ContentType.CSV.value
+    mock_generate_document.assert_not_called()
+
+    # the same sheet the templated document is rendered from
+    data = CommentService.get_proponent_sheet_data(survey.id)
+    expected = [
+        ['No.', *itertools.chain.from_iterable((title['label'], title['proponent_answers'])
+                                               for title in data['titles'])],
+        *([str(row['row_id']), *itertools.chain.from_iterable((comment['text'], '')
+                                                              for comment in row['commentText'])]
+          for row in data['comments']),
+    ]
+    assert expected == [
+        ['No.', 'First question', 'Proponent Answer', 'Second question', 'Proponent Answer'],
+        ['1', 'Apples', '', 'Bananas', ''],
+        ['2', 'Cherries', '', '', ''],
+    ]
+    assert list(csv.reader(io.StringIO(rv.get_data(as_text=True)))) == expected
+
+
 def test_get_comments_spreadsheet_without_role(mocker, client, jwt, session):  # pylint:disable=unused-argument
     """Assert that proponent comments sheet can be fetched."""
     mock_post_generate_document_response = MagicMock()
@@ -0,0 +1,156 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the Comment model.
+
+Test suite to ensure that the Comment model routines are working as expected.
+"""
+from datetime import datetime, timedelta
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy import event
+
+from api.constants.engagement_status import Status as EngagementStatus
+from api.exceptions.business_exception import BusinessException
+from api.models.comment import Comment as CommentModel
+from api.models.db import db
+from api.models.pagination_options import PaginationOptions
+from api.models.submission import Submission as SubmissionModel
+from api.schemas.comment import CommentSchema
+from tests.utilities.factory_scenarios import TestCommentInfo, TestReportSettingInfo, TestSubmissionInfo
+from tests.utilities.factory_utils import (
+    factory_comment_model, factory_participant_model, factory_submission_model, factory_survey_and_eng_model,
+    factory_survey_report_setting_model)
+
+
+def test_search_submissions_by_comment_text(session):  # pylint:disable=unused-argument
+    """Assert that submissions are found by stemmed words and by partial words of their comments."""
+    survey, eng = factory_survey_and_eng_model()
+    participant = factory_participant_model()
+    submission = factory_submission_model(survey.id, eng.id, participant.id)
+    factory_comment_model(survey.id, submission.id, {
+        **TestCommentInfo.comment1, 'text': 'Cyclists were riding along the river trail'})
+    other_submission = factory_submission_model(survey.id, eng.id, participant.id)
+    factory_comment_model(survey.id, other_submission.id, {**TestCommentInfo.comment1, 'text': 'More parking please'})
+    pagination_options = PaginationOptions(page=None, size=None, sort_key='submission.id', sort_order='asc')
+
+    for search_text in ('rides', 'cycl', 'RIVER TRAIL'):
+        items, total = CommentModel.get_by_survey_id_paginated(survey.id, pagination_options, search_text)
+        assert total == 1
+        assert items[0].id == submission.id
+
+
+def test_search_accepted_comments_by_cursor(session):  # pylint:disable=unused-argument
+    """Assert that cursor pages of searched comments list the best matches first, each with a headline."""
+    survey, eng = factory_survey_and_eng_model()
+    participant = factory_participant_model()
+    factory_survey_report_setting_model({
+        **TestReportSettingInfo.report_setting_1, 'survey_id': survey.id,
+        'question_key': TestCommentInfo.comment1['component_id'], 'display': True})
+    texts = ['A bench near the parking lot would be nice', 'More parking, parking and parking', 'More trees']
+    for text in texts:
+        submission = factory_submission_model(survey.id, eng.id, participant.id, TestSubmissionInfo.approved_submission)
+        factory_comment_model(survey.id, submission.id, {**TestCommentInfo.comment1, 'text': text})
+
+    pagination_options = PaginationOptions(page=None, size=1, sort_key=None, sort_order='asc', cursor='')
+    items, total = CommentModel.get_accepted_comments_by_survey_id_paginated(survey.id, pagination_options, 'parking')
+    assert total == 2
+    assert [item.text for item in items] == [texts[1]]
+    assert '<mark>parking</mark>' in items[0].headline
+
+    pagination_options.cursor = pagination_options.next_cursor
+    items, _ = CommentModel.get_accepted_comments_by_survey_id_paginated(survey.id, pagination_options, 'parking')
+    assert [item.text for item in items] == [texts[0]]
+    assert '<mark>parking</mark>' in items[0].headline
+    assert pagination_options.next_cursor is None
+
+    pagination_options = PaginationOptions(page=None, size=1, sort_key='text', sort_order='asc', cursor='')
+    with pytest.raises(BusinessException) as excinfo:
+        CommentModel.get_accepted_comments_by_survey_id_paginated(survey.id, pagination_options, 'parking')
+    assert excinfo.value.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_dump_comments_in_constant_queries(session):  # pylint:disable=unused-argument
+    """Assert that dumping comments costs the same number of queries however many comments there are."""
+    survey, eng = factory_survey_and_eng_model()
+    participant = factory_participant_model()
+    factory_survey_report_setting_model({
+        **TestReportSettingInfo.report_setting_1, 'survey_id': survey.id,
+        'question_key': TestCommentInfo.comment1['component_id'], 'display': False})
+
+    def count_dump_queries(number_of_comments):
+        for _ in range(number_of_comments):
+            submission = factory_submission_model(survey.id, eng.id, participant.id)
+            factory_comment_model(survey.id, submission.id)
+        session.expunge_all()
+        comments = db.session.query(CommentModel).filter(CommentModel.survey_id == survey.id).all()
+
+        statements = []
+
+        def before_cursor_execute(*args):  # pylint:disable=unused-argument
+            statements.append(args[2])
+
+        event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            dumped = CommentSchema(many=True).dump(comments)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+        assert all(comment['is_displayed'] is False for comment in dumped)
+        return len(statements)
+
+    assert count_dump_queries(2) == count_dump_queries(20) <= 3
+
+
+def test_redact_rejected_submissions(session):  # pylint:disable=unused-argument
+    """Assert that rejected comments of closed engagements are redacted once, along with the answers they came from."""
+    survey, eng = factory_survey_and_eng_model()
+    eng.status_id = EngagementStatus.Closed.value
+    eng.end_date = datetime.utcnow() - timedelta(days=30)
+    eng.save()
+    participant = factory_participant_model()
+
+    def rejected_submission(submission_json, component_id):
+        submission = factory_submission_model(survey.id, eng.id, participant.id, {
+            **TestSubmissionInfo.rejected_submission, 'submission_json': submission_json})
+        submission.has_threat = False
+        submission.save()
+        factory_comment_model(survey.id, submission.id, {**TestCommentInfo.comment1, 'component_id': component_id})
+        return submission
+
+    matching = rejected_submission({'simpletextarea': 'Rejected text', 'simpleradios': 'yes'}, 'simpletextarea')
+    # the comment is not keyed by a top level answer of the submission
+    not_matching = rejected_submission({'simpleradios': 'no'}, 'othertextarea')
+    already_redacted = rejected_submission({'simpletextarea': 'Rejected text'}, 'simpletextarea')
+    already_redacted.redacted_date = datetime.utcnow()
+    already_redacted.save()
+
+    closed_on_or_before = datetime.utcnow().date() - timedelta(days=14)
+    submission_ids = CommentModel.find_submission_ids_to_redact(closed_on_or_before, 0, 10)
+    assert submission_ids == [matching.id, not_matching.id]
+    assert CommentModel.find_submission_ids_to_redact(closed_on_or_before, matching.id, 10) == [not_matching.id]
+
+    assert CommentModel.redact_submissions(submission_ids, '[Comment Redacted]') == 2
+    db.session.commit()
+    session.expire_all()
+
+    redacted = {submission.id: submission for submission in db.session.query(SubmissionModel).filter(
+        SubmissionModel.id.in_([matching.id, not_matching.id, already_redacted.id]))}
+    assert redacted[matching.id].submission_json == {'simpletextarea': '[Comment Redacted]', 'simpleradios': 'yes'}
+    # left an object, rather than concatenated with a JSON string into an array
+    assert redacted[not_matching.id].submission_json == {'simpleradios': 'no'}
+    assert redacted[already_redacted.id].submission_json == {'simpletextarea': 'Rejected text'}
+    assert redacted[matching.id].redacted_date is not None
+    assert redacted[not_matching.id].redacted_date is not None
+    assert {comment.text for comment in CommentModel.get_by_submission(matching.id)} == {'[Comment Redacted]'}
+    assert CommentModel.find_submission_ids_to_redact(closed_on_or_before, 0, 10) == []
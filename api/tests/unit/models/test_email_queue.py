@@ -0,0 +1,63 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the EmailQueue model.
+
+Test suite to ensure that the email queue is claimed and released as expected.
+"""
+from datetime import datetime, timedelta
+
+from api.constants.notification_status import NotificationStatus
+from api.models.email_queue import EmailQueue as EmailQueueModel
+from api.utils import email_util
+from api.utils.datetime import local_datetime
+from api.utils.enums import SourceAction, SourceType
+from tests.utilities.factory_scenarios import TestEngagementInfo
+from tests.utilities.factory_utils import factory_engagement_model, set_global_tenant
+
+
+def test_claim_and_release_mails(session):  # pylint:disable=unused-argument
+    """Assert that claimed mails are leased, retried when due and not claimed again once sent."""
+    set_global_tenant()
+    eng = factory_engagement_model({
+        **TestEngagementInfo.engagement1,
+        'start_date': local_datetime().strftime('%Y-%m-%d'),
+    })
+    mail = email_util.publish_to_email_queue(SourceType.ENGAGEMENT.value, eng.id,
+                                             SourceAction.PUBLISHED.value, True)
+
+    claimed = EmailQueueModel.claim_mails_for_open_engagements(10, 'worker-1', lease_seconds=600)
+    assert [claimed_mail.id for claimed_mail in claimed] == [mail.id]
+    assert claimed[0].notification_status == NotificationStatus.PROCESSING
+    assert claimed[0].attempts == 1
+    assert claimed[0].locked_by == 'worker-1'
+
+    # the lease is still held, so another worker cannot claim it
+    assert EmailQueueModel.claim_mails_for_open_engagements(10, 'worker-2', lease_seconds=600) == []
+    # but an expired lease is reclaimed
+    reclaimed = EmailQueueModel.claim_mails_for_open_engagements(10, 'worker-2', lease_seconds=0)
+    assert reclaimed[0].locked_by == 'worker-2'
+    assert reclaimed[0].attempts == 2
+
+    EmailQueueModel.mark_failed(mail.id, 'boom', datetime.utcnow() + timedelta(hours=1))
+    assert EmailQueueModel.claim_mails_for_open_engagements(10, 'worker-1', lease_seconds=600) == []
+    EmailQueueModel.mark_failed(mail.id, 'boom', datetime.utcnow() - timedelta(seconds=1))
+    assert len(EmailQueueModel.claim_mails_for_open_engagements(10, 'worker-1', lease_seconds=600)) == 1
+
+    EmailQueueModel.mark_sent(mail.id)
+    session.expire_all()
+    sent_mail = EmailQueueModel.find_by_id(mail.id)
+    assert sent_mail.notification_status == NotificationStatus.SENT
+    assert sent_mail.last_error == 'boom'
+    assert sent_mail.locked_at is None
+    assert EmailQueueModel.claim_mails_for_open_engagements(10, 'worker-1', lease_seconds=600) == []
@@ -20,6 +20,7 @@ from faker import Faker
 import pytest
 
 from api.constants.engagement_status import Status
+from api.exceptions.business_exception import BusinessException
 from api.models import db
 from api.models.engagement_metadata import EngagementMetadata
 from api.models.engagement import Engagement as EngagementModel
@@ -77,6 +78,29 @@ def test_get_engagements_paginated_name_search(session):
     assert count == 1  # Name search brings up only search result
 
 
+def test_get_engagements_paginated_by_cursor(session):
+    """Assert that cursor pagination visits every engagement once and rejects unindexed sort keys."""
+    engagement_ids = {factory_engagement_model().id for _ in range(0, 5)}
+    scope_options = EngagementScopeOptions(restricted=False)
+    search_options = {'search_text': ''}
+    pagination_options = PaginationOptions(page=None, size=2, sort_key='engagement.created_date',
+                                           sort_order='desc', cursor='')
+
+    seen_ids = []
+    for _ in range(0, 3):
+        result, count = EngagementModel.get_engagements_paginated(
+            None, pagination_options, scope_options, search_options)
+        assert count == len(engagement_ids)
+        seen_ids.extend(engagement.id for engagement in result)
+        pagination_options.cursor = pagination_options.next_cursor
+    assert pagination_options.next_cursor is None
+    assert sorted(seen_ids) == sorted(engagement_ids)
+
+    pagination_options = PaginationOptions(page=None, size=2, sort_key='status_id', sort_order='asc', cursor='')
+    with pytest.raises(BusinessException):
+        EngagementModel.get_engagements_paginated(None, pagination_options, scope_options, search_options)
+
+
 def test_get_engagements_paginated_status_search(session):
     """Assert that an engagement can be created and fetched."""
     for _ in range(0, 11):
@@ -0,0 +1,56 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the Subscription model.
+
+Test suite to ensure that the Subscription model routines are working as expected.
+"""
+from api.constants.subscription_type import SubscriptionType
+from api.models.subscription import Subscription as SubscriptionModel
+from tests.utilities.factory_scenarios import TestParticipantInfo
+from tests.utilities.factory_utils import factory_engagement_model, factory_participant_model, set_global_tenant
+
+
+def _subscribe(participant, engagement, subscription_type, is_subscribed=True):
+    subscription = SubscriptionModel(
+        engagement_id=engagement.id,
+        participant_id=participant.id,
+        is_subscribed=is_subscribed,
+        type=subscription_type,
+    )
+    subscription.save()
+    return subscription
+
+
+def test_get_subscribed_participants(session):  # pylint:disable=unused-argument
+    """Assert that engagement and tenant subscribers are resolved once each, and others are not."""
+    set_global_tenant()
+    eng = factory_engagement_model()
+    other_eng = factory_engagement_model()
+    engagement_subscriber = factory_participant_model()
+    tenant_subscriber = factory_participant_model(TestParticipantInfo.participant2)
+    other_subscriber = factory_participant_model({'email_address': 'other@example.com'})
+    unsubscribed = factory_participant_model({'email_address': 'unsubscribed@example.com'})
+
+    _subscribe(engagement_subscriber, eng, SubscriptionType.ENGAGEMENT)
+    _subscribe(engagement_subscriber, other_eng, SubscriptionType.TENANT)
+    _subscribe(tenant_subscriber, other_eng, SubscriptionType.TENANT)
+    _subscribe(other_subscriber, other_eng, SubscriptionType.ENGAGEMENT)
+    _subscribe(unsubscribed, eng, SubscriptionType.ENGAGEMENT, is_subscribed=False)
+
+    subscribers = list(SubscriptionModel.get_subscribed_participants(eng.id, eng.tenant_id, batch_size=1))
+
+    assert sorted(participant_id for participant_id, _ in subscribers) == sorted(
+        [engagement_subscriber.id, tenant_subscriber.id])
+    assert {email for _, email in subscribers} == {
+        engagement_subscriber.email_address, tenant_subscriber.email_address}
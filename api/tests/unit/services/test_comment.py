@@ -16,11 +16,15 @@
 
 Test-Suite to ensure that the Comment service routines are working as expected.
 """
+import csv
+import io
+
 from api.services.comment_service import CommentService
 from tests.utilities.factory_scenarios import TestJwtClaims, TestSubmissionInfo
 from tests.utilities.factory_utils import (
     factory_comment_model, factory_membership_model, factory_participant_model, factory_staff_user_model,
     factory_submission_model, factory_survey_and_eng_model, patch_token_info, set_global_tenant)
+from tests.utilities.query_assertions import assert_max_queries
 
 
 def test_get_comments(session, monkeypatch):  # pylint:disable=unused-argument
@@ -53,3 +57,71 @@ def test_get_comments_approved_comments(session):  # pylint:disable=unused-argum
     comment_records = CommentService().get_comments_by_submission(submission.id)
     assert len(comment_records) == 1
     assert comment_records[0]['status_id'] == approved_submission.get('comment_status_id')
+
+
+def _synthetic_comments(count, label_count=5):
+    """Return comments answering each of label_count questions once per submission."""
+    return [
+        {'submission_id': index // label_count, 'label': f'Question {index % label_count}', 'text': f'Comment {index}'}
+        for index in range(count)
+    ]
+
+
+def _export_comments(comments, titles):
+    grouped_comments = CommentService.sort_comments_by_titles(
+        titles, CommentService.group_comments_by_submission_id(comments))
+    return grouped_comments, CommentService.format_comments(comments)
+
+
+def test_format_comments():
+    """Assert that comments are laid out in rows holding the next comment for each label."""
+    comments = [
+        {'submission_id': 1, 'label': 'Q1', 'text': 'a'},
+        {'submission_id': 1, 'label': 'Q2', 'text': 'b'},
+        {'submission_id': 2, 'label': 'Q1', 'text': 'c'},
+    ]
+    titles = [{'label': 'Q2'}, {'label': 'Q1'}]
+
+    grouped_comments, formatted_comments = _export_comments(comments, titles)
+
+    assert grouped_comments == [
+        {'submission_id': 1, 'commentText': [{'text': 'b', 'label': 'Q2'}, {'text': 'a', 'label': 'Q1'}]},
+        {'submission_id': 2, 'commentText': [{'text': '', 'label': 'Q2'}, {'text': 'c', 'label': 'Q1'}]},
+    ]
+    assert [title['label'] for title in formatted_comments['titles']] == ['Q1', 'Q2']
+    assert formatted_comments['comments'] == [
+        {'row_id': 1, 'commentText': [{'text': 'a', 'submission_id': 1}, {'text': 'b', 'submission_id': 1}]},
+        {'row_id': 2, 'commentText': [{'text': 'c', 'submission_id': 2}, {'text': '', 'submission_id': ''}]},
+    ]
+
+
+def test_export_comments_benchmark(benchmark):
+    """Benchmark formatting 100k comments for export.
+
+    The timings are compared between runs saved with --benchmark-autosave, e.g.
+    pytest --benchmark-compare --benchmark-compare-fail=mean:25%, rather than against a fixed time.
+    """
+    comments = _synthetic_comments(100_000)
+    titles = [{'label': f'Question {index}'} for index in range(5)]
+
+    grouped_comments, formatted_comments = benchmark.pedantic(
+        _export_comments, args=(comments, titles), rounds=3, iterations=1)
+
+    assert len(grouped_comments) == 20_000
+    assert len(formatted_comments['comments']) == 20_000
+
+
+def test_export_comments_queries(session):  # pylint:disable=unused-argument
+    """Assert that the staff sheet is read in the same few queries, whatever the number of submissions."""
+    participant = factory_participant_model()
+    survey, eng = factory_survey_and_eng_model()
+    for _ in range(20):
+        submission = factory_submission_model(survey.id, eng.id, participant.id)
+        factory_comment_model(survey.id, submission.id)
+
+    with assert_max_queries(3):
+        export = CommentService.export_comments_to_spread_sheet_staff(survey.id)
+        rows = list(csv.reader(io.StringIO(''.join(export.chunks))))
+
+    # the header and a row per submission
+    assert len(rows) == 21
@@ -0,0 +1,109 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the DocumentJob service.
+
+Test suite to ensure that document jobs are reused, generated and stored as expected.
+"""
+from unittest.mock import MagicMock, patch
+
+from api.constants.document_job_status import DocumentJobStatus
+from api.services.document_generation_service import DocumentGenerationService
+from api.services.document_job_service import DocumentJobService
+from api.services.object_storage_service import ObjectStorageService
+from api.utils.enums import GeneratedDocumentTypes
+from tests.utilities.factory_utils import (
+    factory_comment_model, factory_participant_model, factory_submission_model, factory_survey_and_eng_model)
+
+
+PROPONENT_SHEET = GeneratedDocumentTypes.COMMENT_SHEET_PROPONENT.value
+JOB_CONFIG = {'BATCH_SIZE': 10, 'LEASE_SECONDS': 600, 'MAX_ATTEMPTS': 3, 'RETRY_BACKOFF_SECONDS': 0}
+
+
+def _generated_document():
+    response = MagicMock()
+    response.status_code = 200
+    response.content = b'document'
+    response.headers = {'content-type': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'}
+    return response
+
+
+@patch('api.services.authorization.check_auth')
+def test_request_document_reuses_jobs(mock_check_auth, session):  # pylint:disable=unused-argument
+    """Assert that a job is reused until the data of its document changes."""
+    survey, eng = factory_survey_and_eng_model()
+    participant = factory_participant_model()
+    submission = factory_submission_model(survey.id, eng.id, participant.id)
+    factory_comment_model(survey.id, submission.id)
+
+    job = DocumentJobService.request_document(PROPONENT_SHEET, survey.id)
+    assert job['status'] == DocumentJobStatus.PENDING.name
+    assert DocumentJobService.request_document(PROPONENT_SHEET, survey.id)['id'] == job['id']
+    mock_check_auth.assert_called()
+
+    factory_comment_model(survey.id, submission.id)
+    assert DocumentJobService.request_document(PROPONENT_SHEET, survey.id)['id'] != job['id']
+
+
+@patch('api.services.authorization.check_auth')
+def test_process_pending_jobs(mock_check_auth, session):  # pylint:disable=unused-argument
+    """Assert that pending jobs are generated once, and their documents served to later requests."""
+    survey, _ = factory_survey_and_eng_model()
+    job = DocumentJobService.request_document(PROPONENT_SHEET, survey.id)
+
+    with patch.object(DocumentGenerationService, 'generate_document',
+                      return_value=_generated_document()) as mock_generate, \
+            patch.object(ObjectStorageService, 'put_object') as mock_put_object:
+        outcomes = DocumentJobService.process_pending_jobs('worker-1', JOB_CONFIG)
+        assert outcomes['completed'] == 1
+        assert DocumentJobService.process_pending_jobs('worker-1', JOB_CONFIG)['claimed'] == 0
+        mock_generate.assert_called_once()
+        mock_put_object.assert_called_once()
+
+    session.expire_all()
+    completed_job = DocumentJobService.request_document(PROPONENT_SHEET, survey.id)
+    assert completed_job['id'] == job['id']
+    assert completed_job['status'] == DocumentJobStatus.COMPLETED.name
+    assert completed_job['file_name'] == 'proponent_comments_sheet.xlsx'
+
+
+@patch('api.services.authorization.check_auth')
+def test_process_failing_job(mock_check_auth, session):  # pylint:disable=unused-argument
+    """Assert that a failing job is retried until it runs out of attempts."""
+    survey, _ = factory_survey_and_eng_model()
+    job = DocumentJobService.request_document(PROPONENT_SHEET, survey.id)
+
+    with patch.object(DocumentGenerationService, 'generate_document', side_effect=ValueError('boom')):
+        assert DocumentJobService.process_pending_jobs('worker-1', {**JOB_CONFIG, 'MAX_ATTEMPTS': 2}) == {
+            'claimed': 2, 'completed': 0, 'reused': 0, 'retried': 1, 'failed': 1}
+
+    session.expire_all()
+    failed_job = DocumentJobService.get_job(job['id'])
+    assert failed_job['status'] == DocumentJobStatus.FAILED.name
+    assert failed_job['attempts'] == 2
+
+
+@patch('api.services.authorization.check_auth')
+def test_failed_job_retry_is_delayed(mock_check_auth, session):  # pylint:disable=unused-argument
+    """Assert that a failed job is not claimed again until its retry backoff has passed."""
+    survey, _ = factory_survey_and_eng_model()
+    job = DocumentJobService.request_document(PROPONENT_SHEET, survey.id)
+
+    with patch.object(DocumentGenerationService, 'generate_document', side_effect=ValueError('boom')):
+        assert DocumentJobService.process_pending_jobs('worker-1', {**JOB_CONFIG, 'RETRY_BACKOFF_SECONDS': 600}) == {
+            'claimed': 1, 'completed': 0, 'reused': 0, 'retried': 1, 'failed': 0}
+
+    session.expire_all()
+    retried_job = DocumentJobService.get_job(job['id'])
+    assert retried_job['status'] == DocumentJobStatus.PENDING.name
+    assert retried_job['attempts'] == 1
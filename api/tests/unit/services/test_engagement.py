@@ -15,6 +15,8 @@
 
 Test suite to ensure that the Engagement service routines are working as expected.
 """
+from datetime import datetime, timedelta
+
 import pytest
 from unittest.mock import patch
 from werkzeug.exceptions import Forbidden
@@ -104,6 +106,25 @@ def test_patch_engagement(session, monkeypatch):  # pylint:disable=unused-argume
         assert updated_engagement_record.created_date.strftime(date_format) == engagement_edits.get('created_date')
 
 
+def test_get_engagement_cached_for_anonymous_users(app, session):  # pylint:disable=unused-argument
+    """Assert that anonymous reads are served from cache until the engagement is closed."""
+    past_end_date = (datetime.today() - timedelta(days=1)).strftime(date_format)
+    eng = factory_engagement_model({**TestEngagementInfo.engagement1, 'end_date': past_end_date})
+
+    with patch.dict(app.config, {'PUBLIC_ENGAGEMENT_CACHE_TIMEOUT': 60}):
+        engagement = EngagementService().get_engagement(eng.id)
+        assert engagement['status_id'] == Status.Published.value
+        assert 'submissions_meta_data' not in engagement
+
+        with patch.object(EngagementService, 'get_accessible_engagement_model') as mock_get:
+            assert EngagementService().get_engagement(eng.id) == engagement
+            mock_get.assert_not_called()
+
+        # closing engagements as the cron job does bumps their version
+        Engagement.close_engagements_due()
+        assert EngagementService().get_engagement(eng.id)['status_id'] == Status.Closed.value
+
+
 def test_delete_success(session, mocker):
     """Assert that an engagement can be deleted."""
     eng = factory_engagement_model(status=Status.Draft.value)
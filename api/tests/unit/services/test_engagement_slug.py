@@ -15,10 +15,13 @@
 
 Test suite to ensure that the Engagement slug service routines are working as expected.
 """
+from unittest.mock import patch
+
 import pytest
 from faker import Faker
 
 from api.constants.engagement_status import Status
+from api.models.engagement_slug import EngagementSlug as EngagementSlugModel
 from api.services.engagement_slug_service import EngagementSlugService
 from tests.utilities.factory_utils import factory_engagement_model, factory_engagement_slug_model
 from tests.utilities.factory_scenarios import TestEngagementInfo, TestEngagementSlugInfo
@@ -41,6 +44,26 @@ def test_get_engagement_slug(session):
     }
 
 
+def test_get_engagement_slug_is_cached(app, session):
+    """Assert that slugs resolve case-insensitively from the cache until they are changed."""
+    eng = factory_engagement_model(status=Status.Draft)
+    EngagementSlugService.update_engagement_slug('Cached-Slug', eng.id)
+
+    with patch.dict(app.config, {'ENGAGEMENT_SLUG_CACHE_TIMEOUT': 60}):
+        assert EngagementSlugService.get_engagement_slug('CACHED-SLUG') == {
+            'slug': 'cached-slug',
+            'engagement_id': eng.id
+        }
+
+        with patch.object(EngagementSlugModel, 'find_by_slug') as mock_find_by_slug:
+            assert EngagementSlugService.get_engagement_slug('cached-slug')['engagement_id'] == eng.id
+            mock_find_by_slug.assert_not_called()
+
+        EngagementSlugService.update_engagement_slug('renamed-slug', eng.id)
+        with pytest.raises(ValueError):
+            EngagementSlugService.get_engagement_slug('cached-slug')
+
+
 def test_get_engagement_slug_by_engagement_id(session):
     """Test get request for engagement slug by engagement id."""
     eng = factory_engagement_model(status=Status.Draft)
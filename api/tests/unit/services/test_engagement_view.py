@@ -0,0 +1,66 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the Engagement view service.
+
+Test suite to ensure that engagement views are assembled, cached and invalidated as expected.
+"""
+from unittest.mock import patch
+
+from api.models.engagement import Engagement as EngagementModel
+from api.services.engagement_view_service import EngagementViewService
+from tests.utilities.factory_scenarios import TestWidgetInfo, TestWidgetItemInfo
+from tests.utilities.factory_utils import factory_engagement_model, factory_widget_item_model, factory_widget_model
+from tests.utilities.query_assertions import assert_max_queries
+
+
+def test_engagement_version_bumped_on_edit(session):  # pylint:disable=unused-argument
+    """Assert that writes to an engagement or to its widgets bump the version of the engagement."""
+    eng = factory_engagement_model()
+    version = EngagementModel.get_version(eng.id)
+
+    widget = factory_widget_model({**TestWidgetInfo.widget1, 'engagement_id': eng.id})
+    assert EngagementModel.get_version(eng.id) > version
+
+    # widget items belong to the engagement through their widget
+    version = EngagementModel.get_version(eng.id)
+    factory_widget_item_model({**TestWidgetItemInfo.widget_item1, 'widget_id': widget.id})
+    assert EngagementModel.get_version(eng.id) > version
+
+    # updates issued as queries rather than through the unit of work
+    version = EngagementModel.get_version(eng.id)
+    EngagementModel.edit_engagement({'id': eng.id, 'name': 'Renamed engagement'})
+    assert EngagementModel.get_version(eng.id) > version
+
+
+def test_engagement_view_cached_until_edited(app, session):  # pylint:disable=unused-argument
+    """Assert that engagement views are reused, and assembled again once the engagement is edited."""
+    eng = factory_engagement_model()
+    widget = factory_widget_model({**TestWidgetInfo.widget1, 'engagement_id': eng.id})
+
+    with patch.dict(app.config, {'ENGAGEMENT_VIEW_CACHE_TIMEOUT': 60}):
+        view = EngagementViewService.get_engagement_view(engagement_id=eng.id)
+        assert view['engagement']['id'] == eng.id
+        assert 'submissions_meta_data' not in view['engagement']
+        assert [widget_view['id'] for widget_view in view['widgets']] == [widget.id]
+
+        # a cached view only costs the lookup of the version of the engagement
+        with patch.object(EngagementViewService, '_assemble_view') as mock_assemble, assert_max_queries(1):
+            EngagementViewService.get_engagement_view(engagement_id=eng.id)
+            mock_assemble.assert_not_called()
+
+        widget.title = 'Renamed widget'
+        widget.save()
+
+        view = EngagementViewService.get_engagement_view(engagement_id=eng.id)
+        assert view['widgets'][0]['title'] == 'Renamed widget'
@@ -0,0 +1,75 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the Principal service.
+
+Test suite to ensure that the Principal service routines are working as expected.
+"""
+from unittest.mock import patch
+
+from api.constants.membership_type import MembershipType
+from api.services.membership_service import MembershipService
+from api.services.principal_service import PrincipalService
+from api.utils.enums import CompositeRoleId
+from tests.utilities.factory_utils import (
+    factory_engagement_model, factory_membership_model, factory_staff_user_model, factory_user_group_membership_model,
+    set_global_tenant)
+
+
+def test_get_principal(session):  # pylint:disable=unused-argument
+    """Assert that the principal carries the staff user, tenant roles and active memberships."""
+    set_global_tenant()
+    user = factory_staff_user_model()
+    factory_user_group_membership_model(str(user.external_id), user.tenant_id, CompositeRoleId.TEAM_MEMBER.value)
+    eng = factory_engagement_model()
+    factory_membership_model(user_id=user.id, engagement_id=eng.id)
+
+    principal = PrincipalService.get_principal(user.external_id)
+
+    assert principal.is_staff_user
+    assert principal.staff_user_id == user.id
+    assert principal.roles
+    assert principal.get_membership(eng.id)['type'] == MembershipType.TEAM_MEMBER.name
+
+
+def test_get_principal_unknown_user(session):  # pylint:disable=unused-argument
+    """Assert that an unknown user resolves to a principal with no staff user or roles."""
+    set_global_tenant()
+    principal = PrincipalService.get_principal('unknown-external-id')
+
+    assert not principal.is_staff_user
+    assert principal.roles == []
+    assert principal.memberships == {}
+
+
+def test_principal_cache_invalidated_on_membership_change(app, session):  # pylint:disable=unused-argument
+    """Assert that cached principals are reused, and dropped when memberships change."""
+    set_global_tenant()
+    user = factory_staff_user_model()
+    factory_user_group_membership_model(str(user.external_id), user.tenant_id, CompositeRoleId.TEAM_MEMBER.value)
+    eng = factory_engagement_model()
+
+    with patch.dict(app.config, {'PRINCIPAL_CACHE_TIMEOUT': 60}):
+        principal = PrincipalService.get_principal(user.external_id)
+        assert principal.get_membership(eng.id) is None
+
+        with patch.object(PrincipalService, '_resolve') as mock_resolve:
+            PrincipalService.get_principal(user.external_id)
+            mock_resolve.assert_not_called()
+
+        membership = factory_membership_model(user_id=user.id, engagement_id=eng.id)
+        revoked_membership = MembershipService.revoke_membership(membership)
+        MembershipService.reinstate_membership(revoked_membership)
+
+        principal = PrincipalService.get_principal(user.external_id)
+        assert principal.get_membership(eng.id)['type'] == MembershipType.TEAM_MEMBER.name
@@ -0,0 +1,92 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests to assure the cache utilities.
+
+Test-Suite to ensure that the tiered cache is working as expected.
+"""
+import pytest
+from flask import Flask
+from freezegun import freeze_time
+
+from api.utils.cache import LocalCache, TieredCache
+
+
+@pytest.fixture()
+def tiered_cache():
+    """Return a tiered cache backed by fakeredis, inside an app context."""
+    app = Flask(__name__)
+    app.config['CACHE_CONFIG'] = {
+        'TYPE': 'api.utils.cache.FakeRedisCache',
+        'LOCAL_MAX_SIZE': 2,
+        'LOCAL_TTL': 30,
+    }
+    _cache = TieredCache()
+    _cache.init_app(app)
+    with app.app_context():
+        yield _cache
+        _cache.clear()
+
+
+def test_local_cache_evicts_least_recently_used():
+    """Assert that the local tier evicts the least recently used entry when full."""
+    local = LocalCache(max_size=2, ttl=30)
+    local.set('a', 1)
+    local.set('b', 2)
+    assert local.get('a') == 1
+    assert local.set('c', 3) == 1
+    assert local.get('b') is None
+    assert local.get('a') == 1
+    assert local.get('c') == 3
+
+
+def test_local_cache_expires_entries():
+    """Assert that entries in the local tier expire after the TTL."""
+    with freeze_time('2024-01-01 00:00:00') as frozen_time:
+        local = LocalCache(max_size=10, ttl=30)
+        local.set('a', 1)
+        frozen_time.tick(29)
+        assert local.get('a') == 1
+        frozen_time.tick(2)
+        assert local.get('a') is None
+
+
+def test_tiered_cache_hits_and_misses(tiered_cache):  # pylint: disable=redefined-outer-name
+    """Assert that lookups are served from the local tier, then the shared tier, and counted."""
+    tenants = tiered_cache.namespace('tenant')
+    assert tenants.get('GDX') is None
+    assert tiered_cache.stats.misses == 1
+
+    tenants.set('GDX', {'id': 1, 'short_name': 'GDX'})
+    assert tenants.get('GDX') == {'id': 1, 'short_name': 'GDX'}
+    assert tiered_cache.stats.local_hits == 1
+
+    # a fresh local tier (e.g. another worker) is filled from the shared tier
+    tiered_cache.local.clear()
+    assert tenants.get('GDX') == {'id': 1, 'short_name': 'GDX'}
+    assert tiered_cache.stats.shared_hits == 1
+    assert tiered_cache.local.get('tenant:GDX') == {'id': 1, 'short_name': 'GDX'}
+
+
+def test_tiered_cache_namespaces_and_delete(tiered_cache):  # pylint: disable=redefined-outer-name
+    """Assert that namespaces do not collide and deletes clear both tiers."""
+    tiered_cache.namespace('tenant').set('1', 'tenant')
+    tiered_cache.namespace('engagement').set('1', 'engagement')
+    assert tiered_cache.namespace('tenant').get('1') == 'tenant'
+    assert tiered_cache.namespace('engagement').get('1') == 'engagement'
+
+    tiered_cache.namespace('tenant').delete('1')
+    assert tiered_cache.namespace('tenant').get('1') is None
+    assert tiered_cache.shared.get('tenant:1') is None
+    assert tiered_cache.namespace('engagement').get('1') == 'engagement'
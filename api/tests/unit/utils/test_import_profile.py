@@ -0,0 +1,33 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests to assure the startup budget of the application.
+
+Test-Suite to ensure that creating the application stays fast and small, so server processes start quickly.
+"""
+from api.utils.import_profile import profile_startup
+
+
+# Generous enough for a loaded CI runner; a heavy dependency imported at startup exceeds them
+STARTUP_SECONDS_BUDGET = 8
+STARTUP_RSS_MB_BUDGET = 250
+
+
+def test_create_app_within_startup_budget():
+    """Assert that the application is created without heavy dependencies, within time and memory budgets."""
+    profile = profile_startup('testing')
+
+    assert profile.deferred_modules_imported() == []
+    assert profile.seconds < STARTUP_SECONDS_BUDGET, profile.slowest_imports(10)
+    assert profile.max_rss_mb < STARTUP_RSS_MB_BUDGET, profile.slowest_imports(10)
@@ -16,8 +16,13 @@
 
 Test-Suite to ensure that the Notification methods are working as expected.
 """
+import json
+from http import HTTPStatus
+
 import pytest
+import requests
 
+from api.services.rest_service import RestService
 from api.utils import notification
 from api.constants.email_verification import INTERNAL_EMAIL_DOMAIN
 
@@ -44,3 +49,80 @@ def test_is_allowed_email(app, email, expected, send_email_internal_only):
     app.config['SEND_EMAIL_INTERNAL_ONLY'] = send_email_internal_only
     with app.app_context():
         assert notification.is_allowed_email(email) == expected
+
+
+def test_send_email_batch(app, monkeypatch):
+    """Assert that emails are posted in batches, retrying those not sent, and reported per recipient."""
+    posted_batches = []
+    attempts = {}
+
+    def post(self, endpoint, headers=None, data=None, timeout=None):  # pylint: disable=unused-argument
+        emails = [payload['to'][0] for payload in json.loads(data)['emails']]
+        posted_batches.append(emails)
+        results = []
+        for email in emails:
+            attempts[email] = attempts.get(email, 0) + 1
+            failed = email.startswith('bad') or (email.startswith('flaky') and attempts[email] == 1)
+            results.append({'to': [email], 'status': 'failed' if failed else 'sent'})
+        response = requests.Response()
+        response.status_code = HTTPStatus.OK
+        response._content = json.dumps({'results': results}).encode()  # pylint: disable=protected-access
+        return response
+
+    monkeypatch.setattr(requests.Session, 'post', post)
+    monkeypatch.setattr(RestService, 'get_service_account_token', lambda *args, **kwargs: 'token')
+    app.config['SEND_EMAIL_INTERNAL_ONLY'] = False
+    app.config['NOTIFICATIONS_EMAIL_BATCH_ENDPOINT'] = 'http://localhost/email/batch'
+    app.config['EMAIL_BATCH_CONFIG'] = {'BATCH_SIZE': 2, 'MAX_WORKERS': 1, 'MAX_RETRIES': 2, 'BACKOFF_SECONDS': 0}
+    emails = ['good@gov.bc.ca', 'flaky@gov.bc.ca', 'bad@gov.bc.ca', 'not-an-email']
+    with app.app_context():
+        report = notification.send_email_batch(
+            {'subject': 'subject', 'email': email, 'html_body': 'body', 'args': {}, 'template_id': 'id'}
+            for email in emails
+        )
+
+    assert sorted(result.email for result in report.sent) == ['flaky@gov.bc.ca', 'good@gov.bc.ca']
+    assert [result.email for result in report.failed] == ['bad@gov.bc.ca']
+    assert [result.email for result in report.skipped] == ['not-an-email']
+    # one request per batch, and only the emails not sent yet are posted again
+    assert posted_batches == [['good@gov.bc.ca', 'flaky@gov.bc.ca'], ['flaky@gov.bc.ca'],
+                              ['bad@gov.bc.ca'], ['bad@gov.bc.ca'], ['bad@gov.bc.ca']]
+    assert attempts == {'good@gov.bc.ca': 1, 'flaky@gov.bc.ca': 2, 'bad@gov.bc.ca': 3}
+
+
+@pytest.mark.parametrize(
+    'failure, expected_posts',
+    [
+        (requests.ConnectionError('refused'), 3),  # never reached the notifications API
+        (HTTPStatus.SERVICE_UNAVAILABLE, 3),
+        (HTTPStatus.TOO_MANY_REQUESTS, 3),
+        (HTTPStatus.BAD_REQUEST, 1),
+        (requests.ReadTimeout('timed out'), 1),  # the batch may have been delivered
+        (HTTPStatus.OK, 1),  # a body without results
+    ],
+)
+def test_send_email_batch_retries_undelivered_only(app, monkeypatch, failure, expected_posts):
+    """Assert that a batch is posted again only when it is known not to have been delivered."""
+    posts = []
+
+    def post(self, endpoint, headers=None, data=None, timeout=None):  # pylint: disable=unused-argument
+        posts.append(data)
+        if isinstance(failure, Exception):
+            raise failure
+        response = requests.Response()
+        response.status_code = failure
+        response._content = b'{}'  # pylint: disable=protected-access
+        return response
+
+    monkeypatch.setattr(requests.Session, 'post', post)
+    monkeypatch.setattr(RestService, 'get_service_account_token', lambda *args, **kwargs: 'token')
+    app.config['SEND_EMAIL_INTERNAL_ONLY'] = False
+    app.config['NOTIFICATIONS_EMAIL_BATCH_ENDPOINT'] = 'http://localhost/email/batch'
+    app.config['EMAIL_BATCH_CONFIG'] = {'BATCH_SIZE': 2, 'MAX_WORKERS': 1, 'MAX_RETRIES': 2, 'BACKOFF_SECONDS': 0}
+    with app.app_context():
+        report = notification.send_email_batch([
+            {'subject': 'subject', 'email': 'good@gov.bc.ca', 'html_body': 'body', 'args': {}, 'template_id': 'id'}
+        ])
+
+    assert len(posts) == expected_posts
+    assert [result.email for result in report.failed] == ['good@gov.bc.ca']
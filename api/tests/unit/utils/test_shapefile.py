@@ -0,0 +1,93 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests to assure the shapefile conversion.
+
+Test-Suite to ensure that shapefile uploads are converted within their limits and workspace.
+"""
+import json
+import math
+import os
+import zipfile
+
+import geopandas as gpd
+import pytest
+from shapely.geometry import Polygon
+
+from api.constants.map_detail import MapDetail
+from api.utils.shapefile import ShapefileError, ShapefileLimitError, ShapefileLimits, convert_shapefile
+
+
+LIMITS = ShapefileLimits(
+    max_uncompressed_size=1024 * 1024,
+    max_members=10,
+    max_features=10,
+    tolerances={MapDetail.MEDIUM.value: 0.0001, MapDetail.LOW.value: 0.01},
+)
+
+
+def _zip_shapefile(tmp_path, polygons):
+    """Write the polygons as a zipped shapefile and return the path of the zip."""
+    shapefile_dir = tmp_path / 'source'
+    shapefile_dir.mkdir()
+    gpd.GeoDataFrame({'name': [f'area {i}' for i in range(len(polygons))]},
+                     geometry=polygons, crs='EPSG:4326').to_file(shapefile_dir / 'areas.shp')
+    zip_path = tmp_path / 'areas.zip'
+    with zipfile.ZipFile(zip_path, 'w') as zip_ref:
+        for name in os.listdir(shapefile_dir):
+            zip_ref.write(shapefile_dir / name, name)
+    return str(zip_path)
+
+
+def _circle(points):
+    return Polygon([(-123 + 0.1 * math.cos(2 * math.pi * i / points), 49 + 0.1 * math.sin(2 * math.pi * i / points))
+                    for i in range(points)])
+
+
+def test_convert_shapefile_simplifies_geometries(tmp_path):
+    """Assert that shapefiles are converted at every level of detail, with fewer points at lower detail."""
+    zip_path = _zip_shapefile(tmp_path, [_circle(1000)])
+
+    geojson = convert_shapefile(zip_path, str(tmp_path / 'workspace'), LIMITS)
+
+    def point_count(level):
+        feature = json.loads(geojson[level])['features'][0]
+        return len(feature['geometry']['coordinates'][0])
+
+    assert point_count(MapDetail.FULL.value) > point_count(MapDetail.MEDIUM.value) > point_count(MapDetail.LOW.value)
+    assert json.loads(geojson[MapDetail.LOW.value])['features'][0]['properties']['name'] == 'area 0'
+
+
+def test_convert_shapefile_limits_features(tmp_path):
+    """Assert that shapefiles with too many features are rejected."""
+    zip_path = _zip_shapefile(tmp_path, [_circle(10)] * (LIMITS.max_features + 1))
+
+    with pytest.raises(ShapefileLimitError):
+        convert_shapefile(zip_path, str(tmp_path / 'workspace'), LIMITS)
+
+
+def test_unzip_stays_within_limits_and_workspace(tmp_path):
+    """Assert that archives escaping the workspace or too large once unzipped are rejected."""
+    escaping_zip = tmp_path / 'escaping.zip'
+    with zipfile.ZipFile(escaping_zip, 'w') as zip_ref:
+        zip_ref.writestr('../areas.shp', b'0')
+    with pytest.raises(ShapefileError):
+        convert_shapefile(str(escaping_zip), str(tmp_path / 'workspace'), LIMITS)
+    assert not (tmp_path / 'areas.shp').exists()
+
+    large_zip = tmp_path / 'large.zip'
+    with zipfile.ZipFile(large_zip, 'w', compression=zipfile.ZIP_DEFLATED) as zip_ref:
+        zip_ref.writestr('areas.shp', b'0' * (LIMITS.max_uncompressed_size + 1))
+    with pytest.raises(ShapefileLimitError):
+        convert_shapefile(str(large_zip), str(tmp_path / 'workspace'), LIMITS)
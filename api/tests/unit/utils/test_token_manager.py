@@ -0,0 +1,80 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests to assure the token manager.
+
+Test-Suite to ensure that service account tokens are cached and refreshed as expected.
+"""
+import pytest
+from freezegun import freeze_time
+
+from api.utils.token_manager import TokenManager
+
+
+KEY = ('client', 'https://issuer')
+
+
+class _InlineThread:
+    """Stand-in for threading.Thread that runs the target when started."""
+
+    def __init__(self, target, daemon=None):  # pylint: disable=unused-argument
+        self.target = target
+
+    def start(self):
+        self.target()
+
+
+@pytest.fixture()
+def token_fetcher():
+    """Return a fetcher that hands out numbered tokens valid for 300 seconds."""
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return {'access_token': f'token-{len(calls)}', 'expires_in': 300}
+
+    fetch.calls = calls
+    return fetch
+
+
+def test_token_is_reused_until_refresh_window(token_fetcher):  # pylint: disable=redefined-outer-name
+    """Assert that a token is fetched once and reused while it is fresh."""
+    with freeze_time('2024-01-01 00:00:00') as frozen_time:
+        manager = TokenManager(refresh_margin=60)
+        assert manager.get_token(KEY, token_fetcher) == 'token-1'
+        frozen_time.tick(200)
+        assert manager.get_token(KEY, token_fetcher) == 'token-1'
+        assert len(token_fetcher.calls) == 1
+
+
+def test_token_is_refreshed_in_background(monkeypatch, token_fetcher):  # pylint: disable=redefined-outer-name
+    """Assert that a token in its refresh window is still served while a new one is fetched."""
+    monkeypatch.setattr('api.utils.token_manager.threading.Thread', _InlineThread)
+    with freeze_time('2024-01-01 00:00:00') as frozen_time:
+        manager = TokenManager(refresh_margin=60)
+        manager.get_token(KEY, token_fetcher)
+        frozen_time.tick(250)
+        assert manager.get_token(KEY, token_fetcher) == 'token-1'
+        assert manager.get_token(KEY, token_fetcher) == 'token-2'
+        assert len(token_fetcher.calls) == 2
+
+
+def test_expired_token_is_fetched_synchronously(token_fetcher):  # pylint: disable=redefined-outer-name
+    """Assert that an expired token is never served."""
+    with freeze_time('2024-01-01 00:00:00') as frozen_time:
+        manager = TokenManager(refresh_margin=60)
+        manager.get_token(KEY, token_fetcher)
+        frozen_time.tick(301)
+        assert manager.get_token(KEY, token_fetcher) == 'token-2'
+        assert manager.get_token(('other-client', 'https://issuer'), token_fetcher) == 'token-3'
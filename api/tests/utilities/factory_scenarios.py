@@ -753,7 +753,7 @@ class TestEngagementSlugInfo(dict, Enum):
 
     slug1 = {
         'engagement_id': 1,
-        'slug': fake.text(max_nb_chars=20),
+        'slug': fake.slug(),
         'created_date': datetime.now().strftime('%Y-%m-%d'),
     }
 
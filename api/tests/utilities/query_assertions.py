@@ -0,0 +1,31 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Utilities to assert on the SQL statements issued by the code under test.
+
+Test helper to catch endpoints and services which start issuing more statements, e.g. N+1 queries.
+"""
+from contextlib import contextmanager
+
+from api.utils.sql_metrics import track_queries
+
+
+@contextmanager
+def assert_max_queries(max_queries: int):
+    """Do assertion that the block issues at most max_queries SQL statements."""
+    with track_queries() as stats:
+        yield stats
+    statements = '\n'.join(f'{count} x {statement}' for statement, count in stats.statements.most_common())
+    assert stats.count <= max_queries, \
+        f'{stats.count} SQL statements issued, at most {max_queries} expected:\n{statements}'
@@ -220,13 +220,53 @@ class _Config():  # pylint: disable=too-few-public-methods
 
     # The API endpoint used to send emails to participants.
     NOTIFICATIONS_EMAIL_ENDPOINT = os.getenv('NOTIFICATIONS_EMAIL_ENDPOINT')
+    # The API endpoint used to send many emails in one request.
+    NOTIFICATIONS_EMAIL_BATCH_ENDPOINT = os.getenv('NOTIFICATIONS_EMAIL_BATCH_ENDPOINT') or (
+        f'{NOTIFICATIONS_EMAIL_ENDPOINT}/batch' if NOTIFICATIONS_EMAIL_ENDPOINT else None)
+
+    # Tuning for notification.send_email_batch: emails posted per request to the batch
+    # endpoint, concurrent requests, retries per recipient and the initial retry backoff.
+    EMAIL_BATCH_CONFIG = {
+        'BATCH_SIZE': int(os.getenv('EMAIL_BATCH_SIZE', '50')),
+        'MAX_WORKERS': int(os.getenv('EMAIL_BATCH_MAX_WORKERS', '8')),
+        'MAX_RETRIES': int(os.getenv('EMAIL_BATCH_MAX_RETRIES', '3')),
+        'BACKOFF_SECONDS': float(os.getenv('EMAIL_BATCH_BACKOFF_SECONDS', '1')),
+    }
+
+    # Number of subscribers fetched from the database and emailed per batch.
+    SUBSCRIBER_BATCH_SIZE = int(os.getenv('SUBSCRIBER_BATCH_SIZE', '500'))
 
     # config for comment_redact_service
     N_DAYS = os.getenv('N_DAYS', 14)
     REDACTION_TEXT = os.getenv('REDACTION_TEXT', '[Comment Redacted]')
+    # Number of submissions redacted per transaction.
+    REDACTION_BATCH_SIZE = int(os.getenv('REDACTION_BATCH_SIZE', '500'))
 
     # config for email queue
     MAIL_BATCH_SIZE = os.getenv('MAIL_BATCH_SIZE', 10)
+    # Email queue consumer: concurrent workers per pod, seconds before a PROCESSING
+    # entry is considered abandoned and reclaimed, attempts before an entry is marked
+    # FAILED and the initial retry backoff in seconds (doubled on every attempt).
+    EMAIL_QUEUE_CONFIG = {
+        'WORKERS': int(os.getenv('EMAIL_QUEUE_WORKERS', '4')),
+        'LEASE_SECONDS': int(os.getenv('EMAIL_QUEUE_LEASE_SECONDS', '900')),
+        'MAX_ATTEMPTS': int(os.getenv('EMAIL_QUEUE_MAX_ATTEMPTS', '5')),
+        'RETRY_BACKOFF_SECONDS': int(os.getenv('EMAIL_QUEUE_RETRY_BACKOFF_SECONDS', '60')),
+    }
+
+    # Document job worker: jobs claimed per batch, seconds before a PROCESSING job is
+    # considered abandoned and reclaimed, attempts before a job is marked FAILED, and
+    # seconds before a failed job is retried, doubled on every attempt.
+    DOCUMENT_JOB_CONFIG = {
+        'BATCH_SIZE': int(os.getenv('DOCUMENT_JOB_BATCH_SIZE', '5')),
+        'LEASE_SECONDS': int(os.getenv('DOCUMENT_JOB_LEASE_SECONDS', '900')),
+        'MAX_ATTEMPTS': int(os.getenv('DOCUMENT_JOB_MAX_ATTEMPTS', '3')),
+        'RETRY_BACKOFF_SECONDS': int(os.getenv('DOCUMENT_JOB_RETRY_BACKOFF_SECONDS', '60')),
+    }
+
+    # A job issuing the same SQL statement this many times, e.g. once for every row it
+    # processes (an N+1 query), is logged when it completes. Set to 0 to disable.
+    SQL_REPEATED_STATEMENT_THRESHOLD = int(os.getenv('SQL_REPEATED_STATEMENT_THRESHOLD', '100'))
 
     # config for offset days to send reminder emails
     MAIL_ADVANCE_NOTICE_DAYS = os.getenv('CLOSING_SOON_EMAIL_ADVANCE_NOTICE_DAYS', 2)
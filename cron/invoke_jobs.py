@@ -63,38 +63,51 @@ def run(job_name):
     from tasks.publish import EngagementPublishTask
     from tasks.purge import PurgeTask
     from tasks.comment_redact import CommentRedactTask
+    from tasks.document_generation import DocumentGenerationTask
     from tasks.subscription_mailer import SubscriptionMailerTask
+    from api.utils.sql_metrics import track_queries
     application = create_app()
 
     application.app_context().push()
 
     print('Requested Job:', job_name)
-    if job_name == 'ENGAGEMENT_CLOSEOUT':
-        EngagementCloseoutTask.do_closeout()
-        application.logger.info(f'<<<< Completed Engagement Closeout Job >>>>')
-    elif job_name == 'ENGAGEMENT_PUBLISH':
-        EngagementPublishTask.do_publish()
-        application.logger.info(f'<<<< Completed Engagement Publish Job >>>>')
-    elif job_name == 'PURGE':
-        PurgeTask.do_purge()
-        application.logger.info('<<<< Completed Event Log Purge >>>>')
-    elif job_name == 'COMMENT_REDACT':
-        CommentRedactTask.do_redact()
-        application.logger.info('<<<< Completed Comment Redaction >>>>')
-    elif job_name == 'PUBLISH_EMAIL':
-        SubscriptionMailerTask.do_email()
-        application.logger.info(
-            '<<<< Completed sending engagement publication notification emails >>>>'
-        )
-    elif job_name == 'CLOSING_SOON_EMAIL':
-        EngagementClosingSoonMailer.do_email()
-        application.logger.info(
-            '<<<< Completed sending engagement closing soon notification emails >>>>'
-        )
-    else:
-        application.logger.debug(
-            'No valid args passed. Exiting without running any jobs. ***************'
-        )
+    with track_queries() as query_stats:
+        if job_name == 'ENGAGEMENT_CLOSEOUT':
+            EngagementCloseoutTask.do_closeout()
+            application.logger.info(f'<<<< Completed Engagement Closeout Job >>>>')
+        elif job_name == 'ENGAGEMENT_PUBLISH':
+            EngagementPublishTask.do_publish()
+            application.logger.info(f'<<<< Completed Engagement Publish Job >>>>')
+        elif job_name == 'PURGE':
+            PurgeTask.do_purge()
+            application.logger.info('<<<< Completed Event Log Purge >>>>')
+        elif job_name == 'COMMENT_REDACT':
+            CommentRedactTask.do_redact()
+            application.logger.info('<<<< Completed Comment Redaction >>>>')
+        elif job_name == 'DOCUMENT_GENERATION':
+            DocumentGenerationTask.do_generate()
+            application.logger.info('<<<< Completed Document Generation >>>>')
+        elif job_name == 'PUBLISH_EMAIL':
+            SubscriptionMailerTask.do_email()
+            application.logger.info(
+                '<<<< Completed sending engagement publication notification emails >>>>'
+            )
+        elif job_name == 'CLOSING_SOON_EMAIL':
+            EngagementClosingSoonMailer.do_email()
+            application.logger.info(
+                '<<<< Completed sending engagement closing soon notification emails >>>>'
+            )
+        else:
+            application.logger.debug(
+                'No valid args passed. Exiting without running any jobs. ***************'
+            )
+
+    application.logger.info(
+        f'<<<< {job_name} issued {query_stats.count} SQL statements in {query_stats.seconds:.2f}s >>>>'
+    )
+    threshold = application.config['SQL_REPEATED_STATEMENT_THRESHOLD']
+    for statement, count in query_stats.repeated_statements(threshold):
+        application.logger.warning(f'<<<< {job_name} issued the same statement {count} times: {statement} >>>>')
 
 
 if __name__ == "__main__":
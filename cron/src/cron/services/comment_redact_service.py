@@ -1,16 +1,10 @@
+import time
 from datetime import datetime, timedelta
-from typing import List
 
 from flask import current_app
 
-from api.constants.engagement_status import Status as EngagementStatus
-from api.constants.comment_status import Status as CommentStatus
-from api.constants.user import SYSTEM_USER
 from api.models.comment import Comment as CommentModel
-from api.models.engagement import Engagement as EngagementModel
-from api.models.submission import Submission as SubmissionModel
 from api.models.db import db
-from sqlalchemy import and_
 
 
 class CommentRedactService:  # pylint: disable=too-few-public-methods
@@ -20,68 +14,32 @@ class CommentRedactService:  # pylint: disable=too-few-public-methods
     def do_redact_comments():
         """Perform the redaction on rejected comments.
 
-            1. Get submissions for engagements closed for N_DAYS
+            Submissions are redacted in batches of REDACTION_BATCH_SIZE, each in its own transaction:
+            1. Get rejected submissions not redacted yet, for engagements closed for N_DAYS
             2. Redact comments in comments table by submission_ids
-            3. Redact comments in submission_json by submission_ids
+            3. Redact comments in submission_json by submission_ids, and mark the submissions redacted
 
         """
-        n_days: int = int(current_app.config.get('N_DAYS'))
-        submissions = CommentRedactService._find_submissions_for_n_days_closed_engagements(days=current_app.config.get(n_days, 14))
-        if not submissions:
-            current_app.logger.info(f'>>>>>No Submissions for Engagements closed for {current_app.config.get(n_days, 14)} days found.')
-            return        
-        current_app.logger.info('>>>>>Total Submissions to redact found: %s.', len(submissions))
-        submissions_ids = [submission.id for submission in submissions]
-        CommentRedactService._redact_comments_by_submission_ids(submissions_ids)
-        CommentRedactService._redact_submission_json_comments(submissions_ids)
-        db.session.commit()
-
-
-    @staticmethod
-    def _find_submissions_for_n_days_closed_engagements(days) -> List[SubmissionModel]:        
-        current_app.logger.info(f'>>>>>Finding submissions for Engagements closed for {days} days.')
-        n_days_ago = datetime.utcnow().date() - timedelta(days=days)
-        return db.session.query(SubmissionModel)\
-            .join(EngagementModel, EngagementModel.id == SubmissionModel.engagement_id)\
-            .filter(and_(
-                EngagementModel.end_date <= n_days_ago,
-                EngagementModel.status_id == EngagementStatus.Closed.value,
-                SubmissionModel.comment_status_id == CommentStatus.Rejected.value,
-                SubmissionModel.has_threat.is_(False)))\
-            .all()
-
-
-    @staticmethod
-    def _redact_comments_by_submission_ids(submission_ids: List[int]):
-        current_app.logger.info(f'>>>>>Redacting comments for submissions: {submission_ids}')
-        db.session.query(CommentModel)\
-        .filter(CommentModel.submission_id.in_(submission_ids))\
-        .update(
-            {
-                CommentModel.text: current_app.config.get('REDACTION_TEXT', '[Comment Redacted]'),                
-                CommentModel.updated_by: SYSTEM_USER,
-                CommentModel.updated_date: datetime.utcnow(),
-            },
-            synchronize_session=False)
-
-
-    @staticmethod
-    def _redact_submission_json_comments(submission_ids: List[int]):
-        current_app.logger.info(f'>>>>>Fetching keys to redact aka component_types from comments for submissions: {submission_ids}')
-        comments = db.session.query(CommentModel)\
-        .filter(CommentModel.submission_id.in_(submission_ids))\
-        .all()
-        # e.g. ['simpletextarea', 'simpletextarea1', 'simpletextfield']
-        keys_to_redact = [comment.component_id for comment in comments]
-
-        current_app.logger.info(f'>>>>>Redacting comments in submission_json for submissions: {submission_ids}')
-        for submission in db.session.query(SubmissionModel).filter(SubmissionModel.id.in_(submission_ids)):
-            new_submission_json = {}
-            for key, value in submission.submission_json.items():
-                if key in keys_to_redact:
-                    new_submission_json[key] = current_app.config.get('REDACTION_TEXT', '[Comment Redacted]')
-                else:
-                    new_submission_json[key] = value
-            submission.submission_json = new_submission_json
-            submission.updated_by = SYSTEM_USER
-            submission.updated_date = datetime.utcnow()
+        n_days = int(current_app.config.get('N_DAYS', 14))
+        batch_size = int(current_app.config.get('REDACTION_BATCH_SIZE', 500))
+        redaction_text = current_app.config.get('REDACTION_TEXT', '[Comment Redacted]')
+
+        started = time.monotonic()
+        submission_count = comment_count = 0
+        last_id = 0
+        closed_on_or_before = datetime.utcnow().date() - timedelta(days=n_days)
+        while submission_ids := CommentModel.find_submission_ids_to_redact(closed_on_or_before, last_id, batch_size):
+            current_app.logger.info(
+                f'>>>>>Redacting comments for {len(submission_ids)} submissions up to {submission_ids[-1]}')
+            comment_count += CommentModel.redact_submissions(submission_ids, redaction_text)
+            db.session.commit()
+            submission_count += len(submission_ids)
+            last_id = submission_ids[-1]
+
+        if not submission_count:
+            current_app.logger.info(f'>>>>>No Submissions to redact for Engagements closed for {n_days} days found.')
+            return
+        elapsed = time.monotonic() - started
+        current_app.logger.info(
+            '>>>>>Redacted %s submissions and %s comments in %.2fs (%.0f rows/s).',
+            submission_count, comment_count, elapsed, (submission_count + comment_count) / max(elapsed, 1e-6))
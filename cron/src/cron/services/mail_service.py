@@ -1,5 +1,6 @@
 from datetime import datetime
 from http import HTTPStatus
+from itertools import islice
 from typing import List
 
 from flask import current_app
@@ -11,9 +12,6 @@ from api.models.participant import Participant as ParticipantModel
 from api.models.subscription import Subscription as SubscriptionModel
 from api.services.email_verification_service import EmailVerificationService
 from api.utils import notification
-from cron.utils.subscription_checker import CheckSubscription
-
-from api.models.db import db
 
 
 class EmailService:  # pylint: disable=too-few-public-methods
@@ -21,36 +19,42 @@ class EmailService:  # pylint: disable=too-few-public-methods
 
     @staticmethod
     def _send_email_notification_for_subscription(engagement_id, template_id, subject, template):
+        """Email every subscriber of the engagement, streaming and sending them in batches."""
         engagement: EngagementModel = EngagementModel.find_by_id(engagement_id)
+        batch_size = int(current_app.config.get('SUBSCRIBER_BATCH_SIZE'))
+        engagement_args = EmailService._get_engagement_email_args(engagement)
 
-        # find emails from the subscription table
-        subscription_list: List[SubscriptionModel] = db.session.query(SubscriptionModel).distinct().filter(
-            SubscriptionModel.is_subscribed == True).all()
-        subscriber: SubscriptionModel
-        email_list = []
-        for subscriber in subscription_list:
-            is_subscribed = CheckSubscription.check_subscription(subscriber, engagement_id)
-            if is_subscribed:
+        subscribers = SubscriptionModel.get_subscribed_participants(engagement.id, engagement.tenant_id, batch_size)
+        report = notification.EmailBatchReport()
+        email_list = set()
+        while batch := list(islice(subscribers, batch_size)):
+            messages = []
+            for participant_id, encoded_email_address in batch:
                 try:
-                    participant = ParticipantModel.find_by_id(subscriber.participant_id)
-                    if participant.email_address is not None:
-                        email_address = ParticipantModel.decode_email(participant.email_address)
-                        if email_address not in email_list:
-                            email_list.append(email_address)
-                            body, args = EmailService._render_email_template(engagement, participant, template)
-                            EmailService._send_email_notification(subject,
-                                                                  email_address,
-                                                                  body,
-                                                                  args,
-                                                                  template_id)
+                    email_address = ParticipantModel.decode_email(encoded_email_address)
                 except Exception as exc:  # noqa: B902
-                    current_app.logger.error('<Extracting email address for subscribers failed', exc)
+                    current_app.logger.error('<Extracting email address for subscriber %s failed: %s',
+                                             participant_id, exc)
                     raise BusinessException(
                         error='Error extracting email address for subscribers.',
                         status_code=HTTPStatus.INTERNAL_SERVER_ERROR) from exc
+                if email_address in email_list:
+                    continue
+                email_list.add(email_address)
+                body, args = EmailService._render_email_template(engagement_args, participant_id, template)
+                messages.append({
+                    'subject': subject,
+                    'email': email_address,
+                    'html_body': body,
+                    'args': args,
+                    'template_id': template_id,
+                })
+            report.results.extend(EmailService._send_email_notifications(messages).results)
+        return report
 
     @staticmethod
-    def _render_email_template(engagement, participant, template):
+    def _get_engagement_email_args(engagement):
+        """Return the template arguments shared by every recipient of an engagement email."""
         site_url = notification.get_tenant_site_url(engagement.tenant_id)
         tenant_name = EmailService._get_tenant_name(engagement.tenant_id)
         # TODO should be re-visited once the engagement metadata functionality of completed
@@ -60,17 +64,30 @@ class EmailService:  # pylint: disable=too-few-public-methods
             # project_name = metadata_model.project_metadata.get('project_name')
         paths = current_app.config['PATH_CONFIG']
         view_path = paths['ENGAGEMENT']['VIEW'].format(engagement_id=engagement.id)
-        unsubscribe_url = paths['UNSUBSCRIBE'].format(
-            engagement_id=engagement.id, participant_id=participant.id)
         email_environment = current_app.config['EMAIL_TEMPLATES']['ENVIRONMENT']
         # TODO should be re-visited once the engagement metadata functionality of completed
-        args = {
+        return {
+            'engagement_id': engagement.id,
+            'site_url': site_url,
             'project_name': engagement.name,
             'survey_url': f'{site_url}{view_path}',
             'end_date': datetime.strftime(engagement.end_date, EmailVerificationService.full_date_format),
             'tenant_name': tenant_name,
             'email_environment': email_environment,
-            'unsubscribe_url': f'{site_url}{unsubscribe_url}',
+        }
+
+    @staticmethod
+    def _render_email_template(engagement_args, participant_id, template):
+        paths = current_app.config['PATH_CONFIG']
+        unsubscribe_url = paths['UNSUBSCRIBE'].format(
+            engagement_id=engagement_args['engagement_id'], participant_id=participant_id)
+        args = {
+            'project_name': engagement_args.get('project_name'),
+            'survey_url': engagement_args.get('survey_url'),
+            'end_date': engagement_args.get('end_date'),
+            'tenant_name': engagement_args.get('tenant_name'),
+            'email_environment': engagement_args.get('email_environment'),
+            'unsubscribe_url': f'{engagement_args["site_url"]}{unsubscribe_url}',
         }
         body = template.render(
             project_name=args.get('project_name'),
@@ -88,15 +105,16 @@ class EmailService:  # pylint: disable=too-few-public-methods
         return tenant.name
 
     @staticmethod
-    def _send_email_notification(subject, email, body, args, template_id):
+    def _send_email_notifications(messages: List[dict]) -> notification.EmailBatchReport:
+        """Send the emails as one batch; individual failures are reported rather than aborting the batch."""
         try:
-            notification.send_email(subject=subject,
-                                    email=email,
-                                    html_body=body,
-                                    args=args,
-                                    template_id=template_id)                
+            report = notification.send_email_batch(messages)
         except Exception as exc:  # noqa: B902
             current_app.logger.error('<Notification for publish engagement failed', exc)
             raise BusinessException(
                 error='Error sending publish engagement notification email.',
                 status_code=HTTPStatus.INTERNAL_SERVER_ERROR) from exc
+        for result in report.failed:
+            current_app.logger.error('<Notification to %s failed after %s attempts: %s',
+                                     result.email, result.attempts, result.error)
+        return report
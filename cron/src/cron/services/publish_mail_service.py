@@ -1,38 +1,108 @@
-from datetime import datetime
+import os
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
 
 from flask import current_app
-from api.constants.notification_status import NotificationStatus
 from api.models.email_queue import EmailQueue as EmailQueueModel
 from api.utils.template import Template
 from cron.services.mail_service import EmailService
 
 
+@dataclass
+class EmailQueueMetrics:
+    """Throughput counters for one run of the email queue consumer."""
+
+    claimed: int = 0
+    sent: int = 0
+    retried: int = 0
+    failed: int = 0
+    recipients: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        """Return the seconds since the run started."""
+        return time.monotonic() - self.started
+
+    @property
+    def mails_per_second(self) -> float:
+        """Return the number of queue entries completed per second."""
+        elapsed = self.elapsed
+        return (self.sent + self.failed) / elapsed if elapsed else 0.0
+
+    def as_dict(self) -> dict:
+        """Return the counters as a dict suitable for logging."""
+        return {
+            'claimed': self.claimed,
+            'sent': self.sent,
+            'retried': self.retried,
+            'failed': self.failed,
+            'recipients': self.recipients,
+            'elapsed_seconds': round(self.elapsed, 2),
+            'mails_per_second': round(self.mails_per_second, 2),
+        }
+
+
 class PublishEmailService:  # pylint: disable=too-few-public-methods
     """Mail for newly published engagements"""
 
     @staticmethod
-    def do_mail():
-        """Send mail by listening to the email_queue.
+    def do_mail() -> EmailQueueMetrics:
+        """Send mail by consuming the email_queue.
 
-            1. Get N number of unprocessed recoreds from the email_queue table
-            2. Process each mail and send it to subscribed users
+            1. Claim N due records from the email_queue table with FOR UPDATE SKIP LOCKED,
+               so that several cron pods can consume the queue without double-sends
+            2. Send each claimed mail to subscribed users across the worker pool
+            3. Record the outcome; failed mails are retried with backoff until MAX_ATTEMPTS
+            4. Repeat until no due records are left
 
         """
+        queue_config = current_app.config['EMAIL_QUEUE_CONFIG']
         email_batch_size: int = int(current_app.config.get('MAIL_BATCH_SIZE'))
-        mails = EmailQueueModel.get_unprocessed_mails_for_open_engagements(email_batch_size)
-        mail: EmailQueueModel
-        templates = current_app.config['EMAIL_TEMPLATES']
-        template_id = templates['PUBLISH']['ID']
-        subject = templates['PUBLISH']['SUBJECT']
-        template = Template.get_template('publish_engagement.html')
-        for mail in mails:
-            # Process each mails.First set status as PROCESSING
-            mail.notification_status = NotificationStatus.PROCESSING.value
-            mail.updated_date = datetime.utcnow()
-            mail.commit()
-
-            EmailService._send_email_notification_for_subscription(mail.entity_id, template_id,
-                                                                    subject, template)
-            mail.notification_status = NotificationStatus.SENT.value
-            mail.updated_date = datetime.utcnow()
-            mail.commit()
+        worker_id = f'{socket.gethostname()}:{os.getpid()}'
+        app = current_app._get_current_object()  # pylint: disable=protected-access
+        metrics = EmailQueueMetrics()
+
+        with ThreadPoolExecutor(max_workers=queue_config['WORKERS']) as executor:
+            while mails := EmailQueueModel.claim_mails_for_open_engagements(
+                    email_batch_size, worker_id, queue_config['LEASE_SECONDS']):
+                metrics.claimed += len(mails)
+                claimed = [(mail.id, mail.entity_id, mail.attempts) for mail in mails]
+                for outcome, recipients in executor.map(
+                        lambda entry: PublishEmailService._process_mail(app, *entry), claimed):
+                    setattr(metrics, outcome, getattr(metrics, outcome) + 1)
+                    metrics.recipients += recipients
+
+        current_app.logger.info('Email queue run by %s finished: %s', worker_id, metrics.as_dict())
+        return metrics
+
+    @staticmethod
+    def _process_mail(app, mail_id: int, engagement_id: int, attempts: int):
+        """Send one queued mail in its own app context and record the outcome."""
+        with app.app_context():
+            queue_config = current_app.config['EMAIL_QUEUE_CONFIG']
+            templates = current_app.config['EMAIL_TEMPLATES']
+            try:
+                report = EmailService._send_email_notification_for_subscription(
+                    engagement_id, templates['PUBLISH']['ID'], templates['PUBLISH']['SUBJECT'],
+                    Template.get_template('publish_engagement.html'))
+            except Exception as exc:  # noqa: B902
+                current_app.logger.error('Sending queued mail %s failed on attempt %s: %s',
+                                         mail_id, attempts, exc)
+                if attempts >= queue_config['MAX_ATTEMPTS']:
+                    EmailQueueModel.mark_failed(mail_id, str(exc))
+                    return 'failed', 0
+                backoff = queue_config['RETRY_BACKOFF_SECONDS'] * 2 ** (attempts - 1)
+                EmailQueueModel.mark_failed(mail_id, str(exc), datetime.utcnow() + timedelta(seconds=backoff))
+                return 'retried', 0
+
+            # Recipients the batch sender could not reach are not retried here, since
+            # re-queueing the mail would send it again to everyone who already received it.
+            if report.failed:
+                current_app.logger.warning('Queued mail %s could not be delivered to %s subscribers',
+                                           mail_id, len(report.failed))
+            EmailQueueModel.mark_sent(mail_id)
+            return 'sent', len(report.sent)
@@ -0,0 +1,34 @@
+# Copyright © 2019 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Task to generate the documents requested through document jobs."""
+import os
+import socket
+from datetime import datetime
+
+from flask import current_app
+from api.services.document_job_service import DocumentJobService
+
+
+class DocumentGenerationTask:  # pylint:disable=too-few-public-methods
+    """Task to generate the documents of pending document jobs."""
+
+    @classmethod
+    def do_generate(cls):
+        """Generate documents until no pending jobs are left."""
+        print('Starting document generation at------------------------', datetime.now())
+
+        job_config = current_app.config['DOCUMENT_JOB_CONFIG']
+        worker_id = f'{socket.gethostname()}:{os.getpid()}'
+        outcomes = DocumentJobService.process_pending_jobs(worker_id, job_config)
+        current_app.logger.info('Document jobs run by %s finished: %s', worker_id, outcomes)
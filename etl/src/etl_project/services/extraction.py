@@ -0,0 +1,66 @@
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import func, inspect
+
+
+# number of rows read from the source database per batch
+EXTRACT_BATCH_SIZE = int(os.getenv('ETL_EXTRACT_BATCH_SIZE', 1000))
+
+
+# Rows of a source table that changed since the last run cycle.
+# Extract ops only record what to read, so Dagster passes this small, picklable
+# description between ops instead of every row. Load ops then read the rows as
+# plain tuples in keyset-paginated batches, which bounds the memory they need by
+# the batch size rather than by the size of the table.
+@dataclass(frozen=True)
+class Extraction:
+    model: type
+    since: datetime
+    # column compared with the last run cycle time
+    date_column: str = 'created_date'
+    # module level functions of the model returning additional filter criteria
+    criteria: Tuple[Callable, ...] = ()
+    # rows created after the extract op ran are left for the next run cycle
+    max_id: Optional[int] = None
+
+    @classmethod
+    def start(cls, session, model, since, **kwargs) -> 'Extraction':
+        extraction = cls(model, since, **kwargs)
+        max_id = session.query(func.max(model.id)).filter(*extraction._filters()).scalar()
+        return cls(model, since, max_id=max_id or 0, **kwargs)
+
+    def _filters(self) -> list:
+        filters = [getattr(self.model, self.date_column) > self.since]
+        filters.extend(criterion(self.model) for criterion in self.criteria)
+        if self.max_id is not None:
+            filters.append(self.model.id <= self.max_id)
+        return filters
+
+    def batches(self, session, batch_size: int = EXTRACT_BATCH_SIZE) -> Iterator[List[tuple]]:
+        columns = [getattr(self.model, column.key) for column in inspect(self.model).column_attrs]
+        last_id = 0
+        while True:
+            rows = session.query(*columns) \
+                .filter(*self._filters(), self.model.id > last_id) \
+                .order_by(self.model.id) \
+                .limit(batch_size) \
+                .all()
+            if not rows:
+                return
+            yield rows
+            last_id = rows[-1].id
+
+
+def updated_after_creation(model):
+    return model.updated_date != model.created_date
+
+
+# read the rows of each extraction in turn, skipping extractions that were not started
+def extract_batches(session, *extractions: Optional[Extraction],
+                    batch_size: int = EXTRACT_BATCH_SIZE) -> Iterator[List[tuple]]:
+    for extraction in extractions:
+        if extraction is not None:
+            yield from extraction.batches(session, batch_size)
@@ -7,6 +7,7 @@ from api.constants.comment_status import Status as CommentStatus
 from analytics_api.models.user_feedback import UserFeedback as UserFeedbackModel
 from analytics_api.models.survey import Survey as EtlSurveyModel
 from analytics_api.models.etlruncycle import EtlRunCycle as EtlRunCycleModel
+from etl_project.services.extraction import Extraction, extract_batches
 
 
 # get the last run cycle id for comments etl
@@ -57,13 +58,13 @@ def extract_comments(
         comments_last_run_cycle_datetime,
         comments_new_run_cycle_id):
     session = context.resources.engagement_db_session
-    new_comments = []
+    new_comments = None
 
     for last_run_cycle_time in comments_last_run_cycle_datetime:
         context.log.info("started extracting new data from comments table")
-        new_comments = session.query(CommentModel).filter(
-            CommentModel.submission_date > last_run_cycle_time,
-            CommentModel.status_id == CommentStatus.Approved.value).all()
+        new_comments = Extraction.start(
+            session, CommentModel, last_run_cycle_time,
+            date_column='submission_date', criteria=(_is_approved,))
 
     yield Output(new_comments, "new_comments")
 
@@ -76,18 +77,22 @@ def extract_comments(
     session.close()
 
 
+def _is_approved(model):
+    return model.status_id == CommentStatus.Approved.value
+
+
 # load the comments created after last run to the analytics database
 @op(required_resource_keys={"engagement_db_session",
     "etl_db_session"},
     out={"comments_new_run_cycle_id": Out()})
 def load_comments(context, new_comments, comments_new_run_cycle_id):
+    engagement_session = context.resources.engagement_db_session
     session = context.resources.etl_db_session
 
-    if len(new_comments) > 0:
-
-        context.log.info("loading new comments")
+    context.log.info("loading new comments")
 
-        for comment in new_comments:
+    for comments in extract_batches(engagement_session, new_comments):
+        for comment in comments:
 
             etl_survey = session.query(
                 EtlSurveyModel.id).filter(
@@ -113,12 +118,13 @@ def load_comments(context, new_comments, comments_new_run_cycle_id):
 
                 session.add(user_feedback_model)
 
-                session.commit()
+        session.commit()
 
     yield Output(comments_new_run_cycle_id, "comments_new_run_cycle_id")
 
     context.log.info("completed loading comments table")
 
+    engagement_session.close()
     session.close()
 
 
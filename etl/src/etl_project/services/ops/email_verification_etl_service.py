@@ -6,6 +6,7 @@ from api.models.email_verification import EmailVerification as EmailVerification
 from api.models.survey import Survey as SurveyModel
 from analytics_api.models.email_verification import EmailVerification as EtlEmailVerificationModel
 from analytics_api.models.etlruncycle import EtlRunCycle as EtlRunCycleModel
+from etl_project.services.extraction import Extraction, extract_batches, updated_after_creation
 
 
 # get the last run cycle id for email verification etl
@@ -63,23 +64,21 @@ def extract_email_ver(
         email_ver_new_run_cycle_id):
     session = context.resources.engagement_db_session
     default_datetime = datetime(1900, 1, 1, 0, 0, 0, 0)
-    new_email_ver = []
-    updated_email_ver = []
+    new_email_ver = None
+    updated_email_ver = None
 
     for last_run_cycle_time in email_ver_last_run_cycle_datetime:
 
         context.log.info(
             "started extracting new data from email_verification table")
-        new_email_ver = session.query(EmailVerificationModel).filter(
-            EmailVerificationModel.created_date > last_run_cycle_time).all()
+        new_email_ver = Extraction.start(session, EmailVerificationModel, last_run_cycle_time)
 
         if last_run_cycle_time > default_datetime:
             context.log.info(
                 "started extracting updated data from email_verification table")
-            updated_email_ver = session.query(EmailVerificationModel).filter(
-                EmailVerificationModel.updated_date > last_run_cycle_time,
-                EmailVerificationModel.updated_date != EmailVerificationModel.created_date
-            ).all()
+            updated_email_ver = Extraction.start(
+                session, EmailVerificationModel, last_run_cycle_time,
+                date_column='updated_date', criteria=(updated_after_creation,))
 
     yield Output(new_email_ver, "new_email_ver")
 
@@ -106,13 +105,10 @@ def load_email_ver(
         email_ver_new_run_cycle_id):
     engagement_session = context.resources.engagement_db_session
     session = context.resources.etl_db_session
-    all_email_ver = new_email_ver + updated_email_ver
+    context.log.info("loading new email verification")
 
-    if len(all_email_ver) > 0:
-
-        context.log.info("loading new email verification")
-
-        for email_ver in all_email_ver:
+    for email_vers in extract_batches(engagement_session, new_email_ver, updated_email_ver):
+        for email_ver in email_vers:
             session.query(EtlEmailVerificationModel).filter(
                 EtlEmailVerificationModel.source_email_ver_id == email_ver.id).update(
                 {'is_active': False})
@@ -132,7 +128,7 @@ def load_email_ver(
 
             session.add(email_ver_model)
 
-            session.commit()
+        session.commit()
 
     yield Output(email_ver_new_run_cycle_id, "email_ver_new_run_cycle_id")
 
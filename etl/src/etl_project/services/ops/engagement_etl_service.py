@@ -7,6 +7,7 @@ from analytics_api.models.engagement import Engagement as EtlEngagementModel
 from sqlalchemy import func
 from datetime import datetime, timezone
 from analytics_api.models.etlruncycle import EtlRunCycle as EtlRunCycleModel
+from etl_project.services.extraction import Extraction, extract_batches
 
 
 # get the last run cycle id for engagement etl
@@ -55,24 +56,20 @@ def get_engagement_last_run_cycle_time(context, flag_to_run_step_after_user):
 def extract_engagement(context, eng_last_run_cycle_time, eng_new_runcycleid):
     session = context.resources.engagement_db_session
     default_datetime = datetime(1900, 1, 1, 0, 0, 0, 0)
-    new_engagements = []
-    updated_engagements = []
+    new_engagements = None
+    updated_engagements = None
 
     for last_run_cycle_time in eng_last_run_cycle_time:
         context.log.info("started extracting new data from engagement table")
-        new_engagements = session.query(EngagementModel).filter(
-            EngagementModel.created_date > last_run_cycle_time,
-            EngagementModel.status_id != EngagementStatus.Draft.value).all()
+        new_engagements = Extraction.start(
+            session, EngagementModel, last_run_cycle_time, criteria=(_is_not_draft,))
 
         context.log.info(last_run_cycle_time)
-        context.log.info(len(new_engagements))
 
         if last_run_cycle_time > default_datetime:
-            updated_engagements = session.query(EngagementModel).filter(
-                EngagementModel.updated_date > last_run_cycle_time,
-                EngagementModel.status_id != EngagementStatus.Draft.value).all()
-
-        context.log.info(len(updated_engagements))
+            updated_engagements = Extraction.start(
+                session, EngagementModel, last_run_cycle_time,
+                date_column='updated_date', criteria=(_is_not_draft,))
 
     yield Output(new_engagements, "new_engagements")
 
@@ -87,6 +84,10 @@ def extract_engagement(context, eng_last_run_cycle_time, eng_new_runcycleid):
     session.close()
 
 
+def _is_not_draft(model):
+    return model.status_id != EngagementStatus.Draft.value
+
+
 # load the engagement created or updated after last run to the analytics
 # database
 @op(required_resource_keys={"engagement_db_session",
@@ -99,11 +100,9 @@ def load_engagement(
         engagement_new_runcycleid):
     engagement_session = context.resources.engagement_db_session
     session = context.resources.etl_db_session
-    all_engagements = new_engagements + updated_engagements
-    if len(all_engagements) > 0:
-
-        context.log.info("loading new engagement")
-        for engagement in all_engagements:
+    context.log.info("loading new engagement")
+    for engagements in extract_batches(engagement_session, new_engagements, updated_engagements):
+        for engagement in engagements:
             session.query(EtlEngagementModel).filter(
                 EtlEngagementModel.source_engagement_id == engagement.id
             ).update({'is_active': False})
@@ -141,7 +140,8 @@ def load_engagement(
                 marker_label=marker_label,
                 status_name=engagement_status.status_name)
             session.add(engagement_model)
-            session.commit()
+
+        session.commit()
 
     yield Output(engagement_new_runcycleid, "engagement_new_runcycleid")
 
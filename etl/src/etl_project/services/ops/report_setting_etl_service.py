@@ -6,6 +6,7 @@ from analytics_api.models.etlruncycle import EtlRunCycle as EtlRunCycleModel
 from analytics_api.models.request_type_option import RequestTypeOption as EtlRequestTypeOptionModel
 from analytics_api.models.survey import Survey as EtlSurveyModel
 from api.models.report_setting import ReportSetting as ReportSettingModel
+from etl_project.services.extraction import Extraction, extract_batches, updated_after_creation
 
 
 # get the last run cycle id for report setting etl
@@ -62,21 +63,20 @@ def extract_setting(
         setting_new_runcycleid):
     session = context.resources.engagement_db_session
     default_datetime = datetime(1900, 1, 1, 0, 0, 0, 0)
-    new_setting = []
-    updated_setting = []
+    new_setting = None
+    updated_setting = None
 
     for last_run_cycle_time in setting_last_run_cycle_time:
         context.log.info(
             "started extracting new data from report setting table")
-        new_setting = session.query(ReportSettingModel).filter(
-            ReportSettingModel.created_date > last_run_cycle_time).all()
+        new_setting = Extraction.start(session, ReportSettingModel, last_run_cycle_time)
 
         if last_run_cycle_time > default_datetime:
             context.log.info(
                 "started extracting updated data from report setting table")
-            updated_setting = session.query(ReportSettingModel).filter(
-                ReportSettingModel.updated_date > last_run_cycle_time,
-                ReportSettingModel.updated_date != ReportSettingModel.created_date).all()
+            updated_setting = Extraction.start(
+                session, ReportSettingModel, last_run_cycle_time,
+                date_column='updated_date', criteria=(updated_after_creation,))
 
     yield Output(new_setting, "new_setting")
 
@@ -101,12 +101,12 @@ def load_setting(
         new_setting,
         updated_setting,
         setting_new_runcycleid):
+    engagement_session = context.resources.engagement_db_session
     etl_db_session = context.resources.etl_db_session
-    all_settings = new_setting + updated_setting
-    if len(all_settings) > 0:
 
-        context.log.info("loading new inputs")
-        for setting in all_settings:
+    context.log.info("loading new inputs")
+    for settings in extract_batches(engagement_session, new_setting, updated_setting):
+        for setting in settings:
             # get the survey id from analytics database based on the source
             # system survey id
             analytics_survey_data = etl_db_session.query(EtlSurveyModel)\
@@ -122,12 +122,14 @@ def load_setting(
                 {
                     'display': setting.display},
                 synchronize_session=False)
-            etl_db_session.commit()
+
+        etl_db_session.commit()
 
     yield Output(setting_new_runcycleid, "setting_new_runcycleid")
 
     context.log.info("completed loading report setting table")
 
+    engagement_session.close()
     etl_db_session.close()
 
 
@@ -1,5 +1,7 @@
+import os
+
 from dagster import Out, Output, op
-from sqlalchemy import func
+from sqlalchemy import func, insert
 from datetime import datetime, timezone
 
 from analytics_api.models.etlruncycle import EtlRunCycle as EtlRunCycleModel
@@ -9,20 +11,25 @@ from api.models.participant import Participant as ParticipantModel
 from analytics_api.models.response_type_option import (
     ResponseTypeOption as EtlResponseTypeOptionModel
 )
+from analytics_api.models.response_option_count import (
+    ResponseOptionCount as EtlResponseOptionCountModel
+)
 from analytics_api.models.user_response_detail import (
     UserResponseDetail as EtlUserResponseDetailModel
 )
 from analytics_api.models.survey import Survey as EtlSurveyModel
 from analytics_api.utils.util import FormIoComponentType
+from etl_project.services.extraction import Extraction, extract_batches, updated_after_creation
 
 
 # Perform the ETL on submissions.
 # 1.Extract data out of submission.
-# 2.Iterate form_json.components.
-# 3.Check Type and save to db
+# 2.Index the option type questions of each survey in form_json.components.
+# 3.Build the responses for each submission and save them to db in chunks
 DEFAULT_DATETIME = datetime(2022, 8, 1, 0, 0, 0, 0)
 DECORATION = '<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<<'
-REVERSE_DECORATION = DECORATION.replace('<', '>')
+# number of submissions loaded per transaction
+LOAD_CHUNK_SIZE = int(os.getenv('ETL_LOAD_CHUNK_SIZE', 1000))
 
 # get the last run cycle id for submission etl
 
@@ -79,25 +86,21 @@ def extract_submission(
         submission_last_run_cycle_time,
         submission_new_runcycleid):
     session = context.resources.engagement_db_session
-    new_submission = []
-    updated_submission = []
+    new_submission = None
+    updated_submission = None
 
     for last_run_cycle_time in submission_last_run_cycle_time:
 
         context.log.info("started extracting new data from submission table")
-        new_submission = session.query(SubmissionModel).filter(
-            SubmissionModel.created_date > last_run_cycle_time).all()
+        new_submission = Extraction.start(session, SubmissionModel, last_run_cycle_time)
 
 # commenting out the logic for updated submission, this is not needed as of now
         if last_run_cycle_time > DEFAULT_DATETIME:
             context.log.info(
                 "started extracting updated data from submission table")
-            updated_submission = session.query(
-                SubmissionModel
-            ).filter(SubmissionModel.updated_date >
-                     last_run_cycle_time,
-                     SubmissionModel.updated_date !=
-                     SubmissionModel.created_date).all()
+            updated_submission = Extraction.start(
+                session, SubmissionModel, last_run_cycle_time,
+                date_column='updated_date', criteria=(updated_after_creation,))
 
     yield Output(new_submission, "new_submission")
 
@@ -122,64 +125,50 @@ def load_submission(
         new_submission,
         updated_submission,
         submission_new_runcycleid):
-    all_submissions = new_submission + updated_submission
     engagement_session = context.resources.engagement_db_session
     etl_session = context.resources.etl_db_session
-    # check if there are any new or updated records
-    if len(all_submissions) > 0:
-
-        context.log.info("loading new submissions")
-        # go thru each submission.
-        for submission in all_submissions:
-
-            engagement_survey = engagement_session.query(SurveyModel).filter(
-                SurveyModel.id == submission.survey_id).first()
-            etl_survey = etl_session.query(EtlSurveyModel).filter(
-                EtlSurveyModel.source_survey_id == submission.survey_id,
-                EtlSurveyModel.is_active).first()
-
-            context.log.info(
-                f'{DECORATION}Extraction starting for Submission id %s. Survey: %s.',
-                submission.id,
-                engagement_survey.id)
 
+    context.log.info("loading new submissions")
+    # load the submissions in chunks, each written in a single transaction
+    for chunk in extract_batches(engagement_session, new_submission, updated_submission,
+                                 batch_size=LOAD_CHUNK_SIZE):
+        surveys = _get_surveys(engagement_session, etl_session, chunk)
+        participant_ids = _get_participant_ids(engagement_session, chunk)
+        survey_components = {}
+        response_rows = []
+
+        for submission in chunk:
+            engagement_survey, etl_survey = surveys.get(submission.survey_id, (None, None))
             if not etl_survey or not engagement_survey:
                 context.log.info(
                     f'{DECORATION}Skipping extraction for Submission id %s. '
                     'Survey Not Found in Analytics DB: %s. Probably a very old survey',
                     submission.id,
-                    engagement_survey.id)
+                    submission.survey_id)
                 continue
 
-            form_type = engagement_survey.form_json.get('display', None)
-
-            # check and load data for single page survey.
-            if form_type == 'form':
-                form_questions = engagement_survey.form_json.get('components', None)
-                _extract_submission(
-                    form_questions,
-                    engagement_survey,
-                    engagement_session,
-                    submission,
-                    etl_session,
-                    context,
-                    submission_new_runcycleid,
-                    etl_survey)
-
-            # check and load data for multi page survey.
-            if form_type == 'wizard':
-                pages = engagement_survey.form_json.get('components', None)
-                for page in pages:
-                    form_questions = page.get('components', None)
-                    _extract_submission(
-                        form_questions,
-                        engagement_survey,
-                        engagement_session,
-                        submission,
-                        etl_session,
-                        context,
-                        submission_new_runcycleid,
-                        etl_survey)
+            if engagement_survey.id not in survey_components:
+                survey_components[engagement_survey.id] = _index_survey_components(
+                    context, engagement_survey)
+
+            participant_id = (
+                submission.participant_id if submission.participant_id in participant_ids else None)
+            response_rows.extend(_build_response_rows(
+                survey_components[engagement_survey.id],
+                submission,
+                etl_survey,
+                participant_id,
+                submission_new_runcycleid))
+
+        if response_rows:
+            etl_session.execute(insert(EtlResponseTypeOptionModel.__table__), response_rows)
+        etl_session.commit()
+        context.log.info(
+            'Loaded %s responses for %s submissions', len(response_rows), len(chunk))
+
+    # add the responses loaded in this run to the pre-aggregated survey results
+    context.log.info("updating response option counts")
+    EtlResponseOptionCountModel.add_runcycle_responses(submission_new_runcycleid, etl_session)
 
     engagement_session.close()
 
@@ -188,325 +177,136 @@ def load_submission(
     yield Output(submission_new_runcycleid, "submission_new_runcycleid")
 
 
-# load data to table response_type_textarea
-def _extract_submission(
-        form_questions,
-        engagement_survey,
-        engagement_session,
-        submission,
-        etl_session,
-        context,
-        submission_new_runcycleid,
-        etl_survey):
-    if (form_questions) is None:
-        # throw error or notify by logging
-        context.log.info(
-            'Survey Found without any component in form_json: %s.Skipping it',
-            engagement_survey.id)
-        return
-
-    user = engagement_session.query(ParticipantModel).filter(
-        ParticipantModel.id == submission.participant_id).first()
-
-    context.log.info(
-        'User : %s Found for submission id : %s with mappedd user id %s',
-        user,
-        submission.id,
-        submission.participant_id)
-
-    for component in form_questions:
-        # go thru each component type and check for answer in the submission_json.
-        # instead of going through each answer and iterate , we find the
-        # questions from the form and try to get the answer.
-        answer_key = submission.submission_json.get(component['key'])
-
-        if not (answer_key):
-            continue
-
-        # TODO comments related to category type question has a different
-        # format in the source system
-        # TODO the key needs to be finalized in the source system before doing a fix on the ETL.
-        # for now excluding the comment for a category type question as we are
-        # not using this data for analytics.
-        if component['key'] == 'categorycommentcontainer':
-            continue
+# fetch the source and analytics surveys for the submissions, keyed by source survey id
+def _get_surveys(engagement_session, etl_session, submissions):
+    survey_ids = {submission.survey_id for submission in submissions}
+    engagement_surveys = engagement_session.query(SurveyModel).filter(
+        SurveyModel.id.in_(survey_ids))
+    etl_surveys = {
+        etl_survey.source_survey_id: etl_survey
+        for etl_survey in etl_session.query(EtlSurveyModel).filter(
+            EtlSurveyModel.source_survey_id.in_(survey_ids),
+            EtlSurveyModel.is_active)
+    }
+    return {
+        survey.id: (survey, etl_surveys.get(survey.id))
+        for survey in engagement_surveys
+    }
+
+
+def _get_participant_ids(engagement_session, submissions):
+    participant_ids = {submission.participant_id for submission in submissions}
+    return {
+        participant_id for participant_id, in engagement_session.query(ParticipantModel.id).filter(
+            ParticipantModel.id.in_(participant_ids))
+    }
+
+
+# collect the option type questions of a survey along with their value to label mappings
+def _index_survey_components(context, engagement_survey):
+    form_type = engagement_survey.form_json.get('display', None)
+    if form_type == 'form':
+        pages = [engagement_survey.form_json.get('components', None)]
+    elif form_type == 'wizard':
+        pages = [
+            page.get('components', None)
+            for page in engagement_survey.form_json.get('components', None) or []
+        ]
+    else:
+        pages = []
 
-        component_type = component['type'].lower()
-        context.log.info(
-            'Type for submission id : %s. is %s ',
-            submission.id,
-            component_type)
-
-        if component_type == FormIoComponentType.RADIO.value:
-            _save_radio(
-                etl_session,
-                context,
-                answer_key,
-                component,
-                etl_survey,
-                user,
-                submission,
-                submission_new_runcycleid)
-        elif component_type == FormIoComponentType.CHECKBOX.value:
-            _save_checkbox(
-                etl_session,
-                context,
-                answer_key,
-                component,
-                etl_survey,
-                user,
-                submission,
-                submission_new_runcycleid)
-        elif component_type == FormIoComponentType.SELECTLIST.value:
-            _save_select(
-                etl_session,
-                context,
-                answer_key,
-                component,
-                etl_survey,
-                user,
-                submission,
-                submission_new_runcycleid)
-        elif component_type == FormIoComponentType.SURVEY.value:
-            _save_survey(
-                etl_session,
-                context,
-                answer_key,
-                component,
-                etl_survey,
-                user,
-                submission,
-                submission_new_runcycleid)
-        else:
+    components = []
+    for form_questions in pages:
+        if form_questions is None:
+            # throw error or notify by logging
             context.log.info(
-                'No Mapping Found for .Type for submission id : %s. is %s .Skipping',
-                submission.id,
-                component_type)
-        context.log.info(
-            f'{REVERSE_DECORATION}Extraction Done for Submission id %s. Survey: %s.',
-            submission.id,
-            engagement_survey.id)
-
-        etl_session.commit()
-
+                'Survey Found without any component in form_json: %s.Skipping it',
+                engagement_survey.id)
+            continue
 
-# load responses for a radio type question
-def _save_radio(
-        etl_session,
-        context,
-        answer_key,
-        component,
-        survey,
-        participant,
-        submission,
-        submission_new_runcycleid):
-    # radio responses just has the key to the value selected, so value has to
-    # be found from question
-    context.log.info(
-        'Input type Radio is created:survey id: %s. request_key is %s ',
-        survey.id,
-        component['key'])
-    answer_key_str = str(answer_key)
-    answer = next((x for x in component.get('values')
-                  if x.get('value') == answer_key_str), None)
-
-    if not answer:
-        return
-
-    answer_value = answer.get('label')
-    context.log.info(
-        'Input type Radio is created:survey id: %s. request_key is %s value:%s request_id:%s',
-        survey.id,
-        component['key'],
-        answer_value,
-        component['id'])
-
-    _save_options(
-        etl_session,
-        survey,
-        component,
-        answer_value,
-        getattr(
-            participant,
-            'id',
-            None),
-        submission_new_runcycleid,
-        submission)
-
-
-# load responses for a checkbox type question
-def _save_checkbox(
-        etl_session,
-        context,
-        answer_key,
-        component,
-        survey,
-        participant,
-        submission,
-        submission_new_runcycleid):
-    # checkbox responses just has the key to the value selected, so value has
-    # to be found from question
-    context.log.info(
-        'Input type Selectbox is created:survey id: %s. request_key is %s  Answer Key %s',
-        survey.id,
-        component['key'],
-        answer_key)
-
-    selectbox_mapping = {}
-
-    if component.get('values') is not None:
-        for item in component.get('values'):
-            selectbox_mapping[item.get('value')] = item.get('label')
-
-    if answer_key is not None:
-        for key, value in answer_key.items():
-            # each answer is a row for simplecheckboxes. It belongs to answer
-            # in a multiple checkbox
-            is_yes = _is_truthy(value)
-
-            if is_yes:
-                # need to find the label of the drop down.
-                answer_label = selectbox_mapping.get(key)
+        for component in form_questions:
+            # TODO comments related to category type question has a different
+            # format in the source system
+            # TODO the key needs to be finalized in the source system before doing a fix on the ETL.
+            # for now excluding the comment for a category type question as we are
+            # not using this data for analytics.
+            if component['key'] == 'categorycommentcontainer':
+                continue
 
+            component_type = component['type'].lower()
+            if component_type == FormIoComponentType.SELECTLIST.value:
+                values = component.get('data').get('values')
+            elif component_type in (FormIoComponentType.RADIO.value,
+                                    FormIoComponentType.CHECKBOX.value,
+                                    FormIoComponentType.SURVEY.value):
+                values = component.get('values')
+            else:
                 context.log.info(
-                    'Input type Selectbox is created:survey id: %s. '
-                    'request_key is %s value:%s request_id:%s',
-                    survey.id,
-                    component['key'],
-                    answer_label,
-                    component['id'])
-
-                _save_options(
-                    etl_session,
-                    survey,
-                    component,
-                    answer_label,
-                    getattr(
-                        participant,
-                        'id',
-                        None),
-                    submission_new_runcycleid,
-                    submission)
-
-
-# load responses for a select type question
-def _save_select(
-        etl_session,
-        context,
-        answer_key,
-        component,
-        survey,
-        participant,
-        submission,
-        submission_new_runcycleid):
-    # selected responses just has the key to the value selected, so value has
-    # to be found from question
-    context.log.info(
-        'Input type Select is created:survey id: %s. request_key is %s ',
-        survey.id,
-        component['key'])
-    answer_key_str = str(answer_key)
-    component_data = component.get('data')
-    answer = next((x for x in component_data.get('values')
-                  if x.get('value') == answer_key_str), None)
-
-    if not answer:
-        return
-
-    answer_value = answer.get('label')
-    context.log.info(
-        'Input type Select is created:survey id: %s. request_key is %s value:%s request_id:%s',
-        survey.id,
-        component['key'],
-        answer_value,
-        component['id'])
-
-    _save_options(
-        etl_session,
-        survey,
-        component,
-        answer_value,
-        getattr(
-            participant,
-            'id',
-            None),
-        submission_new_runcycleid,
-        submission)
-
-
-# load responses for a survey type question
-def _save_survey(
-        etl_session,
-        context,
-        answer_key,
-        component,
-        survey,
-        participant,
-        submission,
-        submission_new_runcycleid):
-    # selected survey just has the key to the value selected, so value has to
-    # be found from question
-    context.log.info(
-        'Input type Survey is created:survey id: %s. request_key is %s ',
-        survey.id,
-        component['key'])
+                    'No Mapping Found for .Type for survey id : %s. is %s .Skipping',
+                    engagement_survey.id,
+                    component_type)
+                continue
 
-    survey_mapping = {}
+            labels = {}
+            for item in values or []:
+                if component_type in (FormIoComponentType.CHECKBOX.value,
+                                      FormIoComponentType.SURVEY.value):
+                    labels[item.get('value')] = item.get('label')
+                else:
+                    # radio and select take the first option matching the answer
+                    labels.setdefault(item.get('value'), item.get('label'))
 
-    if component.get('values') is not None:
-        for item in component.get('values'):
-            survey_mapping[item.get('value')] = item.get('label')
+            components.append((component['key'], component['id'], component_type, labels))
+    return components
 
-    if answer_key is not None:
-        for key, value in answer_key.items():
-            answer_label = survey_mapping.get(value)
 
-            context.log.info(
-                'Input type Survey is created:survey id: %s. '
-                'request_key is %s value:%s request_id:%s',
-                survey.id,
-                component['key'],
-                answer_label,
-                component['id'])
-
-            # id for survey type question is same for all sub questions so request id
-            # is a combination of id and the key
-            radio_response = EtlResponseTypeOptionModel(
-                survey_id=survey.id,
-                request_key=component['key'] + '-' + key,
-                value=answer_label,
-                request_id=component['id'] + '-' + key,
-                participant_id=getattr(participant, 'id', None),
-                is_active=True,
-                runcycle_id=submission_new_runcycleid,
-                created_date=submission.created_date,
-                updated_date=submission.updated_date
-            )
-
-            etl_session.add(radio_response)
-
-
-def _save_options(
-        etl_session,
-        survey,
-        component,
-        value,
-        participant,
-        submission_new_runcycleid,
-        submission):
-    radio_response = EtlResponseTypeOptionModel(
-        survey_id=survey.id,
-        request_key=component['key'],
-        value=value,
-        request_id=component['id'],
-        participant_id=getattr(participant, 'id', None),
-        is_active=True,
-        runcycle_id=submission_new_runcycleid,
-        created_date=submission.created_date,
-        updated_date=submission.updated_date
-    )
+# build the response rows for the answers in a submission
+def _build_response_rows(
+        components,
+        submission,
+        etl_survey,
+        participant_id,
+        submission_new_runcycleid):
+    rows = []
+
+    def add_row(request_key, request_id, value):
+        rows.append({
+            'survey_id': etl_survey.id,
+            'request_key': request_key,
+            'value': value,
+            'request_id': request_id,
+            'participant_id': participant_id,
+            'is_active': True,
+            'runcycle_id': submission_new_runcycleid,
+            'created_date': submission.created_date,
+            'updated_date': submission.updated_date,
+        })
+
+    for key, component_id, component_type, labels in components:
+        # go thru each option type question and check for answer in the submission_json.
+        answer_key = submission.submission_json.get(key)
+
+        if not answer_key:
+            continue
 
-    etl_session.add(radio_response)
+        # radio and select responses just have the key to the value selected, so
+        # the value has to be found from the question
+        if component_type in (FormIoComponentType.RADIO.value,
+                              FormIoComponentType.SELECTLIST.value):
+            answer_key_str = str(answer_key)
+            if answer_key_str in labels:
+                add_row(key, component_id, labels[answer_key_str])
+        # each selected option in a checkbox question is a row
+        elif component_type == FormIoComponentType.CHECKBOX.value:
+            for option, selected in answer_key.items():
+                if _is_truthy(selected):
+                    add_row(key, component_id, labels.get(option))
+        # id for survey type question is same for all sub questions so request id
+        # is a combination of id and the key
+        elif component_type == FormIoComponentType.SURVEY.value:
+            for option, value in answer_key.items():
+                add_row(key + '-' + option, component_id + '-' + option, labels.get(value))
+    return rows
 
 
 def _is_truthy(answer):
@@ -531,22 +331,13 @@ def load_user_response_details(
 
     engagement_session = context.resources.engagement_db_session
 
-    all_submissions = new_submission + updated_submission
-
-    if len(all_submissions) > 0:
-
-        for submission in all_submissions:
+    for chunk in extract_batches(engagement_session, new_submission, updated_submission,
+                                 batch_size=LOAD_CHUNK_SIZE):
+        surveys = _get_surveys(engagement_session, session, chunk)
+        user_response_details = []
 
-            engagement_survey = engagement_session.query(SurveyModel).filter(
-                SurveyModel.id == submission.survey_id).first()
-            etl_survey = session.query(EtlSurveyModel).filter(
-                EtlSurveyModel.source_survey_id == submission.survey_id,
-                EtlSurveyModel.is_active).first()
-            context.log.info(
-                f'{DECORATION}User Response Detail Extraction starting '
-                'for Submission id %s. Survey: %s.',
-                submission.id,
-                engagement_survey.id)
+        for submission in chunk:
+            engagement_survey, etl_survey = surveys.get(submission.survey_id, (None, None))
             # submission without survey is probably an old updated survey not
             # beiing loaded to analytics db.Wont happen in prod
             if not etl_survey or not engagement_survey:
@@ -554,26 +345,24 @@ def load_user_response_details(
                     f'{DECORATION}Skipping User Response Detail Extractionfor Submission id %s. '
                     'Survey Not Found in Analytics DB: %s. Probably a very old survey',
                     submission.id,
-                    engagement_survey.id)
+                    submission.survey_id)
                 continue
 
-            context.log.info(
-                'Creating new EtlUserResponseDetailModel in Analytics DB: %s.',
-                submission.id)
-
-            user_response_detail = EtlUserResponseDetailModel(
-                survey_id=etl_survey.id,
-                engagement_id=engagement_survey.engagement_id,
-                participant_id=submission.participant_id,
-                is_active=True,
-                runcycle_id=submission_new_runcycleid,
-                created_date=submission.created_date,
-                updated_date=submission.updated_date
-            )
-
-            session.add(user_response_detail)
-
-            session.commit()
+            user_response_details.append({
+                'survey_id': etl_survey.id,
+                'engagement_id': engagement_survey.engagement_id,
+                'participant_id': submission.participant_id,
+                'is_active': True,
+                'runcycle_id': submission_new_runcycleid,
+                'created_date': submission.created_date,
+                'updated_date': submission.updated_date,
+            })
+
+        if user_response_details:
+            session.execute(insert(EtlUserResponseDetailModel.__table__), user_response_details)
+        session.commit()
+        context.log.info(
+            'Loaded user response details for %s submissions', len(user_response_details))
 
     engagement_session.close()
 
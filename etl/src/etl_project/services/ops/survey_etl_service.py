@@ -6,12 +6,17 @@ from analytics_api.models.request_type_option import RequestTypeOption as EtlReq
 from analytics_api.models.response_type_option import (
     ResponseTypeOption as EtlResponseTypeOptionModel
 )
+from analytics_api.models.response_option_count import (
+    ResponseOptionCount as EtlResponseOptionCountModel
+)
 from analytics_api.models.survey import Survey as EtlSurveyModel
 from analytics_api.utils.util import FormIoComponentType
+from etl_project.services.extraction import Extraction, extract_batches, updated_after_creation
 from dagster import Out, Output, op
 from datetime import datetime, timezone
 from api.models.survey import Survey as SurveyModel
-from sqlalchemy import func
+from sqlalchemy import func, insert
+import time
 
 
 # get the last run cycle id for survey etl
@@ -58,21 +63,20 @@ def get_survey_last_run_cycle_time(context, flag_to_run_step_after_engagement):
 def extract_survey(context, survey_last_run_cycle_time, survey_new_runcycleid):
     session = context.resources.engagement_db_session
     default_datetime = datetime(1900, 1, 1, 0, 0, 0, 0)
-    new_survey = []
-    updated_survey = []
+    new_survey = None
+    updated_survey = None
 
     for last_run_cycle_time in survey_last_run_cycle_time:
 
         context.log.info("started extracting new data from survey table")
-        new_survey = session.query(SurveyModel).filter(
-            SurveyModel.created_date > last_run_cycle_time).all()
+        new_survey = Extraction.start(session, SurveyModel, last_run_cycle_time)
 
         if last_run_cycle_time > default_datetime:
             context.log.info(
                 "started extracting updated data from survey table")
-            updated_survey = session.query(SurveyModel).filter(
-                SurveyModel.updated_date > last_run_cycle_time,
-                SurveyModel.updated_date != SurveyModel.created_date).all()
+            updated_survey = Extraction.start(
+                session, SurveyModel, last_run_cycle_time,
+                date_column='updated_date', criteria=(updated_after_creation,))
 
     yield Output(new_survey, "new_survey")
 
@@ -92,132 +96,57 @@ def extract_survey(context, survey_last_run_cycle_time, survey_new_runcycleid):
     "etl_db_session"},
     out={"survey_new_runcycleid": Out()})
 def load_survey(context, new_survey, updated_survey, survey_new_runcycleid):
+    engagement_session = context.resources.engagement_db_session
     session = context.resources.etl_db_session
-    all_surveys = new_survey + updated_survey
-
-    if len(all_surveys) > 0:
-
-        context.log.info("loading new survey")
-        for survey in all_surveys:
-
-            _do_etl_survey_data(session, survey, survey_new_runcycleid)
-
-            _update_survey_responses_with_active_survey_id(session, survey)
-
-            if survey.form_json is None:
-                context.log.info(
-                    'Survey Found without form_json: %s. Skipping it',
-                    survey.id)
-                continue
 
-            form_type = survey.form_json.get('display', None)
-
-            page_position = 0  # Initialize the page-level position
-
-            # check and load data for single page survey.
-            if form_type == 'form':
-                form_components = survey.form_json.get('components', None)
-                page_position = extract_survey_components(
-                    context, session, survey,
-                    survey_new_runcycleid, form_components, page_position
-                )
-
-            # check and load data for multi page survey.
-            if form_type == 'wizard':
-                pages = survey.form_json.get('components', None)
-                for page in pages:
-                    form_components = page.get('components', None)
-                    page_position = extract_survey_components(
-                        context, session, survey,
-                        survey_new_runcycleid, form_components, page_position
-                    )
+    context.log.info("loading new survey")
+    for surveys in extract_batches(engagement_session, new_survey, updated_survey):
+        for survey in surveys:
+            started = time.monotonic()
+            request_count, option_count = _load_survey(
+                context, session, survey, survey_new_runcycleid)
+            context.log.info(
+                'Survey %s loaded with %s requests and %s available options in %.3fs',
+                survey.id, request_count, option_count, time.monotonic() - started)
 
     yield Output(survey_new_runcycleid, "survey_new_runcycleid")
 
     context.log.info("completed loading survey table")
 
+    engagement_session.close()
     session.close()
 
 
-# extract components within a survey
-def extract_survey_components(
-        context,
-        session,
-        survey,
-        survey_new_runcycleid,
-        form_components,
-        position):
-    if (form_components) is None:
-        context.log.info(
-            'Survey Found without any component in form_json: %s. Skipping it',
-            survey.id)
-        return position
-
-    _refresh_questions_and_available_option_status(session, survey.id)
-
-    for component in form_components:
-        position = position + 1
-        component_type = component.get('type', None)
-        context.log.info(
-            'Survey: %s.%s Processing component with id %s and type: %s and label %s ',
-            survey.id,
-            survey.name,
-            component.get(
-                'id',
-                None),
-            component_type,
-            component.get(
-                'label',
-                None))
-
-        if not component_type:
-            continue
+# load a survey and its requests in a single transaction.
+# every table is written with one set-based statement per survey, rather than
+# one statement and commit per row.
+def _load_survey(context, session, survey, survey_new_runcycleid):
+    previous_survey_ids = [survey_id for survey_id, in session.query(EtlSurveyModel.id).filter(
+        EtlSurveyModel.source_survey_id == survey.id)]
 
-        has_valid_question_type = _validate_form_type(context, component_type)
-
-        if has_valid_question_type:
-            etl_survey = session.query(
-                EtlSurveyModel.id).filter(
-                EtlSurveyModel.source_survey_id == survey.id,
-                EtlSurveyModel.is_active)
-            etl_survey_ids = [survey_id[0] for survey_id in etl_survey]
-            for survey_id in etl_survey_ids:
-                position = _do_etl_survey_inputs(
-                    session,
-                    survey_id,
-                    component,
-                    component_type,
-                    survey_new_runcycleid,
-                    position)
-                _load_available_response_option(
-                    session, survey_id, component, component_type, survey_new_runcycleid)
-
-    return position
+    etl_survey_id = _do_etl_survey_data(session, survey, survey_new_runcycleid)
 
+    if previous_survey_ids:
+        _deactivate_previous_survey_versions(session, previous_survey_ids, etl_survey_id)
 
-# deactivate if record exists in analytics database
-def _refresh_questions_and_available_option_status(session, source_survey_id):
-    etl_survey_model = session.query(
-        EtlSurveyModel.id).filter(
-        EtlSurveyModel.source_survey_id == source_survey_id,
-        not EtlSurveyModel.is_active)
-    if not etl_survey_model:
-        return
+    request_rows, option_rows = _build_survey_rows(
+        context, survey, etl_survey_id, survey_new_runcycleid)
+    if request_rows:
+        session.execute(insert(EtlRequestTypeOption.__table__), request_rows)
+    if option_rows:
+        session.execute(insert(EtlAvailableResponseOption.__table__), option_rows)
 
-    status_inactive = {'is_active': False}
+    # the responses now belong to the active survey, so rebuild the pre-aggregated survey results.
+    # the refresh commits, which ends the transaction for this survey.
+    EtlResponseOptionCountModel.refresh(previous_survey_ids + [etl_survey_id], session=session)
 
-    etl_survey_ids = [survey_id[0] for survey_id in etl_survey_model]
-    for survey_id in etl_survey_ids:
-        session.query(EtlRequestTypeOption).filter(
-            EtlRequestTypeOption.survey_id == survey_id).update(status_inactive)
-        session.query(EtlAvailableResponseOption).filter(
-            EtlAvailableResponseOption.survey_id == survey_id).update(status_inactive)
-        session.commit()  # commit after each update to avoid locking issues
+    return len(request_rows), len(option_rows)
 
 
 def _do_etl_survey_data(session, survey, survey_new_runcycleid):
     session.query(EtlSurveyModel).filter(
-        EtlSurveyModel.source_survey_id == survey.id).update({'is_active': False})
+        EtlSurveyModel.source_survey_id == survey.id).update(
+        {'is_active': False}, synchronize_session=False)
 
     survey_model = EtlSurveyModel(
         name=survey.name,
@@ -230,148 +159,131 @@ def _do_etl_survey_data(session, survey, survey_new_runcycleid):
         generate_dashboard=survey.generate_dashboard)
 
     session.add(survey_model)
+    session.flush()
 
-    session.commit()
+    return survey_model.id
 
 
-# load data to table request type tables
-def _do_etl_survey_inputs(
-        session,
-        survey_id,
-        component,
-        component_type,
-        survey_new_runcycleid,
-        position):
-    if component_type == FormIoComponentType.SURVEY.value:
-        questions = component.get('questions', None)
+# move the responses of earlier versions of the survey to the active version and
+# deactivate the requests and options of the earlier versions
+def _deactivate_previous_survey_versions(session, previous_survey_ids, etl_survey_id):
+    status_inactive = {'is_active': False}
 
-        if not questions:
-            return position
+    session.query(EtlResponseTypeOptionModel).filter(
+        EtlResponseTypeOptionModel.survey_id.in_(previous_survey_ids)).update(
+        {'survey_id': etl_survey_id}, synchronize_session=False)
+    session.query(EtlRequestTypeOption).filter(
+        EtlRequestTypeOption.survey_id.in_(previous_survey_ids)).update(
+        status_inactive, synchronize_session=False)
+    session.query(EtlAvailableResponseOption).filter(
+        EtlAvailableResponseOption.survey_id.in_(previous_survey_ids)).update(
+        status_inactive, synchronize_session=False)
 
-        for question in questions:
-            position = position + 1
-            model_name = EtlRequestTypeOption(
-                survey_id=survey_id,
-                request_id=component['id'] +
-                '-' +
-                question['value'],
-                label=question['label'],
-                is_active=True,
-                key=component['key'] +
-                '-' +
-                question['value'],
-                type=component['type'],
-                runcycle_id=survey_new_runcycleid,
-                position=position)
-
-            session.add(model_name)
-
-            session.commit()
+
+# build the request type and available response option rows for every component of the survey
+def _build_survey_rows(context, survey, etl_survey_id, survey_new_runcycleid):
+    request_rows = []
+    option_rows = []
+
+    if survey.form_json is None:
+        context.log.info(
+            'Survey Found without form_json: %s. Skipping it',
+            survey.id)
+        return request_rows, option_rows
+
+    form_type = survey.form_json.get('display', None)
+
+    # check and load data for single page survey.
+    if form_type == 'form':
+        pages = [survey.form_json]
+    # check and load data for multi page survey.
+    elif form_type == 'wizard':
+        pages = survey.form_json.get('components', None) or []
     else:
-        model_name = EtlRequestTypeOption(survey_id=survey_id,
-                                          request_id=component['id'],
-                                          label=component['label'],
-                                          is_active=True,
-                                          key=component['key'],
-                                          type=component['type'],
-                                          runcycle_id=survey_new_runcycleid,
-                                          position=position
-                                          )
+        pages = []
 
-        session.add(model_name)
+    position = 0  # page-level position, carried across pages
+    for page in pages:
+        form_components = page.get('components', None)
+        if form_components is None:
+            context.log.info(
+                'Survey Found without any component in form_json: %s. Skipping it',
+                survey.id)
+            continue
 
-        session.commit()
+        for component in form_components:
+            position = position + 1
+            component_type = component.get('type', None)
+            context.log.info(
+                'Survey: %s.%s Processing component with id %s and type: %s and label %s ',
+                survey.id,
+                survey.name,
+                component.get('id', None),
+                component_type,
+                component.get('label', None))
+
+            if not component_type or not _validate_form_type(context, component_type):
+                continue
 
-    return position
+            common = {
+                'survey_id': etl_survey_id,
+                'is_active': True,
+                'runcycle_id': survey_new_runcycleid,
+            }
+            position = _build_request_rows(
+                request_rows, common, component, component_type, position)
+            _build_available_response_rows(option_rows, common, component, component_type)
 
+    return request_rows, option_rows
 
-# load data to table available response option
-def _load_available_response_option(
-        session,
-        survey_id,
-        component,
-        component_type,
-        survey_new_runcycleid):
 
+# rows for table request type option
+def _build_request_rows(rows, common, component, component_type, position):
     if component_type == FormIoComponentType.SURVEY.value:
-        _load_survey_available_response(
-            session, component, survey_id, survey_new_runcycleid)
+        for question in component.get('questions', None) or []:
+            position = position + 1
+            rows.append({
+                **common,
+                'request_id': component['id'] + '-' + question['value'],
+                'label': question['label'],
+                'key': component['key'] + '-' + question['value'],
+                'type': component['type'],
+                'position': position,
+            })
+    else:
+        rows.append({
+            **common,
+            'request_id': component['id'],
+            'label': component['label'],
+            'key': component['key'],
+            'type': component['type'],
+            'position': position,
+        })
+
+    return position
+
+
+# rows for table available response option
+def _build_available_response_rows(rows, common, component, component_type):
+    if component_type == FormIoComponentType.SURVEY.value:
+        values = component.get('values', None)
+        request_keys = [component['key'] + '-' + question['value']
+                        for question in component.get('questions', None) or []]
     elif component_type == FormIoComponentType.SELECTLIST.value:
-        _load_selectlist_available_response(
-            session, component, survey_id, survey_new_runcycleid)
+        values = (component.get('data', None) or {}).get('values', None)
+        request_keys = [component['key']]
     else:
-        _load_default_available_response(
-            session, component, survey_id, survey_new_runcycleid)
-
-
-def _load_survey_available_response(
-        session,
-        component,
-        survey_id,
-        survey_new_runcycleid):
-    values = component.get('values', None)
-    if not values:
-        return
-
-    questions = component.get('questions', None)
-    if not questions:
-        return
-
-    for question in questions:
-        request_key = component['key'] + '-' + question['value']
-        _do_etl_available_response_data(session, component, survey_id, values,
-                                        request_key, survey_new_runcycleid)
-
-
-def _load_selectlist_available_response(
-        session,
-        component,
-        survey_id,
-        survey_new_runcycleid):
-    data = component.get('data', None)
-    values = data.get('values', None)
-
-    if not values:
-        return
-
-    request_key = component['key']
-    _do_etl_available_response_data(session, component, survey_id, values,
-                                    request_key, survey_new_runcycleid)
-
-
-def _load_default_available_response(
-        session,
-        component,
-        survey_id,
-        survey_new_runcycleid):
-    values = component.get('values', None)
-    if not values:
-        return
-
-    request_key = component['key']
-    _do_etl_available_response_data(session, component, survey_id, values,
-                                    request_key, survey_new_runcycleid)
-
-
-def _do_etl_available_response_data(
-        session,
-        component,
-        survey_id,
-        values,
-        request_key,
-        survey_new_runcycleid):
-    for value in values:
-        model_name = EtlAvailableResponseOption(
-            survey_id=survey_id,
-            request_key=request_key,
-            value=value['label'],
-            request_id=component['id'],
-            is_active=True,
-            runcycle_id=survey_new_runcycleid)
-
-        session.add(model_name)
+        values = component.get('values', None)
+        request_keys = [component['key']]
 
-    session.commit()
+    for request_key in request_keys:
+        for value in values or []:
+            rows.append({
+                **common,
+                'request_key': request_key,
+                'value': value['label'],
+                'request_id': component['id'],
+            })
 
 
 def _validate_form_type(context, component_type):
@@ -389,7 +301,6 @@ def _validate_form_type(context, component_type):
             component_type)
         return False
 
-
 # update the status for survey etl in run cycle table as successful
 @op(required_resource_keys={"engagement_db_session",
     "etl_db_session"},
@@ -416,28 +327,3 @@ def survey_end_run_cycle(context, survey_new_runcycleid):
     yield Output("survey", "flag_to_run_step_after_survey")
 
 
-def _update_survey_responses_with_active_survey_id(session, survey):
-    etl_active_survey_id = session.query(
-        EtlSurveyModel.id).filter(
-        EtlSurveyModel.source_survey_id == survey.id,
-        EtlSurveyModel.is_active).scalar()
-
-    subquery = (
-        session.query(EtlSurveyModel.id)
-        .filter(EtlSurveyModel.source_survey_id == survey.id)
-        .subquery()
-    )
-
-    # Fetch response records
-    response_records = session.query(EtlResponseTypeOptionModel).filter(
-        EtlResponseTypeOptionModel.survey_id.in_(subquery)).all()
-
-    # Update each response record individually
-    for record in response_records:
-        session.query(EtlResponseTypeOptionModel).filter(
-            EtlResponseTypeOptionModel.id == record.id
-        ).update(
-            {'survey_id': etl_active_survey_id}, synchronize_session='fetch'
-        )
-
-    session.commit()
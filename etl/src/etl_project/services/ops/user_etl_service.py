@@ -5,6 +5,7 @@ from datetime import datetime, timezone
 from api.models.participant import Participant as ParticipantModel
 from analytics_api.models.user_details import UserDetails as EtlUserDetailsModel
 from analytics_api.models.etlruncycle import EtlRunCycle as EtlRunCycleModel
+from etl_project.services.extraction import Extraction, extract_batches, updated_after_creation
 
 
 # get the last run cycle id for user detail etl
@@ -56,21 +57,20 @@ def extract_participant(
         user_details_new_run_cycle_id):
     session = context.resources.engagement_db_session
     default_datetime = datetime(1900, 1, 1, 0, 0, 0, 0)
-    new_participants = []
-    updated_participants = []
+    new_participants = None
+    updated_participants = None
 
     for last_run_cycle_time in user_details_last_run_cycle_datetime:
 
         context.log.info("started extracting new data from user_details table")
-        new_participants = session.query(ParticipantModel).filter(
-            ParticipantModel.created_date > last_run_cycle_time).all()
+        new_participants = Extraction.start(session, ParticipantModel, last_run_cycle_time)
 
         if last_run_cycle_time > default_datetime:
             context.log.info(
                 "started extracting updated data from user_details table")
-            updated_participants = session.query(ParticipantModel).filter(
-                ParticipantModel.updated_date > last_run_cycle_time,
-                ParticipantModel.updated_date != ParticipantModel.created_date).all()
+            updated_participants = Extraction.start(
+                session, ParticipantModel, last_run_cycle_time,
+                date_column='updated_date', criteria=(updated_after_creation,))
 
     yield Output(new_participants, "new_participants")
 
@@ -94,14 +94,13 @@ def load_user(
         new_participants,
         updated_participants,
         user_details_new_run_cycle_id):
+    engagement_session = context.resources.engagement_db_session
     session = context.resources.etl_db_session
-    all_participants = new_participants + updated_participants
 
-    if len(all_participants) > 0:
+    context.log.info("loading new participants")
 
-        context.log.info("loading new participants")
-
-        for participant in all_participants:
+    for participants in extract_batches(engagement_session, new_participants, updated_participants):
+        for participant in participants:
             session.query(EtlUserDetailsModel).filter(
                 EtlUserDetailsModel.name == participant.email_address).update({'is_active': False})
             user_model = EtlUserDetailsModel(
@@ -113,12 +112,13 @@ def load_user(
 
             session.add(user_model)
 
-            session.commit()
+        session.commit()
 
     yield Output(user_details_new_run_cycle_id, "user_details_new_run_cycle_id")
 
     context.log.info("completed loading user_details table")
 
+    engagement_session.close()
     session.close()
 
 
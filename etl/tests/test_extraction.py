@@ -0,0 +1,103 @@
+"""Tests for reading the rows changed since the last run cycle in keyset-paginated batches."""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import Column, DateTime, Integer, String, create_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+from etl_project.services.extraction import Extraction, extract_batches, updated_after_creation
+
+
+Base = declarative_base()
+
+LAST_RUN = datetime(2024, 3, 1)
+
+
+class Row(Base):
+    __tablename__ = "row"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50))
+    created_date = Column(DateTime, nullable=False)
+    updated_date = Column(DateTime, nullable=False)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as session:
+        yield session
+
+
+def _add_rows(session, count, created_date, first_id=1):
+    session.add_all(
+        Row(id=row_id, name=f"row {row_id}", created_date=created_date, updated_date=created_date)
+        for row_id in range(first_id, first_id + count))
+    session.commit()
+
+
+def _ids(batches):
+    return [[row.id for row in batch] for batch in batches]
+
+
+@pytest.mark.parametrize("count, expected_sizes", [
+    (6, [3, 3]),
+    (7, [3, 3, 1]),
+    (2, [2]),
+])
+def test_batch_boundaries(session, count, expected_sizes):
+    """Every changed row is read once, in batches of at most the batch size."""
+    _add_rows(session, count, LAST_RUN + timedelta(hours=1))
+
+    batches = list(Extraction.start(session, Row, LAST_RUN).batches(session, batch_size=3))
+
+    assert [len(batch) for batch in batches] == expected_sizes
+    assert [row_id for batch in _ids(batches) for row_id in batch] == list(range(1, count + 1))
+    assert batches[0][0].name == "row 1"
+
+
+def test_ties_on_date_column(session):
+    """Rows changed at the same time are neither skipped nor repeated across batches."""
+    _add_rows(session, 5, LAST_RUN + timedelta(hours=1))
+    _add_rows(session, 2, LAST_RUN, first_id=6)
+
+    batches = list(Extraction.start(session, Row, LAST_RUN).batches(session, batch_size=2))
+
+    assert _ids(batches) == [[1, 2], [3, 4], [5]]
+
+
+def test_rows_added_after_start_are_left_for_next_run(session):
+    """Rows created after the extraction started are not read until the next run cycle."""
+    _add_rows(session, 2, LAST_RUN + timedelta(hours=1))
+    extraction = Extraction.start(session, Row, LAST_RUN)
+    _add_rows(session, 2, LAST_RUN + timedelta(hours=2), first_id=3)
+
+    assert extraction.max_id == 2
+    assert _ids(extraction.batches(session, batch_size=10)) == [[1, 2]]
+
+
+def test_empty_source(session):
+    """An extraction with no changed rows yields no batches."""
+    _add_rows(session, 2, LAST_RUN)
+
+    extraction = Extraction.start(session, Row, LAST_RUN)
+
+    assert extraction.max_id == 0
+    assert list(extraction.batches(session)) == []
+    assert list(extract_batches(session, extraction, None)) == []
+
+
+def test_extract_batches(session):
+    """The extractions are read in turn with their own criteria, skipping those not started."""
+    _add_rows(session, 3, LAST_RUN + timedelta(hours=1))
+    session.get(Row, 2).updated_date = LAST_RUN + timedelta(hours=2)
+    session.commit()
+
+    created = Extraction.start(session, Row, LAST_RUN)
+    updated = Extraction.start(session, Row, LAST_RUN, date_column="updated_date",
+                               criteria=(updated_after_creation,))
+
+    batches = extract_batches(session, created, None, updated, batch_size=2)
+
+    assert _ids(batches) == [[1, 2], [3], [2]]
@@ -0,0 +1,116 @@
+"""Tests for building the user responses of submissions in the submission ETL."""
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from etl_project.services.ops.submission_etl_service import (
+    _build_response_rows, _index_survey_components, _is_truthy)
+
+
+CREATED = datetime(2024, 3, 1, 10, 0)
+UPDATED = datetime(2024, 3, 2, 10, 0)
+
+COMPONENTS = [
+    {"key": "colour", "id": "c1", "type": "simpleradios",
+     "values": [{"value": "r", "label": "Red"}, {"value": "r", "label": "Rouge"},
+                {"value": "1", "label": "One"}]},
+    {"key": "fruits", "id": "c2", "type": "simplecheckboxes",
+     "values": [{"value": "apple", "label": "Apple"}, {"value": "pear", "label": "Pear"}]},
+    {"key": "city", "id": "c3", "type": "simpleselect",
+     "data": {"values": [{"value": "vic", "label": "Victoria"}]}},
+    {"key": "rating", "id": "c4", "type": "simplesurvey",
+     "values": [{"value": "good", "label": "Good"}, {"value": "bad", "label": "Bad"}]},
+    {"key": "comment", "id": "c5", "type": "simpletextarea"},
+    {"key": "categorycommentcontainer", "id": "c6", "type": "simpleradios", "values": []},
+]
+
+
+def _survey(form_json):
+    return SimpleNamespace(id=7, form_json=form_json)
+
+
+def _submission(submission_json):
+    return SimpleNamespace(
+        submission_json=submission_json, created_date=CREATED, updated_date=UPDATED)
+
+
+def _response_rows(submission_json):
+    components = _index_survey_components(
+        MagicMock(), _survey({"display": "form", "components": COMPONENTS}))
+    return _build_response_rows(
+        components, _submission(submission_json), SimpleNamespace(id=3), 11, 5)
+
+
+def test_index_survey_components():
+    """Option type questions are indexed with the label of each value, others skipped."""
+    context = MagicMock()
+    components = _index_survey_components(
+        context, _survey({"display": "form", "components": COMPONENTS}))
+
+    assert components == [
+        ("colour", "c1", "simpleradios", {"r": "Red", "1": "One"}),
+        ("fruits", "c2", "simplecheckboxes", {"apple": "Apple", "pear": "Pear"}),
+        ("city", "c3", "simpleselect", {"vic": "Victoria"}),
+        ("rating", "c4", "simplesurvey", {"good": "Good", "bad": "Bad"}),
+    ]
+    context.log.info.assert_called_once()
+
+
+def test_index_wizard_survey_components():
+    """The questions of every page of a wizard are indexed, pages without questions skipped."""
+    pages = [{"components": COMPONENTS[:1]}, {}, {"components": COMPONENTS[1:2]}]
+    form_json = {"display": "wizard", "components": pages}
+
+    components = _index_survey_components(MagicMock(), _survey(form_json))
+
+    assert [key for key, *_ in components] == ["colour", "fruits"]
+    assert _index_survey_components(MagicMock(), _survey({"display": "pdf"})) == []
+
+
+def test_build_response_rows():
+    """Each answer is a row holding the label of the value selected.
+
+    Every option selected in a checkbox question, and every sub question of a survey, is a row.
+    """
+    rows = _response_rows({
+        "colour": 1,
+        "fruits": {"apple": True, "pear": "false"},
+        "city": "vic",
+        "rating": {"service": "good", "speed": "bad"},
+        "comment": "Not an option",
+    })
+
+    assert [(row["request_key"], row["request_id"], row["value"]) for row in rows] == [
+        ("colour", "c1", "One"),
+        ("fruits", "c2", "Apple"),
+        ("city", "c3", "Victoria"),
+        ("rating-service", "c4-service", "Good"),
+        ("rating-speed", "c4-speed", "Bad"),
+    ]
+    assert rows[0] == {
+        "survey_id": 3,
+        "request_key": "colour",
+        "value": "One",
+        "request_id": "c1",
+        "participant_id": 11,
+        "is_active": True,
+        "runcycle_id": 5,
+        "created_date": CREATED,
+        "updated_date": UPDATED,
+    }
+
+
+def test_build_response_rows_skips_unknown_answers():
+    """Unanswered questions, and answers which are not a value of the question, have no row."""
+    assert _response_rows({"colour": "blue", "fruits": {}, "city": ""}) == []
+
+
+@pytest.mark.parametrize("answer, expected", [
+    (True, True), ("yes", True), ("True", True), ("YES", True),
+    (False, False), ("no", False), ("", False), (1, False), (None, False),
+])
+def test_is_truthy(answer, expected):
+    """Checkbox options are selected by a boolean or a yes or true string."""
+    assert _is_truthy(answer) is expected
@@ -0,0 +1,89 @@
+"""Tests for building and versioning the requests of surveys in the survey ETL."""
+from types import SimpleNamespace
+from unittest.mock import MagicMock, call
+
+from etl_project.services.ops.survey_etl_service import (
+    EtlAvailableResponseOption, EtlRequestTypeOption, EtlResponseTypeOptionModel,
+    _build_survey_rows, _deactivate_previous_survey_versions)
+
+
+COMMON = {"survey_id": 9, "is_active": True, "runcycle_id": 4}
+
+RADIO = {"id": "c1", "key": "colour", "label": "Colour", "type": "simpleradios",
+         "values": [{"value": "r", "label": "Red"}, {"value": "b", "label": "Blue"}]}
+TEXT = {"id": "c2", "key": "comment", "label": "Comment", "type": "simpletextarea"}
+SELECT = {"id": "c3", "key": "city", "label": "City", "type": "simpleselect",
+          "data": {"values": [{"value": "vic", "label": "Victoria"}]}}
+SURVEY = {"id": "c4", "key": "rating", "label": "Rating", "type": "simplesurvey",
+          "questions": [{"value": "service", "label": "Service"},
+                        {"value": "speed", "label": "Speed"}],
+          "values": [{"value": "good", "label": "Good"}, {"value": "bad", "label": "Bad"}]}
+
+
+def _survey(form_json):
+    return SimpleNamespace(id=1, name="Survey", form_json=form_json)
+
+
+def _summary(request_rows):
+    return [(row["key"], row["request_id"], row["label"], row["position"]) for row in request_rows]
+
+
+def test_build_survey_rows():
+    """Option type questions are requests with their options, in the order of the form."""
+    form_json = {"display": "form", "components": [RADIO, TEXT, SELECT, SURVEY]}
+    request_rows, option_rows = _build_survey_rows(MagicMock(), _survey(form_json), 9, 4)
+
+    assert request_rows[0] == {
+        **COMMON, "request_id": "c1", "label": "Colour", "key": "colour", "type": "simpleradios",
+        "position": 1}
+    # the text question is skipped but keeps its position
+    assert _summary(request_rows) == [
+        ("colour", "c1", "Colour", 1),
+        ("city", "c3", "City", 3),
+        ("rating-service", "c4-service", "Service", 5),
+        ("rating-speed", "c4-speed", "Speed", 6),
+    ]
+    assert option_rows[0] == {**COMMON, "request_key": "colour", "value": "Red", "request_id": "c1"}
+    assert [(row["request_key"], row["value"]) for row in option_rows] == [
+        ("colour", "Red"), ("colour", "Blue"),
+        ("city", "Victoria"),
+        ("rating-service", "Good"), ("rating-service", "Bad"),
+        ("rating-speed", "Good"), ("rating-speed", "Bad"),
+    ]
+
+
+def test_build_wizard_survey_rows():
+    """Positions carry on from one page of a wizard to the next, past pages without questions."""
+    pages = [{"components": [RADIO]}, {}, {"components": [SELECT]}]
+    request_rows, _ = _build_survey_rows(
+        MagicMock(), _survey({"display": "wizard", "components": pages}), 9, 4)
+
+    assert _summary(request_rows) == [
+        ("colour", "c1", "Colour", 1),
+        ("city", "c3", "City", 2),
+    ]
+
+
+def test_build_survey_rows_without_form():
+    """Surveys without a form, or of an unknown display, have no rows."""
+    assert _build_survey_rows(MagicMock(), _survey(None), 9, 4) == ([], [])
+    assert _build_survey_rows(MagicMock(), _survey({"display": "pdf"}), 9, 4) == ([], [])
+
+
+def test_deactivate_previous_survey_versions():
+    """Responses move to the active survey, and earlier requests and options are deactivated."""
+    session = MagicMock()
+    update = session.query.return_value.filter.return_value.update
+
+    _deactivate_previous_survey_versions(session, [2, 5], 9)
+
+    assert session.query.call_args_list == [
+        call(EtlResponseTypeOptionModel),
+        call(EtlRequestTypeOption),
+        call(EtlAvailableResponseOption),
+    ]
+    assert update.call_args_list == [
+        call({"survey_id": 9}, synchronize_session=False),
+        call({"is_active": False}, synchronize_session=False),
+        call({"is_active": False}, synchronize_session=False),
+    ]
@@ -12,12 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Endpoints to check manage notifications."""
+import os
+
 from flask import jsonify, request
 
 from flask_restx import Namespace, Resource
 
 from notify_api.auth import Auth
 from notify_api.services.email import get_email_service
+from notify_api.services.email.email_batch import send_email_batch
 
 API = Namespace('notifications', description='API for Sending DEP Email Notifications')
 
@@ -33,3 +36,20 @@ class EmailNotification(Resource):
         email_payload = request.get_json(force=True)
         get_email_service().send(email_payload)
         return jsonify({})
+
+
+@API.route('/email/batch')
+class EmailBatchNotification(Resource):
+    """Batch notification resource."""
+
+    @staticmethod
+    @Auth.require
+    def post():
+        """Send one email notification per payload in the `emails` list.
+
+        Payloads are sent concurrently. The response lists one result per
+        payload, in request order, so a failed recipient does not fail the batch.
+        """
+        email_payloads = request.get_json(force=True).get('emails', [])
+        results = send_email_batch(get_email_service(), email_payloads, int(os.getenv('EMAIL_BATCH_MAX_WORKERS', '8')))
+        return jsonify({'results': results})
@@ -0,0 +1,41 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Send a batch of emails through an email service."""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from .email_base_service import EmailBaseService
+
+
+logger = logging.getLogger(__name__)
+
+
+def send_email_batch(email_service: EmailBaseService, email_payloads: List[dict], max_workers: int) -> List[dict]:
+    """Send every email payload concurrently and return the outcome of each, in the order of the payloads.
+
+    A failed email does not fail the others; its outcome carries the error instead.
+    """
+    def send(email_payload):
+        try:
+            email_service.send(email_payload)
+            return {'to': email_payload.get('to'), 'status': 'sent'}
+        except Exception as exc:  # noqa: B902 pylint: disable=broad-except
+            logger.error('Sending email to %s failed: %s', email_payload.get('to'), exc)
+            return {'to': email_payload.get('to'), 'status': 'failed', 'error': str(exc)}
+
+    if not email_payloads:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(email_payloads)))) as executor:
+        return list(executor.map(send, email_payloads))
@@ -20,6 +20,7 @@ import os
 
 import requests
 
+from ..token_manager import client_credentials_fetcher, token_manager
 from .email_base_service import EmailBaseService
 
 
@@ -39,15 +40,12 @@ class EmailChesNotify(EmailBaseService):  # pylint: disable=too-few-public-metho
             'subject': email_payload.get('subject'),
             'to': email_payload.get('to')
         }
-        token_request_data = \
-            f'client_id={ches_client_id}&client_secret={ches_client_secret}&grant_type=client_credentials'
-        token_request_headers = {'Content-Type': 'application/x-www-form-urlencoded'}
         try:
-            ches_token_response = requests.post(ches_token_url,
-                                                data=token_request_data,
-                                                headers=token_request_headers,
-                                                timeout=None)
-            ches_api_token = ches_token_response.json().get('access_token')
+            # Tokens are cached per (client, token url) and refreshed shortly before they expire
+            ches_api_token = token_manager.get_token(
+                (ches_client_id, ches_token_url),
+                client_credentials_fetcher(ches_token_url, ches_client_id, ches_client_secret),
+            )
             email_request_headers = \
                 {'Content-Type': 'application/json', 'Authorization': f'Bearer {ches_api_token}'}
             email_response = requests.post(ches_email_endpoint,
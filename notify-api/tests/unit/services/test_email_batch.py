@@ -0,0 +1,52 @@
+# Copyright © 2024 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests to assure the email batch service.
+
+Test-Suite to ensure that a batch of emails reports the outcome of every email, in order.
+"""
+from notify_api.services.email.email_base_service import EmailBaseService
+from notify_api.services.email.email_batch import send_email_batch
+
+
+class FakeEmailService(EmailBaseService):  # pylint: disable=too-few-public-methods
+    """Email service recording what it sends, and failing for addresses starting with bad."""
+
+    def __init__(self):
+        """Initialize the fake service."""
+        self.sent = []
+
+    def send(self, email_payload):
+        """Send the email, or fail."""
+        if email_payload['to'][0].startswith('bad'):
+            raise ValueError('Rejected by the email provider')
+        self.sent.append(email_payload['to'][0])
+
+
+def test_send_email_batch_reports_every_email():
+    """Assert that every email is attempted and reported in order, a failure not failing the others."""
+    email_service = FakeEmailService()
+    emails = ['one@gov.bc.ca', 'bad@gov.bc.ca', 'two@gov.bc.ca']
+
+    results = send_email_batch(email_service, [{'to': [email], 'template_id': 'id'} for email in emails], 2)
+
+    assert [result['to'] for result in results] == [[email] for email in emails]
+    assert [result['status'] for result in results] == ['sent', 'failed', 'sent']
+    assert results[1]['error'] == 'Rejected by the email provider'
+    assert sorted(email_service.sent) == ['one@gov.bc.ca', 'two@gov.bc.ca']
+
+
+def test_send_email_batch_empty():
+    """Assert that an empty batch sends nothing."""
+    assert not send_email_batch(FakeEmailService(), [], 8)